@@ -1,11 +1,92 @@
-import pygame
+import argparse
+import json
+import sys
 
+from . import harness, settings
+from .assets import preload
+from .memory import MemoryMonitor
 from .menu import MenuScreen
+from .metrics import Metrics
+from .profiles import PROFILES, apply_profile, load_profile
+from .scene import SceneManager
 
 
-def main():
-    new = MenuScreen()
-    new.game_menu()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Killer Asteroids.")
+    parser.add_argument(
+        "--profile",
+        choices=list(PROFILES),
+        help=f"performance profile, defaults to {settings.PROFILE}",
+    )
+    parser.add_argument(
+        "--config",
+        help="JSON file that chooses or changes the profile, defaults to "
+        f"{settings.PROFILE_FILE}",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="serve live metrics for Prometheus on "
+        f"{settings.METRICS_HOST}:{settings.METRICS_PORT}",
+    )
+    parser.add_argument(
+        "--telemetry",
+        action="store_true",
+        help=f"log the game sessions to {settings.TELEMETRY_DIR}",
+    )
+    parser.add_argument(
+        "--profile-frames",
+        type=int,
+        metavar="N",
+        help="profile the first N frames of the first game",
+    )
+    parser.add_argument(
+        "--profiler",
+        choices=("cprofile", "sample"),
+        help=f"how to profile, defaults to {settings.PROFILER}",
+    )
+    harness.add_commands(
+        parser.add_subparsers(
+            title="commands",
+            description="Without a command the game is played. The commands "
+            "run it headlessly and print the metrics as JSON.",
+        )
+    )
+    args = parser.parse_args(argv)
+    try:
+        _, values = load_profile(args.profile, args.config)
+    except ValueError as error:
+        parser.error(str(error))
+    # Before pygame is initialized, since it sets the mixer and window.
+    apply_profile(values)
+    if args.telemetry:
+        settings.TELEMETRY = True
+    if args.profiler:
+        settings.PROFILER = args.profiler
+    if args.profile_frames:
+        settings.PROFILER_FRAMES = args.profile_frames
+        settings.PROFILER_FIRST_GAME = True
+    if hasattr(args, "run"):
+        sys.exit(harness.main(args))
+
+    manager = SceneManager()
+    if settings.MEMORY_MONITOR:
+        manager.monitor = MemoryMonitor()
+        manager.monitor.start()
+    if args.metrics or settings.METRICS:
+        manager.metrics = Metrics()
+        manager.metrics.start()
+    menu = MenuScreen()
+    # Load what the game needs while the menu is shown.
+    preload()
+    manager.run(menu)
+    manager.metrics.close()
+    if manager.monitor is not None:
+        print(manager.monitor.report())
+    if settings.PACING_STATS:
+        print(json.dumps(manager.clock.stats(), indent=2))
+    if settings.INPUT_LATENCY_STATS:
+        print(f"Input latency {manager.latency.stats()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+import concurrent.futures
+import io
+
+import pygame
+
+from . import settings
+from .bundle import open_bundle
+
+
+class AssetManager:
+    """Loads images, sounds and fonts, optionally on a worker thread.
+
+    preload() queues files to be decoded by a worker thread. Asking for a
+    file that has been queued waits for the worker to finish it, and a
+    file that hasn't been queued is loaded right away, so the caller only
+    ever waits for what's still missing. Everything is cached, so every
+    file is decoded once.
+
+    Files that are packed in 'bundle' are taken from it instead, they are
+    already decoded so they are never queued."""
+
+    def __init__(self, bundle=None):
+        self.bundle = bundle
+        self._executor = None
+        self._queued = {}
+        self._images = {}
+        self._sounds = {}
+        self._fonts = {}
+
+    def _submit(self, kind, file, load):
+        key = (kind, file)
+        if key not in self._queued:
+            self._queued[key] = self._executor.submit(load, file)
+
+    def preload(self, images=(), sounds=(), fonts=()):
+        """Start decoding the files on the worker thread."""
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="assets"
+            )
+        for file in images:
+            if file not in self._images and not self._bundled("image", file):
+                self._submit("image", file, pygame.image.load)
+        if pygame.mixer.get_init():
+            for file in sounds:
+                if file in self._sounds or self._bundled("sound", file):
+                    continue
+                self._submit("sound", file, pygame.mixer.Sound)
+        for file in fonts:
+            if not self._bundled("font", file):
+                self._submit("font", file, self._read)
+
+    def _bundled(self, kind, file):
+        """True if the file can be taken from the bundle."""
+        if self.bundle is None:
+            return False
+        return getattr(self.bundle, f"has_{kind}")(file)
+
+    @property
+    def progress(self):
+        """Returns how many of the queued files are done, and the total."""
+        done = sum(future.done() for future in self._queued.values())
+        return done, len(self._queued)
+
+    def wait(self):
+        """Block until every queued file has been loaded."""
+        concurrent.futures.wait(self._queued.values())
+
+    def _read(self, file):
+        with open(file, "rb") as fh:
+            return fh.read()
+
+    def _load(self, kind, file, load):
+        """Returns the worker's result if it's queued, or loads it now."""
+        future = self._queued.get((kind, file))
+        if future is not None:
+            return future.result()
+        return load(file)
+
+    def image(self, file):
+        """Returns the image converted to the display's pixel format."""
+        if file not in self._images:
+            if self._bundled("image", file):
+                self._images[file] = self.bundle.image(file)
+            else:
+                image = self._load("image", file, pygame.image.load)
+                self._images[file] = image.convert_alpha()
+        return self._images[file]
+
+    def sound(self, file):
+        """Returns the decoded sound."""
+        if file not in self._sounds:
+            if self._bundled("sound", file):
+                self._sounds[file] = self.bundle.sound(file)
+            else:
+                load = pygame.mixer.Sound
+                self._sounds[file] = self._load("sound", file, load)
+        return self._sounds[file]
+
+    def font(self, size, file=settings.FONT):
+        """Returns the font in the given size."""
+        key = (file, size)
+        if key not in self._fonts:
+            if self._bundled("font", file):
+                data = self.bundle.font_data(file)
+            else:
+                data = self._load("font", file, self._read)
+            self._fonts[key] = pygame.font.Font(io.BytesIO(data), size)
+        return self._fonts[key]
+
+
+_assets = None
+
+
+def get_assets():
+    """Returns the AssetManager that is shared by the whole game."""
+    global _assets
+    if _assets is None:
+        _assets = AssetManager(open_bundle())
+    return _assets
+
+
+def preload():
+    """Start loading every file that is listed in the settings."""
+    get_assets().preload(
+        images=settings.PRELOAD_IMAGES,
+        sounds=settings.PRELOAD_SOUNDS,
+        fonts=[settings.FONT],
+    )
@@ -0,0 +1,325 @@
+"""Microbenchmarks of the game's hot paths, compared with a baseline.
+
+Every benchmark is a setup function that returns the function to time.
+The function is called in a loop for about BENCHMARK_BUDGET seconds and
+the fastest of a few rounds is the result, in microseconds per call. The
+results are written to BENCHMARK_RESULTS and compared with
+BENCHMARK_BASELINE, and the ones that got slower than BENCHMARK_THRESHOLD
+allows are regressions.
+
+    python -m killerasteroids.benchmarks
+    python -m killerasteroids.benchmarks --filter groupcollide
+    python -m killerasteroids.benchmarks --update-baseline
+
+The first run, or one with --update-baseline, saves its results as the
+baseline. The command fails if there's a regression."""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import pygame
+
+from . import settings
+
+# Setup functions by name, in the order they run.
+BENCHMARKS = {}
+# Rounds every benchmark is timed in, the fastest one counts.
+ROUNDS = 5
+# The databases the database benchmarks read, by number of scores.
+_databases = {}
+
+
+def benchmark(name):
+    """Register a setup function that returns the function to time."""
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def measure(function, budget=None):
+    """Returns the microseconds a call to 'function' takes.
+
+    The number of calls per round is doubled until a round takes its
+    share of 'budget' seconds."""
+
+    budget = budget or settings.BENCHMARK_BUDGET
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget / ROUNDS or calls >= 1 << 20:
+            break
+        calls *= 2
+    best = elapsed
+    for _ in range(ROUNDS - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e6
+
+
+def _screen():
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+    return pygame.Surface((settings.WIDTH, settings.HEIGHT)).convert()
+
+
+@benchmark("animated_object")
+def _animated_object():
+    from .object import AnimatedObject
+
+    _screen()
+    return lambda: AnimatedObject(settings.ASTEROID_SPRITE)
+
+
+@benchmark("load_sliced_sprites")
+def _load_sliced_sprites():
+    from .object import AnimatedObject, _sprite_cache
+
+    _screen()
+    sprite = AnimatedObject(settings.ASTEROID_SPRITE)
+    key = (sprite.file, tuple(sprite.size))
+
+    def load():
+        # Not cached, the sheet is sliced every time.
+        _sprite_cache.pop(key, None)
+        sprite.load_sliced_sprites(sprite.size, sprite.file)
+
+    return load
+
+
+def _sprites(count, size, rng):
+    sprites = []
+    for _ in range(count):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(
+            rng.randrange(settings.WIDTH),
+            rng.randrange(settings.HEIGHT),
+            *size,
+        )
+        sprites.append(sprite)
+    return pygame.sprite.Group(sprites)
+
+
+def _groupcollide(lasers, asteroids):
+    rng = random.Random(0)
+    laser_group = _sprites(lasers, (25, 10), rng)
+    asteroid_group = _sprites(asteroids, (35, 35), rng)
+    return lambda: pygame.sprite.groupcollide(
+        laser_group, asteroid_group, False, False
+    )
+
+
+def _game(asteroids):
+    from .display import GameLoop
+    from .harness import start_game
+
+    _screen()
+    game = GameLoop(seed=0)
+    start_game(game, 0, 1, asteroids)
+    return game
+
+
+def _update_groups(asteroids):
+    game = _game(asteroids)
+
+    def update():
+        game.animate_groups()
+        game.update_groups()
+
+    return update
+
+
+def _draw_groups(asteroids):
+    game = _game(asteroids)
+    screen = _screen()
+    return lambda: game.draw_groups(screen)
+
+
+for _lasers, _asteroids in ((10, 10), (50, 50), (200, 200)):
+    BENCHMARKS[f"groupcollide_{_lasers}x{_asteroids}"] = functools.partial(
+        _groupcollide, _lasers, _asteroids
+    )
+for _asteroids in (10, 100, 500):
+    BENCHMARKS[f"update_groups_{_asteroids}"] = functools.partial(
+        _update_groups, _asteroids
+    )
+    BENCHMARKS[f"draw_groups_{_asteroids}"] = functools.partial(
+        _draw_groups, _asteroids
+    )
+
+
+@benchmark("hud_text")
+def _hud_text():
+    from .level import LevelDesign
+    from .object import Life, Score
+
+    _screen()
+    hud = [Score(), Life(), LevelDesign()]
+
+    def render():
+        for sprite in hud:
+            sprite.update()
+
+    return render
+
+
+def _database(scores=1000):
+    """Returns a GameDatabase with 'scores' scores.
+
+    The database is a temporary one, filled once and shared by the
+    benchmarks, which only read it."""
+
+    from .display import GameDatabase
+
+    if scores not in _databases:
+        directory = tempfile.TemporaryDirectory()
+        file = os.path.join(directory.name, "highscore.db")
+        database = GameDatabase(file)
+        rng = random.Random(0)
+        for _ in range(scores):
+            database.save_highscore(rng.randrange(-500, 5000))
+        database.close()
+        _databases[scores] = (directory, file)
+    return GameDatabase(_databases[scores][1])
+
+
+@benchmark("database_top")
+def _database_top():
+    return _database().get_highscores
+
+
+@benchmark("database_page")
+def _database_page():
+    database = _database()
+    score, _, _, rowid = database.get_page()[-1]
+    return lambda: database.get_page((score, rowid))
+
+
+@benchmark("database_rank")
+def _database_rank():
+    database = _database()
+    return lambda: database.get_rank(1234)
+
+
+@benchmark("database_highscore_list")
+def _database_highscore_list():
+    _screen()
+    return _database().get_highscore_list
+
+
+def run(names=None, budget=None, report=print):
+    """Run the benchmarks in 'names', or all of them, returns the results."""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        results[name] = round(measure(setup(), budget), 3)
+        report(f"{name:<28} {results[name]:>12.3f} us")
+    return results
+
+
+def compare(results, baseline, threshold=None):
+    """Returns (name, baseline, result, change) for every benchmark in both,
+    and the names of the ones that regressed."""
+
+    threshold = (
+        settings.BENCHMARK_THRESHOLD if threshold is None else threshold
+    )
+    rows = []
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        change = result / baseline[name] - 1 if baseline[name] else 0.0
+        rows.append((name, baseline[name], result, change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def save(file, results):
+    """Write the results and where they were measured."""
+    os.makedirs(os.path.dirname(os.path.abspath(file)), exist_ok=True)
+    data = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(file, "w") as fh:
+        json.dump(data, fh, indent=2)
+
+
+def load(file):
+    """Returns the results in 'file', or None if there isn't one."""
+    try:
+        with open(file) as fh:
+            return json.load(fh)["results"]
+    except (OSError, ValueError, KeyError) as error:
+        if os.path.exists(file):
+            print(f"load(): {error}")
+        return None
+
+
+def main(argv=None):
+    """Run the microbenchmarks and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--filter", default="", help="only the benchmarks with this in name"
+    )
+    parser.add_argument("--baseline", default=settings.BENCHMARK_BASELINE)
+    parser.add_argument("--output", default=settings.BENCHMARK_RESULTS)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="save the results as the baseline",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=settings.BENCHMARK_THRESHOLD,
+        help="slowdown that is a regression, 0.25 is 25%% slower",
+    )
+    parser.add_argument(
+        "--budget", type=float, help="seconds to time every benchmark"
+    )
+    args = parser.parse_args(argv)
+
+    from .harness import headless
+
+    headless()
+    pygame.init()
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run(names, args.budget)
+    save(args.output, results)
+
+    baseline = load(args.baseline)
+    if baseline is None or args.update_baseline:
+        # The benchmarks that weren't run keep their baseline.
+        save(args.baseline, {**(baseline or {}), **results})
+        print(f"Saved the baseline to {args.baseline}")
+        return
+    rows, regressions = compare(results, baseline, args.threshold)
+    print(f"\n{'benchmark':<28} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, before, now, change in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<28} {before:>12.3f} {now:>12.3f} {change:>+8.1%}{flag}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""Packs the game's assets into one memory-mapped file.
+
+The sprite sheets are packed into a single texture atlas that is stored
+as raw pixels in the display's pixel format, the sounds are stored as
+raw PCM in the mixer's format and the font file is stored as it is.
+Loading the bundle is then a memory map and a few buffer wraps instead
+of opening and decoding every file. The index keeps the size, the
+modification time and a hash of every file, and a file that has changed
+since is loaded from the file instead. A copied or installed file that
+only has a new modification time is hashed again and still taken from the
+bundle.
+
+The bundle is mapped copy on write, so the images and sounds taken from
+it can be changed like any other without changing the file.
+
+Build the bundle with 'python -m killerasteroids.bundle'."""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+from . import settings
+
+MAGIC = b"KABN"
+VERSION = 3
+# Magic, version and the length of the JSON index that follows it.
+HEADER = struct.Struct("<4sII")
+# Blobs start on this boundary.
+ALIGN = 64
+
+
+def _name(file):
+    """Returns the name of a file inside the bundle."""
+    return os.path.relpath(file, settings.DATA_DIR).replace(os.sep, "/")
+
+
+def _hash(file):
+    """Returns a hash of the file's contents."""
+    digest = hashlib.sha1()
+    with open(file, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _align(offset):
+    return offset + -offset % ALIGN
+
+
+def _pixel_format():
+    """The byte order of pixels that matches the display's format."""
+    # Older versions of pygame can't wrap BGRA buffers, their images are
+    # stored as RGBA and converted once when the bundle is opened.
+    if pygame.version.vernum >= (2, 1, 3):
+        return "BGRA"
+    return "RGBA"
+
+
+def pack_atlas(sizes, width):
+    """Place rectangles on shelves that are 'width' pixels wide.
+
+    Takes a dict of name -> (w, h) and returns the height of the atlas
+    and a dict of name -> (x, y, w, h)."""
+    rects = {}
+    x = y = shelf = 0
+    # The tallest first so the shelves waste as little space as possible.
+    for name, (w, h) in sorted(sizes.items(), key=lambda i: -i[1][1]):
+        if x + w > width:
+            x = 0
+            y += shelf
+            shelf = 0
+        rects[name] = (x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return y + shelf, rects
+
+
+def build(file, images, sounds, fonts):
+    """Write a bundle with the given image, sound and font files.
+
+    The display and mixer have to be initialized, the images are converted
+    like the game converts them and the sounds to the mixer's format."""
+
+    index = {"images": {}, "sounds": {}, "fonts": {}, "files": {}}
+    blobs = []
+    for f in [*images, *sounds, *fonts]:
+        stat = os.stat(f)
+        index["files"][_name(f)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": _hash(f),
+        }
+
+    # Texture atlas.
+    loaded = {_name(f): pygame.image.load(f).convert_alpha() for f in images}
+    width = max([2048] + [image.get_width() for image in loaded.values()])
+    sizes = {name: image.get_size() for name, image in loaded.items()}
+    height, rects = pack_atlas(sizes, width)
+    pixel_format = _pixel_format()
+    # Copy the rows instead of blitting, which would blend the alpha.
+    pixels = bytearray(width * height * 4)
+    for name, image in loaded.items():
+        x, y, w, h = rects[name]
+        data = pygame.image.tostring(image, pixel_format)
+        for row in range(h):
+            start = ((y + row) * width + x) * 4
+            pixels[start : start + w * 4] = data[
+                row * w * 4 : (row + 1) * w * 4
+            ]
+    index["atlas"] = {"size": [width, height], "format": pixel_format}
+    index["images"] = rects
+    blobs.append(("atlas", pixels))
+
+    # Raw PCM in the format the mixer was initialized with.
+    mixer = pygame.mixer.get_init()
+    if mixer:
+        index["mixer"] = list(mixer)
+        for f in sounds:
+            raw = pygame.mixer.Sound(f).get_raw()
+            blobs.append((("sounds", _name(f)), raw))
+
+    for f in fonts:
+        with open(f, "rb") as fh:
+            blobs.append((("fonts", _name(f)), fh.read()))
+
+    # Offsets are relative to the first blob, right after the index.
+    offsets = []
+    offset = 0
+    for key, data in blobs:
+        offset = _align(offset)
+        entry = {"offset": offset, "length": len(data)}
+        if key == "atlas":
+            index["atlas"].update(entry)
+        else:
+            index[key[0]][key[1]] = entry
+        offsets.append(offset)
+        offset += len(data)
+
+    encoded = json.dumps(index).encode()
+    with open(file, "wb") as fh:
+        fh.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+        fh.write(encoded)
+        start = _align(fh.tell())
+        for (key, data), offset in zip(blobs, offsets):
+            fh.write(b"\0" * (start + offset - fh.tell()))
+            fh.write(data)
+
+
+class Bundle:
+    """A memory-mapped asset bundle written by build()."""
+
+    def __init__(self, file):
+        self.file = file
+        with open(file, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, length = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{file} is not a version {VERSION} bundle")
+        start = HEADER.size
+        self.index = json.loads(self._map[start : start + length])
+        self._data = _align(start + length)
+        self._atlas = None
+        # Whether the bundled copy of a file is up to date, by name.
+        self._fresh = {}
+
+    def close(self):
+        """Unmap the bundle.
+
+        The images and sounds taken from it have to be gone first, they
+        are views of the map."""
+
+        self._atlas = None
+        try:
+            self._map.close()
+        except BufferError as error:
+            print(f"Bundle.close(): {error}")
+
+    def fresh(self, file):
+        """True if the file hasn't changed since the bundle was built.
+
+        Only a file with the same size and a new modification time is
+        hashed. A file that isn't there any more only has the bundled
+        copy."""
+
+        name = _name(file)
+        if name not in self._fresh:
+            self._fresh[name] = self._check(file, self.index["files"][name])
+        return self._fresh[name]
+
+    def _check(self, file, info):
+        try:
+            stat = os.stat(file)
+        except OSError:
+            return True
+        if stat.st_size != info["size"]:
+            return False
+        if stat.st_mtime == info["mtime"]:
+            return True
+        try:
+            return _hash(file) == info["hash"]
+        except OSError as error:
+            print(f"Bundle.fresh(): {error}")
+            return False
+
+    def _blob(self, entry):
+        """A zero-copy view of some bytes in the bundle."""
+        start = self._data + entry["offset"]
+        return memoryview(self._map)[start : start + entry["length"]]
+
+    @property
+    def atlas(self):
+        """The surface with every image, wrapped around the bundle."""
+        if self._atlas is None:
+            info = self.index["atlas"]
+            pixels = self._blob(info)
+            size = tuple(info["size"])
+            self._atlas = pygame.image.frombuffer(pixels, size, info["format"])
+            if info["format"] != "BGRA":
+                self._atlas = self._atlas.convert_alpha()
+        return self._atlas
+
+    def has_image(self, file):
+        return _name(file) in self.index["images"] and self.fresh(file)
+
+    def has_sound(self, file):
+        """True if the sound is stored in the mixer's current format."""
+        mixer = pygame.mixer.get_init()
+        return (
+            mixer is not None
+            and list(mixer) == self.index.get("mixer")
+            and _name(file) in self.index["sounds"]
+            and self.fresh(file)
+        )
+
+    def has_font(self, file):
+        return _name(file) in self.index["fonts"] and self.fresh(file)
+
+    def image(self, file):
+        """Returns the image as a subsurface of the atlas."""
+        return self.atlas.subsurface(self.index["images"][_name(file)])
+
+    def sound(self, file):
+        """Returns a sound made from the raw PCM."""
+        return pygame.mixer.Sound(
+            buffer=self._blob(self.index["sounds"][_name(file)])
+        )
+
+    def font_data(self, file):
+        """Returns the bytes of the font file."""
+        return bytes(self._blob(self.index["fonts"][_name(file)]))
+
+
+def open_bundle(file=None):
+    """Returns the bundle, or None if it hasn't been built or is broken."""
+    file = file or settings.BUNDLE
+    if not os.path.isfile(file):
+        return None
+    try:
+        return Bundle(file)
+    except (ValueError, struct.error) as error:
+        print(f"open_bundle(): {error}")
+        return None
+
+
+def main(argv=None):
+    """Pack the assets listed in the settings into a bundle."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--output", default=settings.BUNDLE)
+    args = parser.parse_args(argv)
+
+    # Nothing is shown or played, they're only needed for converting.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.pre_init(*settings.MIXER)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    build(
+        args.output,
+        settings.PRELOAD_IMAGES,
+        settings.PRELOAD_SOUNDS,
+        [settings.FONT],
+    )
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Records gameplay without slowing the game down.
+
+Every captured frame is copied straight from the screen's pixels into a
+slot of a shared memory ring and its slot number is queued for an encoder
+process, which turns the frames into a GIF or video with ffmpeg, or into
+numbered PNG files if ffmpeg isn't installed. When the encoder falls
+behind and every slot is taken the frame is dropped instead of waiting,
+so the game runs at the same frame rate while it's recorded."""
+
+import multiprocessing
+import os
+import queue
+import shutil
+import subprocess
+import time
+from multiprocessing import shared_memory
+
+import pygame
+
+from . import settings
+
+# Outputs that need ffmpeg, anything else is a directory of PNG files.
+VIDEO_FORMATS = (".gif", ".mp4", ".webm", ".mkv")
+
+
+class Recorder:
+    """Captures frames of a surface and encodes them in another process."""
+
+    def __init__(self, output, fps=None, slots=None):
+        self.output = output
+        # An uncapped game is recorded at 30 frames per second.
+        self.fps = fps or settings.FPS or 30
+        self.slots = slots or settings.CAPTURE_SLOTS
+        self.captured = 0
+        self.dropped = 0
+        # Frames the encoder wrote, known after stop().
+        self.encoded = None
+        self._process = None
+
+    @property
+    def recording(self):
+        return self._process is not None
+
+    def start(self, surface):
+        """Start an encoder for frames in the surface's size and format."""
+        if self.recording:
+            return
+        self._format = (
+            surface.get_size(),
+            surface.get_bitsize(),
+            surface.get_masks(),
+        )
+        self._frame_size = surface.get_pitch() * surface.get_height()
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=self._frame_size * self.slots
+        )
+        # The encoder is spawned so it doesn't inherit the display.
+        context = multiprocessing.get_context("spawn")
+        self._frames = context.Queue()
+        self._free = context.Queue()
+        self._results = context.Queue()
+        # Slots that have never been used, the rest come back from the
+        # encoder through the queue.
+        self._unused = list(range(self.slots))
+        self._process = context.Process(
+            target=_encode,
+            args=(
+                self._memory.name,
+                self._frame_size,
+                self._format,
+                self._frames,
+                self._free,
+                self._results,
+                self.output,
+                self.fps,
+            ),
+            name="capture",
+            daemon=True,
+        )
+        self._process.start()
+        self.captured = self.dropped = 0
+        self.encoded = None
+
+    def capture(self, surface):
+        """Queue a copy of the surface, or drop it if the encoder is busy."""
+        if not self.recording:
+            return
+        try:
+            slot = (
+                self._unused.pop() if self._unused else self._free.get_nowait()
+            )
+        except queue.Empty:
+            self.dropped += 1
+            return
+        start = slot * self._frame_size
+        view = surface.get_view("1")
+        with memoryview(view) as pixels:
+            self._memory.buf[start : start + view.length] = pixels.cast("B")
+        # Unlocks the surface.
+        del view
+        self._frames.put(slot)
+        self.captured += 1
+
+    def stop(self):
+        """Wait for the encoder to write the queued frames and stop it."""
+        if not self.recording:
+            return
+        self._frames.put(None)
+        while self.encoded is None:
+            try:
+                self.encoded = self._results.get(timeout=0.1)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    print("Recorder.stop(): the encoder has crashed")
+                    break
+        self._process.join()
+        self._process = None
+        self._memory.close()
+        self._memory.unlink()
+
+    def stats(self):
+        """Returns how many frames were captured, dropped and encoded."""
+        total = self.captured + self.dropped
+        return {
+            "output": self.output,
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "dropped_ratio": self.dropped / total if total else 0,
+            "encoded": self.encoded,
+        }
+
+
+def _open_writer(output, size, fps):
+    """Returns a function that writes one frame and one that finishes."""
+    ffmpeg = shutil.which("ffmpeg")
+    if output.lower().endswith(VIDEO_FORMATS):
+        if ffmpeg:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            process = subprocess.Popen(
+                [ffmpeg, "-loglevel", "error", "-y", "-f", "rawvideo"]
+                + ["-pix_fmt", "rgb24", "-s", "%dx%d" % size]
+                + ["-r", str(fps), "-i", "-", output],
+                stdin=subprocess.PIPE,
+            )
+
+            def write(frame, number):
+                process.stdin.write(pygame.image.tostring(frame, "RGB"))
+
+            def close():
+                process.stdin.close()
+                process.wait()
+
+            return write, close
+        print(f"ffmpeg isn't installed, writing PNG files for {output}")
+        output = os.path.splitext(output)[0]
+
+    os.makedirs(output, exist_ok=True)
+
+    def write(frame, number):
+        pygame.image.save(frame, os.path.join(output, f"{number:06}.png"))
+
+    return write, lambda: None
+
+
+def _encode(name, frame_size, format, frames, free, results, output, fps):
+    """The encoder process, writes frames until it gets None."""
+    memory = shared_memory.SharedMemory(name=name)
+    size, bitsize, masks = format
+    write, close = _open_writer(output, size, fps)
+    frame = pygame.Surface(size, 0, bitsize, masks)
+    count = 0
+    try:
+        while True:
+            slot = frames.get()
+            if slot is None:
+                break
+            start = slot * frame_size
+            frame.get_buffer().write(bytes(memory.buf[start:][:frame_size]))
+            # The slot can be reused as soon as it has been copied.
+            free.put(slot)
+            count += 1
+            write(frame, count)
+    finally:
+        close()
+        memory.close()
+        results.put(count)
+
+
+def capture_file():
+    """A new file name in the capture directory."""
+    name = time.strftime("%Y%m%d-%H%M%S") + settings.CAPTURE_FORMAT
+    return os.path.join(settings.CAPTURE_DIR, name)
@@ -0,0 +1,123 @@
+"""Maps the keyboard to the game's actions and measures input latency.
+
+Actions are bits, so the actions that are held down fit in one int that
+the ship steers by and the network sends as is. The SDL event queue only
+keeps the event types the game uses, mouse motion and the rest are
+dropped before they're queued."""
+
+import collections
+import time
+
+import pygame
+from pygame import locals
+
+from . import settings
+
+# Actions, as bits of a bit field of the actions that are held down.
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+FIRE = 16
+PAUSE = 32
+REWIND = 64
+# The key that does every action.
+BINDINGS = {
+    locals.K_UP: UP,
+    locals.K_DOWN: DOWN,
+    locals.K_LEFT: LEFT,
+    locals.K_RIGHT: RIGHT,
+    locals.K_SPACE: FIRE,
+    locals.K_p: PAUSE,
+    locals.K_r: REWIND,
+}
+# The only events the scenes use.
+EVENT_TYPES = (locals.QUIT, locals.KEYDOWN, locals.KEYUP)
+
+
+def allow_events(types=EVENT_TYPES):
+    """Keep every event type except 'types' out of the event queue."""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(types))
+
+
+class Controls:
+    """Turns key events into actions and remembers which are held down."""
+
+    def __init__(self, bindings=None):
+        self.bindings = dict(BINDINGS if bindings is None else bindings)
+        # Bit field of the actions that are held down.
+        self.held = 0
+
+    def handle(self, event):
+        """Returns the action of a pressed key, or None.
+
+        Pressing and releasing keys changes the held actions too."""
+
+        action = self.bindings.get(getattr(event, "key", None))
+        if action is None:
+            return None
+        if event.type == locals.KEYDOWN:
+            self.held |= action
+            return action
+        if event.type == locals.KEYUP:
+            self.held &= ~action
+        return None
+
+    def poll(self):
+        """Read the held actions from the keyboard.
+
+        Keys released while another scene was on top never send a KEYUP
+        here. Without keyboard focus, like in the headless tests, the held
+        actions only come from the events."""
+
+        if not pygame.key.get_focused():
+            return
+        pressed = pygame.key.get_pressed()
+        self.held = 0
+        for key, action in self.bindings.items():
+            if pressed[key]:
+                self.held |= action
+
+    def reset(self):
+        self.held = 0
+
+
+class InputLatency:
+    """Measures the time from polling the input to presenting the frame.
+
+    Every batch of events is stamped when it's taken from the queue, and
+    the frames that had key events get the time until present() as a
+    sample."""
+
+    def __init__(self, size=None):
+        self.samples = collections.deque(
+            maxlen=size or settings.INPUT_LATENCY_SAMPLES
+        )
+        self._stamp = None
+
+    def stamp(self, events):
+        """Note the time 'events' were polled if there is a key among them."""
+        if self._stamp is None and any(
+            event.type in (locals.KEYDOWN, locals.KEYUP) for event in events
+        ):
+            self._stamp = time.perf_counter()
+
+    def presented(self):
+        """The frame is on the screen, record the latency of its input."""
+        if self._stamp is not None:
+            self.samples.append((time.perf_counter() - self._stamp) * 1000)
+            self._stamp = None
+
+    def stats(self):
+        """Returns the number of samples and their latency in ms."""
+        if not self.samples:
+            return {"frames": 0}
+        samples = sorted(self.samples)
+        return {
+            "frames": len(samples),
+            "mean_ms": round(sum(samples) / len(samples), 3),
+            "p50_ms": round(samples[len(samples) // 2], 3),
+            "p95_ms": round(samples[int(len(samples) * 0.95)], 3),
+            "max_ms": round(samples[-1], 3),
+        }
@@ -1,29 +1,50 @@
-import os
+import functools
+import random
 import sqlite3
-import sys
-import time
 
 import pygame
 from pygame import locals
 
-from . import settings
+from . import controls, rules, settings
+from .governor import (
+    ANIMATION,
+    ASTEROIDS,
+    BACKGROUND,
+    EFFECTS,
+    STEPS,
+    create_governor,
+)
+from .layer import StaticLayer
+from .leaderboard import Leaderboard
 from .level import LevelDesign
-from .object import Explosion, Laser, Player, PowerUpEffect, Space
+from .object import (
+    AsteroidPool,
+    Explosion,
+    Laser,
+    Player,
+    PowerUpEffect,
+    Space,
+)
+from .particles import create_particles, draw_points
+from .rewind import create_rewind, restore
+from .savegame import save
+from .scene import Scene
+from .simulation import Simulation, Snapshot
 from .sound import BackgroundMusic, SoundEffect
+from .telemetry import NoTelemetry, create_telemetry
 from .text import BannerText, GenericText, MenuOptionText
 
 
-class GameLoop:
+class GameLoop(Scene):
     """This class contains the actuall game."""
 
-    def __init__(self):
-        """Initialize the necessary settings to run the game."""
+    def __init__(self, seed=None, saved=None):
+        """Initialize the necessary settings to run the game.
 
-        self.frame_rate = pygame.time.Clock()
-        self.screen_size = (settings.WIDTH, settings.HEIGHT)
-        self.screen = pygame.display.set_mode(self.screen_size)
-        pygame.display.set_caption(settings.CAPTION)
-        pygame.mouse.set_visible(0)
+        Everything that is loaded here is kept when the game is reset. The
+        game continues 'saved', a SavedGame, if it's given."""
+
+        super().__init__()
         # Changes to false after game is over.
         self.playing = True
         # Background music
@@ -34,24 +55,106 @@ class GameLoop:
             Space([0, 0], settings.SPACE_SPRITE),
             Space([640, 0], settings.SPACE_SPRITE),
         ]
-        # Generate level.
         self.level = LevelDesign()
-        self.enemies, self.powerups = self.level.get_level()
+        # Destroyed asteroids split into these, see fragment().
+        self.fragment_pool = AsteroidPool()
+        self.fragments_spawned = 0
         # Groups
         self.laser_group = pygame.sprite.RenderPlain()
         self.effect_group = pygame.sprite.RenderPlain()
-        self.asteroid_group = pygame.sprite.RenderPlain(self.enemies)
-        self.powerup_group = pygame.sprite.RenderPlain(self.powerups)
+        self.asteroid_group = pygame.sprite.RenderPlain()
+        self.powerup_group = pygame.sprite.RenderPlain()
         self.space_group = pygame.sprite.RenderPlain(self.space_sprites)
         self.player_group = pygame.sprite.RenderPlain(self.player_sprite)
         self.player_stats_group = pygame.sprite.RenderPlain(
             self.player_sprite.life, self.player_sprite.score, self.level
         )
+        self.particles = create_particles()
+        # The last ticks of the game, to rewind.
+        self.rewind = create_rewind()
+        self.explosion_sfx = SoundEffect(settings.EXPLOSION, 0.4)
+        self.telemetry = NoTelemetry()
+        # Sheds load when the frames overrun, see governor.py.
+        self.governor = create_governor()
+        self.skipped_animation = False
+        self.controls = controls.Controls()
+        # What the pressed actions do, the others are held down to steer.
+        self.actions = {controls.FIRE: self.fire}
+        # The still background and the rects drawn in the last frame when
+        # only the changes are redrawn, None means everything is redrawn.
+        self.background = None
+        self.dirty = None
+        # Steps the game on a worker thread while this one draws.
+        self.simulation = None
+        if settings.THREADED_SIMULATION:
+            self.simulation = Simulation(self)
+        if saved is None:
+            # Generate level.
+            self.reset(seed)
+        else:
+            self.load(saved)
+
+    def reset(self, seed=None):
+        """Start a new game from level 1 without loading anything again.
+
+        The random number generator is seeded with 'seed', or a random seed
+        if it's None, so a game can be played again."""
+
+        self._start(seed)
+        # Generate level.
+        self.level.reset()
+        self.enemies, self.powerups = self.level.get_level()
+        self.asteroid_group.add(self.enemies)
+        self.powerup_group.add(self.powerups)
+
+    def load(self, saved):
+        """Continue a SavedGame where it was saved.
+
+        The sprites are created from the save, with the frames that are
+        already cached, and the level isn't generated again."""
+
+        self._start(saved.seed)
+        self.enemies, self.powerups = [], []
+        self.level.level_design = ([], [])
+        restore(self, saved.header, saved.entities, saved.rng)
+
+    def _start(self, seed):
+        """Clear everything from the last game."""
+        self.seed = random.randrange(2**32) if seed is None else seed
+        random.seed(self.seed)
+        self.playing = True
+        self.player_sprite.reset()
+        self.controls.reset()
+        self.space_sprites[0].rect.topleft = [0, 0]
+        self.space_sprites[1].rect.topleft = [640, 0]
+        for group in (
+            self.laser_group,
+            self.effect_group,
+            self.asteroid_group,
+            self.powerup_group,
+        ):
+            group.empty()
+        self.particles.reset(self.seed)
+        self.governor.reset()
+        self.particles.density = settings.EFFECT_DENSITY
+        self.rewind.clear()
+        self.background = self.dirty = None
+        if self.simulation is not None:
+            self.simulation.tick = 0
+        # Records what happens during the session.
+        self.telemetry.close()
+        self.telemetry = create_telemetry()
 
     def animate_groups(self):
         """Animate the sprites in the groups in this method."""
-        for space in self.space_group.sprites():
-            space.animate(pygame.time.get_ticks())
+        if self.governor.level >= ANIMATION:
+            self.skipped_animation = not self.skipped_animation
+            if self.skipped_animation:
+                return
+        # The background stands still when only the sprites are redrawn.
+        if not settings.DIRTY_RECTS and self.governor.level < BACKGROUND:
+            for space in self.space_group.sprites():
+                space.animate(pygame.time.get_ticks())
         for laser in self.laser_group.sprites():
             laser.animate(pygame.time.get_ticks())
         for spaceship in self.player_group.sprites():
@@ -65,34 +168,55 @@ class GameLoop:
 
     def update_groups(self):
         """Update the sprites in the groups in this method."""
-        self.space_group.update()
+        if not settings.DIRTY_RECTS:
+            self.space_group.update()
         self.laser_group.update()
         self.player_group.update()
-        self.asteroid_group.update()
+        if self.governor.level >= ASTEROIDS:
+            self.update_asteroids(settings.GOVERNOR_MAX_ASTEROIDS)
+        else:
+            self.asteroid_group.update()
         self.powerup_group.update()
         self.effect_group.update()
+        self.particles.update()
         self.player_stats_group.update()
 
-    def draw_groups(self):
+    def update_asteroids(self, limit):
+        """Move the asteroids, but the ones that haven't come on the screen
+        yet wait while there are 'limit' asteroids on it."""
+
+        room = limit - sum(
+            asteroid.rect.left < settings.WIDTH
+            for asteroid in self.asteroid_group
+        )
+        for asteroid in self.asteroid_group.sprites():
+            if asteroid.rect.left < settings.WIDTH:
+                asteroid.update()
+            elif room > 0:
+                asteroid.update()
+                room -= asteroid.rect.left < settings.WIDTH
+
+    def shed_load(self, level):
+        """Degrade the game to the governor's new level."""
+        self.particles.density = settings.EFFECT_DENSITY
+        if level >= EFFECTS:
+            self.particles.density *= settings.GOVERNOR_EFFECT_SCALE
+        self.telemetry.event(f"governor {STEPS[level]}")
+
+    def draw_groups(self, screen):
         """Draw the sprites to the screen in the groups in this method."""
-        self.space_group.draw(self.screen)
-        self.laser_group.draw(self.screen)
-        self.player_group.draw(self.screen)
-        self.asteroid_group.draw(self.screen)
-        self.powerup_group.draw(self.screen)
-        self.effect_group.draw(self.screen)
-        self.player_stats_group.draw(self.screen)
+        self.space_group.draw(screen)
+        self.laser_group.draw(screen)
+        self.player_group.draw(screen)
+        self.asteroid_group.draw(screen)
+        self.powerup_group.draw(screen)
+        self.effect_group.draw(screen)
+        self.particles.draw(screen)
+        self.player_stats_group.draw(screen)
 
     def clean_groups(self):
         """Delete unnecessary sprites in the groups in this method."""
-        # Removes lasers that has reached the right side of the screen.
-        for laser in self.laser_group.sprites():
-            if laser.rect[0] > settings.WIDTH:
-                self.laser_group.remove(laser)
-        # Remove powerups that has reached the left edge of the screen.
-        for powerup in self.powerup_group.sprites():
-            if powerup.rect[0] < 0:
-                self.powerup_group.remove(powerup)
+        rules.clean(self.laser_group, self.powerup_group)
         # Removes explosions that has looped through the animation one time.
         for explosion in self.effect_group.sprites():
             if not explosion.life:
@@ -102,17 +226,43 @@ class GameLoop:
         """Things to do after done playing the game."""
 
         total_score = self.player_sprite.get_score()
-        GameOver(self.screen, self.space_group).run(total_score)
-        # Stop the music from playing before returning to the main menu.
-        self.bg_music.stop()
-        # Stop the game loop after the 'gameover' screen.
+        # Stop the game and show the 'gameover' screen in its place.
         self.playing = False
+        self.manager.replace(GameOver(self.space_group, total_score))
+
+    def update_score(self, event):
+        """Update the player's score and record the event."""
+        self.player_sprite.update_score(event)
+        self.telemetry.event(event)
+
+    def frame_time(self):
+        """Milliseconds the last frame of the game took before the wait.
+
+        With the simulation on its own thread that's the worker's last
+        step, the main thread only draws."""
+
+        if self.simulation is not None:
+            return self.simulation.tick_time
+        return self.manager.clock.get_rawtime()
+
+    def record_tick(self):
+        """Record the frame time and how many sprites there are."""
+        frame_time = self.frame_time()
+        counts = (
+            len(self.asteroid_group),
+            len(self.laser_group),
+            len(self.powerup_group),
+            len(self.effect_group),
+        )
+        self.telemetry.tick(frame_time, *counts)
+        self.manager.metrics.game(self.level.current_level, *counts)
 
-    def player_gets_powerup(self, player, powerup):
+    def player_gets_powerup(self, powerup):
         """Does things if the player picks up a power up object."""
 
-        hit = pygame.sprite.groupcollide(powerup, player, True, False)
-        if hit:
+        if rules.power_up(self.player_sprite, powerup):
+            self.telemetry.event("powerup")
+            self.particles.sparkle(self.player_sprite.rect.center)
             self.effect_group.add(
                 PowerUpEffect(
                     self.player_sprite,
@@ -123,16 +273,13 @@ class GameLoop:
 
             for powerup in self.effect_group.sprites():
                 powerup.sound_effect()
-            self.player_sprite.get_extra_life()
 
-    def asteroid_hits_player(self, asteroid, player):
+    def asteroid_hits_player(self, asteroid):
         """Does things if an asteroid hits the player."""
 
-        hit = pygame.sprite.groupcollide(asteroid, player, True, False)
-
-        if hit:
-            self.player_sprite.update_score("damaged")
-            self.player_sprite.lose_life()
+        if rules.damage(self.player_sprite, asteroid):
+            self.telemetry.event("damaged")
+            self.particles.explosion(self.player_sprite.rect.center)
             self.effect_group.add(
                 Explosion(
                     self.player_sprite,
@@ -145,7 +292,8 @@ class GameLoop:
                 explosion.sound_effect()
 
             if self.player_sprite.lives_left() == 0:  # Game over.
-                self.reset_game()
+                # update() shows the game over screen.
+                self.playing = False
 
     def laser_hits_asteroid(self, laser, asteroid):
         """Does things if the laser hits the asteroids."""
@@ -154,139 +302,313 @@ class GameLoop:
         active_laser = len(self.laser_group)
 
         if active_laser:
-            hit = pygame.sprite.groupcollide(laser, asteroid, True, True)
+            hit = rules.shoot_asteroids(laser, asteroid)
 
         if hit:
             # Create explosion object and explosion sound.
-            self.player_sprite.update_score("kill")
+            self.update_score("kill")
             # The laser obj is not important therefore it's an underscore.
             for _, asteroid_position in hit.items():
-                self.effect_group.add(
-                    Explosion(
-                        asteroid_position[0],  # The list has only one item.
-                        settings.EXPLOSION_SPRITE,
-                        pygame.time.get_ticks(),
+                asteroid = asteroid_position[0]  # The list has only one item.
+                self.fragment(asteroid)
+                if self.particles.enabled:
+                    # Debris instead of a sprite for every asteroid.
+                    self.particles.explosion(asteroid.rect.center)
+                else:
+                    self.effect_group.add(
+                        Explosion(
+                            asteroid,
+                            settings.EXPLOSION_SPRITE,
+                            pygame.time.get_ticks(),
+                        )
                     )
-                )
 
+            if self.particles.enabled:
+                self.explosion_sfx.play()
             for explosion in self.effect_group.sprites():
                 explosion.sound_effect()
 
+    def count_entities(self):
+        """Returns how many asteroids, lasers, power ups and effects live."""
+        return (
+            len(self.asteroid_group)
+            + len(self.laser_group)
+            + len(self.powerup_group)
+            + len(self.effect_group)
+        )
+
+    def fragment(self, asteroid):
+        """Split a destroyed asteroid into smaller, faster fragments.
+
+        The fragments come from the pool, and there are none when the
+        pool is empty, FRAGMENT_SPAWN_LIMIT have been spawned this frame
+        or there are ENTITY_BUDGET entities."""
+
+        smaller = [s for s in settings.ASTEROID_SCALES if s < asteroid.scale]
+        if not smaller:
+            return
+        x, y = asteroid.rect.center
+        speed = asteroid.speed[0] + settings.FRAGMENT_SPEEDUP
+        offset = asteroid.rect.height / settings.FRAGMENTS
+        for i in range(settings.FRAGMENTS):
+            if (
+                self.fragments_spawned >= settings.FRAGMENT_SPAWN_LIMIT
+                or self.count_entities() >= settings.ENTITY_BUDGET
+            ):
+                return
+            # Spread out across the asteroid, one above the other.
+            spread = (i - (settings.FRAGMENTS - 1) / 2) * offset
+            center = (x, round(y + spread))
+            spin = random.uniform(-1, 1) * settings.ASTEROID_SPIN
+            fragment = self.fragment_pool.acquire(
+                center, [speed, 0], max(smaller), spin
+            )
+            if fragment is None:
+                return
+            fragment.rect.center = center
+            self.asteroid_group.add(fragment)
+            self.fragments_spawned += 1
+
     def is_asteroids_destroyed(self):
         """Go to the next level if all asteroids are destroyed."""
 
-        if not len(self.asteroid_group):
-            self.player_sprite.update_score("level up")
-            self.enemies, self.powerups = self.level.next_level()
-            self.asteroid_group.add(self.enemies)
-            self.powerup_group.add(self.powerups)
+        new_level = rules.next_level(
+            [self.player_sprite],
+            self.level,
+            self.asteroid_group,
+            self.powerup_group,
+            self.count_entities(),
+        )
+        if new_level is not None:
+            self.telemetry.event("level up")
+            self.enemies, self.powerups = new_level
 
-    def main(self):
-        """The games main method that cointains the game loop."""
+    def enter(self):
         # Start playing the backgound music.
-        self.bg_music.play()
-
-        while self.playing:
-
-            # Set the maximum frame rate.
-            self.frame_rate.tick(settings.FPS)
-
-            # Handle all user events.
-            for event in pygame.event.get():
-                # Exit anytime by pressing escape or the window's close button.
-                if (
-                    event.type == locals.QUIT
-                    or event.type == locals.KEYDOWN
-                    and event.key == locals.K_ESCAPE
-                ):
-                    sys.exit()
-                # Makes the spaceship move smoother.
-                if event.type == locals.KEYUP:
-                    # The spaceship stops moving if the keys are released.
-                    if (
-                        event.key == locals.K_UP
-                        or event.key == locals.K_DOWN
-                        or event.key == locals.K_LEFT
-                        or event.key == locals.K_RIGHT
-                    ):
-                        for spaceship in self.player_group.sprites():
-                            spaceship.stop_moving(event.key)
-                # Makes the spaceship move.
-                if event.type == locals.KEYDOWN:
-                    # Control the spaceship.
-                    if (
-                        event.key == locals.K_UP
-                        or event.key == locals.K_DOWN
-                        or event.key == locals.K_LEFT
-                        or event.key == locals.K_RIGHT
-                    ):
-                        for spaceship in self.player_group.sprites():
-                            spaceship.move(event.key)
-                    # Fire weapon.
-                    if event.key == locals.K_SPACE:
-                        # lose one point everytime lasergun is fired
-                        self.player_sprite.update_score("fire")
-                        self.laser_group.add(
-                            Laser(
-                                settings.LASER_SPRITE,
-                                self.player_sprite.rect.center,
-                            )
-                        )
-                        for laser in self.laser_group.sprites():
-                            laser.sound_effect()
-                    # Pause game.
-                    if event.key == locals.K_p:
-                        self.bg_music.stop()  # Stop music when paused.
-                        value = PauseMenu(
-                            self.screen,
-                            self.space_group,
-                            self.laser_group,
-                            self.player_group,
-                            self.asteroid_group,
-                            self.powerup_group,
-                            self.effect_group,
-                        ).main()
-                        self.bg_music.play()  # Start music when game resumes.
-                        if value == "RESTART GAME":
-                            print(value)
-
-            # Collision detection.
-            self.laser_hits_asteroid(self.laser_group, self.asteroid_group)
-            self.asteroid_hits_player(self.asteroid_group, self.player_group)
-            self.player_gets_powerup(self.player_group, self.powerup_group)
-            self.is_asteroids_destroyed()
-
-            if self.playing:
-                # Animate the sprites in the groups.
-                self.animate_groups()
-                # Update the sprites in the groups.
-                self.update_groups()
-                # Draw over everything to clean up previously drawn sprites.
-                self.screen.fill(settings.BG_COLOR)
-                # Draw the sprites in the groups to the screen.
-                self.draw_groups()
-                # Clean up sprites no longer useful.
-                self.clean_groups()
-
-            # Make everything visible on the screen for the user.
-            pygame.display.update()
-
-
-class PauseMenu:
-    def __init__(self, screen, *args):
-        self.screen = screen
-        self.clock = pygame.time.Clock()
+        self.bg_music.play(settings.MUSIC_FADE)
+        self.dirty = None
+        if self.simulation is not None:
+            self.simulation.start()
+        if settings.PROFILER_FIRST_GAME and self.manager.profiler is None:
+            # Started with --profile-frames.
+            settings.PROFILER_FIRST_GAME = False
+            self.manager.toggle_profiling()
+
+    def describe(self):
+        return f"seed{self.seed}-level{self.level.current_level}"
+
+    def resume(self, result):
+        # Back from the pause menu.
+        # The game goes on if it couldn't be saved.
+        if result == "SAVE GAME" and save(self):
+            self.manager.quit()
+            return
+        self.bg_music.unpause()
+        self.dirty = None
+        if self.simulation is not None:
+            self.simulation.start()
+
+    def leave(self):
+        if self.simulation is not None:
+            self.simulation.stop()
+        # The menu is quiet.
+        self.bg_music.stop(settings.MUSIC_FADE)
+        self.telemetry.close()
+        # Nothing from this game is needed until the next reset().
+        self.rewind.clear()
+        self.enemies, self.powerups = [], []
+        self.level.level_design = ([], [])
+        for group in (
+            self.laser_group,
+            self.effect_group,
+            self.asteroid_group,
+            self.powerup_group,
+        ):
+            group.empty()
+
+    def pause(self):
+        """Stop the game and show the pause menu."""
+        if self.simulation is not None:
+            self.simulation.stop()
+        # The keys may be released while the pause menu is on top.
+        self.controls.reset()
+        self.bg_music.pause()  # Pause music when paused.
+        self.manager.push(
+            PauseMenu(
+                self.space_group,
+                self.laser_group,
+                self.player_group,
+                self.asteroid_group,
+                self.powerup_group,
+                self.effect_group,
+            )
+        )
+
+    def handle_event(self, event):
+        """Pause the game or pass the pressed action on to handle_input()."""
+        action = self.controls.handle(event)
+        if action == controls.PAUSE:
+            self.pause()
+        elif action not in self.actions:
+            return
+        elif self.simulation is not None:
+            self.simulation.send(action)
+        else:
+            self.handle_input(action)
+
+    def handle_input(self, action):
+        """Do what a pressed action does."""
+        self.actions[action]()
+
+    def fire(self):
+        """Fire the laser gun."""
+        # lose one point everytime lasergun is fired
+        self.update_score("fire")
+        self.laser_group.add(
+            Laser(
+                settings.LASER_SPRITE,
+                self.player_sprite.rect.center,
+            )
+        )
+        for laser in self.laser_group.sprites():
+            laser.sound_effect()
+
+    def step(self):
+        """Run the game logic one frame."""
+        self.fragments_spawned = 0
+        if self.controls.held & controls.REWIND and self.rewind.enabled:
+            # The game runs backwards while the key is held down.
+            self.rewind.rewind(self, settings.REWIND_SPEED)
+            return
+        # Collision detection.
+        self.laser_hits_asteroid(self.laser_group, self.asteroid_group)
+        self.asteroid_hits_player(self.asteroid_group)
+        if not self.playing:
+            return
+        self.player_gets_powerup(self.powerup_group)
+        self.is_asteroids_destroyed()
+        # The ship moves while the keys are held down.
+        self.player_sprite.steer(self.controls.held)
+
+        # Animate the sprites in the groups.
+        self.animate_groups()
+        # Update the sprites in the groups.
+        self.update_groups()
+        # Clean up sprites no longer useful.
+        self.clean_groups()
+        self.rewind.capture(self)
+        self.record_tick()
+
+    def snapshot(self, tick):
+        """Returns what draw_groups() would draw as a Snapshot."""
+        sprites = [
+            (sprite.image, sprite.rect.topleft)
+            for group in (
+                self.space_group,
+                self.laser_group,
+                self.player_group,
+                self.asteroid_group,
+                self.powerup_group,
+                self.effect_group,
+            )
+            for sprite in group.sprites()
+        ]
+        hud = [
+            (sprite.image, sprite.rect.topleft)
+            for sprite in self.player_stats_group.sprites()
+        ]
+        return Snapshot(tick, sprites, self.particles.points(), hud)
+
+    def update(self):
+        """Run the game one frame, unless the worker is running it."""
+        self.controls.poll()
+        level = self.governor.observe(self.frame_time())
+        if level is not None and self.simulation is not None:
+            # The worker owns the particles and the telemetry.
+            self.simulation.send(functools.partial(self.shed_load, level))
+        elif level is not None:
+            self.shed_load(level)
+        if self.simulation is None:
+            self.step()
+        elif self.simulation.running:
+            return
+        # The game is over and the worker has stopped.
+        if not self.playing:
+            self.reset_game()
+
+    def draw_dirty(self, screen):
+        """Draw the sprites over the still background where they changed.
+
+        Where the sprites were in the last frame is covered with the
+        background first. Returns the rects that changed, or None if the
+        whole screen was redrawn."""
+
+        if self.background is None:
+            self.background = pygame.Surface(screen.get_size()).convert()
+            self.background.fill(settings.BG_COLOR)
+            self.space_group.draw(self.background)
+        if self.dirty is None:
+            screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.dirty:
+                screen.blit(self.background, rect, rect)
+
+        rects = []
+        for group in (
+            self.laser_group,
+            self.player_group,
+            self.asteroid_group,
+            self.powerup_group,
+            self.effect_group,
+        ):
+            rects += screen.blits([(s.image, s.rect) for s in group])
+        points = self.particles.points()
+        if points is not None and len(points[0]):
+            draw_points(screen, points)
+            (left, top), (right, bottom) = points[0].min(0), points[0].max(0)
+            area = pygame.Rect(left, top, right - left + 2, bottom - top + 2)
+            rects.append(area.clip(screen.get_rect()))
+        rects += screen.blits(
+            [(s.image, s.rect) for s in self.player_stats_group]
+        )
+
+        changed = None if self.dirty is None else self.dirty + rects
+        self.dirty = rects
+        return changed
+
+    def draw(self, screen):
+        if self.simulation is None and settings.DIRTY_RECTS:
+            return self.draw_dirty(screen)
+        # Draw over everything to clean up previously drawn sprites.
+        screen.fill(settings.BG_COLOR)
+        if self.simulation is None:
+            # Draw the sprites in the groups to the screen.
+            self.draw_groups(screen)
+            return
+        snapshot = self.simulation.latest
+        if snapshot is not None:
+            screen.blits(snapshot.sprites, False)
+            draw_points(screen, snapshot.points)
+            screen.blits(snapshot.hud, False)
+
+
+class PauseMenu(Scene):
+    # Nothing moves, so the frames don't need to be precise.
+    pacing = "sleep"
+
+    def __init__(self, *args):
+        super().__init__()
         self.groups = [group.sprites() for group in args]
         self.banner = GenericText(35, "PAUSE", [250, 130])
 
         # Pause menu options.
         self.options = [
             MenuOptionText(15, "RESUME", [283, 180], True),
-            MenuOptionText(15, "QUIT", [295, 200], False),
+            MenuOptionText(15, "SAVE & QUIT", [253, 200], False),
+            MenuOptionText(15, "QUIT", [295, 220], False),
         ]
 
-        self.text_group = pygame.sprite.RenderPlain(self.banner)
-        self.menu_group = pygame.sprite.RenderPlain(self.options)
+        self.text_group = StaticLayer(self.banner, self.options)
         self.group_group = [pygame.sprite.RenderPlain(g) for g in self.groups]
 
         # Sound effects.
@@ -295,41 +617,27 @@ class PauseMenu:
 
     def update_selected_option(self, key):
 
-        current = None
-
-        for option in self.options:
-            if option.get_state():
-                current = option.text
+        states = [option.get_state() for option in self.options]
+        index = states.index(True)
+        current = self.options[index].text
 
-        if key == locals.K_DOWN:
+        if key in (locals.K_DOWN, locals.K_UP):
 
             self.choice_sfx.play()
 
-            if current == "RESUME":
-                self.options[0].change_state()
-                self.options[1].change_state()
-            elif current == "QUIT":
-                self.options[0].change_state()
-                self.options[1].change_state()
-
-        elif key == locals.K_UP:
-
-            self.choice_sfx.play()
-
-            if current == "RESUME":
-                self.options[0].change_state()
-                self.options[1].change_state()
-            elif current == "QUIT":
-                self.options[0].change_state()
-                self.options[1].change_state()
+            step = 1 if key == locals.K_DOWN else -1
+            self.options[index].change_state()
+            self.options[(index + step) % len(self.options)].change_state()
 
         elif key == locals.K_RETURN:
             if current == "RESUME":
                 return "RESUME GAME"
+            elif current == "SAVE & QUIT":
+                return "SAVE GAME"
             elif current == "QUIT":
-                sys.exit()
+                self.manager.quit()
 
-    def dim_screen(self):
+    def dim_screen(self, screen):
         """Create an transparent surface to dim the screen."""
         # Creates a surface that covers the entire screen.
         dimmed = pygame.Surface((settings.WIDTH, settings.HEIGHT))
@@ -337,155 +645,156 @@ class PauseMenu:
         dimmed.set_alpha(100)
         dimmed.fill(settings.BG_COLOR)
         # Draw it to the screen.
-        self.screen.blit(dimmed, (0, 0))
-
-    def main(self):
-
-        while True:
-            self.clock.tick(settings.FPS)
-            for event in pygame.event.get():
-                if (
-                    event.type == locals.QUIT
-                    or event.type == locals.KEYDOWN
-                    and event.key == locals.K_ESCAPE
-                ):
-                    sys.exit()
-                if event.type == locals.KEYDOWN:
-                    if event.key == locals.K_p:
-                        return
-                if event.type == locals.KEYDOWN:
-                    if (
-                        event.key == locals.K_UP
-                        or event.key == locals.K_DOWN
-                        or locals.K_RETURN
-                    ):
-                        choice = self.update_selected_option(event.key)
-                        if choice == "RESUME GAME":
-                            return
-
-            # Animate groups.
-            for group in self.group_group:
-                for sprite in group.sprites():
-                    sprite.animate(pygame.time.get_ticks())
-
-            # Update the screen
-            self.text_group.update()
-            self.menu_group.update()
-
-            # draw space
-            self.screen.fill(settings.BG_COLOR)
-            for group in self.group_group:
-                group.draw(self.screen)
-            self.dim_screen()
-            self.text_group.draw(self.screen)
-            self.menu_group.draw(self.screen)
-
-            pygame.display.update()
-
-
-class HighscoreSection:
-    def __init__(self, screen, group):
-
-        self.screen = screen
+        screen.blit(dimmed, (0, 0))
+
+    def handle_event(self, event):
+        if event.type == locals.KEYDOWN:
+            if event.key == locals.K_p:
+                self.manager.pop()
+            elif event.key in (locals.K_UP, locals.K_DOWN, locals.K_RETURN):
+                choice = self.update_selected_option(event.key)
+                if choice == "RESUME GAME":
+                    self.manager.pop()
+                elif choice == "SAVE GAME":
+                    # The game saves itself and quits.
+                    self.manager.pop(choice)
+
+    def update(self):
+        # Animate groups.
+        for group in self.group_group:
+            for sprite in group.sprites():
+                sprite.animate(pygame.time.get_ticks())
+
+        # Update the screen
+        self.text_group.update()
+
+    def draw(self, screen):
+        # draw space
+        screen.fill(settings.BG_COLOR)
+        for group in self.group_group:
+            group.draw(screen)
+        self.dim_screen(screen)
+        self.text_group.draw(screen)
+
+
+class HighscoreSection(Scene):
+    def __init__(self, group):
+
+        super().__init__()
         self.space = group.sprites()  # The scrolling background.
         self.space_group = pygame.sprite.RenderPlain(self.space)
         self.db = GameDatabase()
-        self.db.create_table()
         self.title = GenericText(20, "HIGHSCORE:", [250, 100])
-        self.text = self.db.get_highscore_list()
-        self.text_group = pygame.sprite.RenderPlain(self.title, self.text)
-
-    def main(self):
-
-        while True:
-            pygame.time.Clock().tick(settings.FPS)
-
-            for event in pygame.event.get():
-                if (
-                    event.type == locals.QUIT
-                    or event.type == locals.KEYDOWN
-                    and event.key == locals.K_ESCAPE
-                ):
-                    sys.exit()
-                if event.type == locals.KEYDOWN:
-                    if event.key == locals.K_BACKSPACE:
-                        return
-
-            # Animate space.
-            for space in self.space_group.sprites():
-                space.animate(pygame.time.get_ticks())
-
-            # Update the screen.
-            self.space_group.update()
-            self.text_group.update()
+        # Keyset cursors for the pages before the current one.
+        self.cursors = [None]
+        self.rows = self.db.get_page(self.cursors[-1])
+        self.text = self.db.get_highscore_list(self.rows)
+        self.text_group = StaticLayer(self.title, self.text)
+
+    def change_page(self, key):
+        """Browse the highscores one page at a time."""
+        page_size = settings.HIGHSCORE_PAGE_SIZE
+
+        if key == locals.K_RIGHT and len(self.rows) == page_size:
+            last = self.rows[-1]
+            rows = self.db.get_page((last[0], last[3]))
+            if not rows:
+                return
+            self.cursors.append((last[0], last[3]))
+        elif key == locals.K_LEFT and len(self.cursors) > 1:
+            self.cursors.pop()
+            rows = self.db.get_page(self.cursors[-1])
+        else:
+            return
+
+        self.rows = rows
+        first = (len(self.cursors) - 1) * page_size + 1
+        self.text_group.remove(self.text)
+        self.text = self.db.get_highscore_list(self.rows, first)
+        self.text_group.add(self.text)
+
+    def leave(self):
+        self.db.close()
+
+    def handle_event(self, event):
+        if event.type == locals.KEYDOWN:
+            if event.key == locals.K_BACKSPACE:
+                self.manager.pop()
+            elif event.key in (locals.K_LEFT, locals.K_RIGHT):
+                self.change_page(event.key)
+
+    def update(self):
+        # Animate space.
+        for space in self.space_group.sprites():
+            space.animate(pygame.time.get_ticks())
 
-            # Draw.
-            self.screen.fill(settings.BG_COLOR)
-            self.space_group.draw(self.screen)
-            self.text_group.draw(self.screen)
+        # Update the screen.
+        self.space_group.update()
+        self.text_group.update()
 
-            pygame.display.update()
+    def draw(self, screen):
+        screen.fill(settings.BG_COLOR)
+        self.space_group.draw(screen)
+        self.text_group.draw(screen)
 
 
 class GameDatabase:
-    def __init__(self):
-        self._check_dir(settings.DATABASE)
-        self.db_conn = sqlite3.connect(settings.DATABASE)
-        self.db_curs = self.db_conn.cursor()
-        self.create_table()
+    """Turns the leaderboard into text objects for the screens."""
 
-    def _check_dir(self, database):
-        """Create directory if not exists"""
-        if not os.path.exists(os.path.dirname(database)):
-            os.mkdir(os.path.dirname(database))
+    def __init__(self, database=None):
+        self.leaderboard = Leaderboard(database or settings.DATABASE)
 
     def create_table(self):
         """Creates a new table if it doesn't exist."""
-        query = (
-            "CREATE TABLE IF NOT EXISTS highscore"
-            "(score int, player text, date text)"
-        )
-        self.db_curs.execute(query)
-        self.db_conn.commit()
+        self.leaderboard.create_table()
+
+    def close(self):
+        """Close the connection to the database."""
+        self.leaderboard.close()
 
     def save_highscore(self, score, player="anonymous"):
-        try:
-            date = time.strftime("%Y/%m/%d")
-            query = "INSERT INTO highscore VALUES (?,?,?)"
-            self.db_curs.execute(query, (score, player, date))
-        except sqlite3.OperationalError as error:
-            print(f"GameDatabase.save_highscore(): {error}")
-        else:
-            self.db_conn.commit()
+        self.leaderboard.save(score, player)
 
     def get_highscores(self):
         try:
-            query = "SELECT * FROM highscore ORDER BY score DESC LIMIT 10"
-            self.db_curs.execute(query)
+            return self.leaderboard.top(settings.HIGHSCORE_PAGE_SIZE)
         except sqlite3.OperationalError as error:
             print(f"GameDatabase.get_highscores(): {error}")
-        else:
-            self.db_conn.commit()
+            return []
 
-        return self.db_curs.fetchall()
+    def get_page(self, after=None):
+        """Returns one page of highscores that comes after a cursor."""
+        try:
+            return self.leaderboard.page(settings.HIGHSCORE_PAGE_SIZE, after)
+        except sqlite3.OperationalError as error:
+            print(f"GameDatabase.get_page(): {error}")
+            return []
 
-    def get_highscore_list(self):
+    def get_rank(self, score):
+        """Returns the rank of a score and the number of saved scores."""
+        try:
+            return self.leaderboard.rank(score), self.leaderboard.count()
+        except sqlite3.OperationalError as error:
+            print(f"GameDatabase.get_rank(): {error}")
+            return None
+
+    def get_highscore_list(self, rows=None, first=1):
         """Returns a list with highscores to display on the screen."""
-        num = 1
+        if rows is None:
+            rows = self.get_highscores()
+        num = first
         x, y = 210, 140
         scores = []
-        # Get highscores from the database.
-        for score in self.get_highscores():
+        for score in rows:
             text = f"{self._prefix(num)}. {score[0]} {score[1]}"
             scores.append(GenericText(15, text, [x, y]))
             num += 1
             y += 15
 
-        score_list = len(self.get_highscores())
-        max_scores = 10
-        # Create empty placeholders if there are less than ten scores.
-        if score_list < max_scores:
-            missing = max_scores - score_list
+        max_scores = settings.HIGHSCORE_PAGE_SIZE
+        # Create empty placeholders if there are less than a page of scores.
+        if len(rows) < max_scores:
+            missing = max_scores - len(rows)
             for _ in range(missing):
                 text = f"{self._prefix(num)}."
                 scores.append(GenericText(15, text, [x, y]))
@@ -502,10 +811,10 @@ class GameDatabase:
             return str(num)
 
 
-class HelpSection:
-    def __init__(self, screen, group):
+class HelpSection(Scene):
+    def __init__(self, group):
 
-        self.screen = screen
+        super().__init__()
         self.space = group.sprites()  # The scrolling background.
         self.space_group = pygame.sprite.RenderPlain(self.space)
 
@@ -524,93 +833,83 @@ class HelpSection:
             GenericText(15, " ENTER - Enter", [50, 255]),
             GenericText(15, " ARROWS - Control spaceship", [50, 270]),
             GenericText(15, " P - Pause game", [50, 285]),
+            GenericText(15, " LEFT/RIGHT - Browse highscore", [50, 300]),
         ]
-        self.text_group = pygame.sprite.RenderPlain(self.text)
-
-    def main(self):
+        self.text_group = StaticLayer(self.text)
 
-        while True:
-            pygame.time.Clock().tick(settings.FPS)
+    def handle_event(self, event):
+        if event.type == locals.KEYDOWN:
+            if event.key == locals.K_BACKSPACE:
+                self.manager.pop()
 
-            for event in pygame.event.get():
-                if (
-                    event.type == locals.QUIT
-                    or event.type == locals.KEYDOWN
-                    and event.key == locals.K_ESCAPE
-                ):
-                    sys.exit()
-                if event.type == locals.KEYDOWN:
-                    if event.key == locals.K_BACKSPACE:
-                        return
-
-            # Animate space.
-            for space in self.space_group.sprites():
-                space.animate(pygame.time.get_ticks())
-
-            # Update the screen
-            self.space_group.update()
-            self.text_group.update()
+    def update(self):
+        # Animate space.
+        for space in self.space_group.sprites():
+            space.animate(pygame.time.get_ticks())
 
-            # Draw
-            self.screen.fill(settings.BG_COLOR)
-            self.space_group.draw(self.screen)
-            self.text_group.draw(self.screen)
+        # Update the screen
+        self.space_group.update()
+        self.text_group.update()
 
-            pygame.display.update()
+    def draw(self, screen):
+        screen.fill(settings.BG_COLOR)
+        self.space_group.draw(screen)
+        self.text_group.draw(screen)
 
 
-class GameOver:
-    def __init__(self, screen, group):
-        self.screen = screen
+class GameOver(Scene):
+    def __init__(self, group, score):
+        super().__init__()
+        self.score = score
         self.space = group.sprites()  # The scrolling background.
         self.banner = BannerText(25, "GAME OVER", [0, 50])
         self.title = GenericText(20, "HIGHSCORE:", [250, 100])
-        self.highscore = GameDatabase().get_highscore_list()
-        self.clock = pygame.time.Clock()
+        self.db = GameDatabase()
+        self.highscore = self.db.get_highscore_list()
+        self.rank = None
         self.space_group = pygame.sprite.RenderPlain(self.space)
-        self.text_group = pygame.sprite.RenderPlain(self.banner, self.title)
+        self.banner_group = pygame.sprite.RenderPlain(self.banner)
+        self.text_group = StaticLayer(self.title)
         self.sfx = SoundEffect(settings.GAME_OVER, 1.0)
 
     def update_highscore(self, score):
         """Get an updated version of the highscore list."""
-        GameDatabase().save_highscore(score)
+        self.db.save_highscore(score)
         self.text_group.remove(self.highscore)  # Remove old highscore list.
-        self.highscore = GameDatabase().get_highscore_list()
+        self.highscore = self.db.get_highscore_list()
         self.text_group.add(self.highscore)
+        # Show where the score ended up among all saved scores.
+        ranked = self.db.get_rank(score)
+        if ranked is None:
+            return
+        rank, total = ranked
+        text = f"RANK: {rank} OF {total}"
+        self.rank = GenericText(15, text, [210, 305])
+        self.text_group.add(self.rank)
+
+    def enter(self):
+        self.update_highscore(self.score)
+
+    def leave(self):
+        self.db.close()
+
+    def handle_event(self, event):
+        if event.type == locals.KEYDOWN:
+            if event.key == locals.K_RETURN or event.key == locals.K_BACKSPACE:
+                self.manager.pop()
+
+    def update(self):
+        # Animate space.
+        for space in self.space_group.sprites():
+            space.animate(pygame.time.get_ticks())
 
-    def run(self, score):
-
-        self.update_highscore(score)
-
-        while True:
-
-            self.clock.tick(settings.FPS)
-
-            for event in pygame.event.get():
-                if (
-                    event.type == locals.QUIT
-                    or event.type == locals.KEYDOWN
-                    and event.key == locals.K_ESCAPE
-                ):
-                    sys.exit()
-                if event.type == locals.KEYDOWN:
-                    if (
-                        event.key == locals.K_RETURN
-                        or event.key == locals.K_BACKSPACE
-                    ):
-                        return
-
-            # Animate space.
-            for space in self.space_group.sprites():
-                space.animate(pygame.time.get_ticks())
-
-            # Update the screen
-            self.space_group.update()
-            self.text_group.update()
-
-            # draw space
-            self.screen.fill(settings.BG_COLOR)
-            self.space_group.draw(self.screen)
-            self.text_group.draw(self.screen)
-
-            pygame.display.update()
+        # Update the screen
+        self.space_group.update()
+        self.banner_group.update()
+
+    def draw(self, screen):
+        # draw space
+        screen.fill(settings.BG_COLOR)
+        self.space_group.draw(screen)
+        self.text_group.draw(screen)
+        self.banner_group.draw(screen)
@@ -0,0 +1,89 @@
+"""Sheds load when the frames take longer than the frame rate allows.
+
+The game moves a fixed distance every frame, so a frame that overruns its
+budget slows the whole game down. The Governor watches the time the last
+GOVERNOR_WINDOW frames took before the wait for the next one, and when
+GOVERNOR_OVERRUNS of them took longer than a frame at FPS it degrades the
+game one step of STEPS:
+
+    animation   the sprites are animated every other frame
+    effects     explosions and power ups throw fewer particles
+    background  the background isn't animated
+    asteroids   asteroids wait off screen while GOVERNOR_MAX_ASTEROIDS are
+                on it
+
+It goes back one step when every frame of a whole window took less than
+GOVERNOR_HEADROOM of the budget. The window starts over after every
+change, so the game changes at most once a window."""
+
+import collections
+
+from . import settings
+
+STEPS = ("full", "animation", "effects", "background", "asteroids")
+FULL, ANIMATION, EFFECTS, BACKGROUND, ASTEROIDS = range(len(STEPS))
+
+
+class Governor:
+    """Chooses how much of the game is degraded from the frame times."""
+
+    def __init__(self, fps=None, window=None):
+        fps = settings.FPS if fps is None else fps
+        # Milliseconds a frame may take.
+        self.budget = 1000 / fps if fps else None
+        self.window = window or settings.GOVERNOR_WINDOW
+        self.times = collections.deque(maxlen=self.window)
+        self.level = FULL
+
+    def reset(self):
+        """Start over with nothing degraded."""
+        self.times.clear()
+        self.level = FULL
+
+    def observe(self, frame_time):
+        """Add the milliseconds a frame took.
+
+        Returns the new level if it changed, otherwise None."""
+
+        if self.budget is None:  # No frame cap, every frame is on time.
+            return None
+        self.times.append(frame_time)
+        overruns = sum(time > self.budget for time in self.times)
+        if overruns >= settings.GOVERNOR_OVERRUNS and self.level < ASTEROIDS:
+            return self._change(self.level + 1)
+        if (
+            self.level > FULL
+            and len(self.times) == self.window
+            and max(self.times) < self.budget * settings.GOVERNOR_HEADROOM
+        ):
+            return self._change(self.level - 1)
+        return None
+
+    def _change(self, level):
+        mean = sum(self.times) / len(self.times)
+        print(
+            f"Governor: {STEPS[self.level]} -> {STEPS[level]}, "
+            f"{mean:.1f} ms a frame for {self.budget:.1f} ms"
+        )
+        self.level = level
+        self.times.clear()
+        return level
+
+
+class NoGovernor:
+    """Stand-in that never degrades anything when the governor is off."""
+
+    level = FULL
+
+    def reset(self):
+        pass
+
+    def observe(self, frame_time):
+        return None
+
+
+def create_governor():
+    """Returns a Governor if it's enabled in the settings."""
+    if settings.GOVERNOR:
+        return Governor()
+    return NoGovernor()
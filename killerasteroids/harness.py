@@ -0,0 +1,340 @@
+"""Runs the game headlessly to measure it.
+
+The 'bench', 'simulate', 'replay' and 'profile' commands of the
+'killerasteroids' script play a game from a fixed seed, level and number
+of asteroids without a window or sound, steering and firing at random
+from the same seed, and print the throughput, tick times and memory as
+JSON:
+
+    killerasteroids bench --seed 1 --level 3 --ticks 2000
+    killerasteroids simulate --asteroids 60 --record run.ndjson
+    killerasteroids replay run.ndjson
+    killerasteroids profile --ticks 500 --stats run.prof
+
+'bench' runs whole frames like the SceneManager does and 'simulate' only
+the game logic. 'replay' plays the input a simulation recorded and fails
+if the game doesn't end in the same state."""
+
+import atexit
+import cProfile
+import hashlib
+import io
+import json
+import os
+import pstats
+import random
+import sys
+import tempfile
+import time
+
+import pygame
+from pygame import locals
+
+from . import settings
+from .rewind import get_entities, get_header
+
+try:
+    import resource
+except ImportError:  # Windows.
+    resource = None
+
+# Where the test games keep their files, removed when the process exits.
+_directory = None
+
+STEER = [locals.K_UP, locals.K_DOWN, locals.K_LEFT, locals.K_RIGHT, None]
+
+
+def headless():
+    """Run without a window or sound and keep the highscores, logs and
+    saves of the test games out of the real ones."""
+
+    global _directory
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if _directory is None:
+        _directory = tempfile.TemporaryDirectory(prefix="killerasteroids-")
+        atexit.register(_directory.cleanup)
+    directory = _directory.name
+    settings.DATABASE = os.path.join(directory, "highscore.db")
+    settings.TELEMETRY_FILE = os.path.join(directory, "telemetry.ndjson")
+    settings.SAVE_FILE = os.path.join(directory, "game.sav")
+    # The harness steps the game itself.
+    settings.THREADED_SIMULATION = False
+    # The same input has to play the same game however fast it runs.
+    settings.GOVERNOR = False
+
+
+def percentiles(seconds):
+    """Returns the mean, median, p90, p99 and max of 'seconds' in ms."""
+    if not seconds:
+        return {}
+    ms = sorted(s * 1000 for s in seconds)
+    return {
+        "mean": round(sum(ms) / len(ms), 3),
+        "p50": round(ms[len(ms) // 2], 3),
+        "p90": round(ms[int(len(ms) * 0.9)], 3),
+        "p99": round(ms[int(len(ms) * 0.99)], 3),
+        "max": round(ms[-1], 3),
+    }
+
+
+def max_rss_kb():
+    """Returns the most memory the process has used in KiB, or None."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB everywhere else.
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def digest(game):
+    """Returns a hash of everything the rewind buffer would capture.
+
+    The animation frames follow the clock instead of the ticks, so they're
+    left out."""
+
+    entities = [
+        (kind, x, y, speed, scale, spin, angle)
+        for kind, _, x, y, speed, _, scale, spin, angle in get_entities(game)
+    ]
+    state = (game.playing, get_header(game), entities)
+    return hashlib.sha1(repr(state).encode()).hexdigest()
+
+
+def start_game(game, seed, level=1, asteroids=None):
+    """Start a new game at 'level' with 'asteroids' asteroids."""
+    game.reset(seed)
+    if level == 1 and asteroids is None:
+        return
+    game.asteroid_group.empty()
+    game.powerup_group.empty()
+    game.enemies, game.powerups = game.level.start_at(level, asteroids)
+    game.asteroid_group.add(game.enemies)
+    game.powerup_group.add(game.powerups)
+
+
+def random_input(rng):
+    """Yield the key events of every tick, steering and firing at random.
+
+    An event is a (pressed, key) pair."""
+
+    held = None
+    while True:
+        events = []
+        if rng.random() < 0.1:
+            if held is not None:
+                events.append((False, held))
+            held = rng.choice(STEER)
+            if held is not None:
+                events.append((True, held))
+        if rng.random() < 0.2:
+            events += [(True, locals.K_SPACE), (False, locals.K_SPACE)]
+        yield events
+
+
+def run(
+    seed=0,
+    level=1,
+    asteroids=None,
+    ticks=1000,
+    seconds=None,
+    draw=False,
+    script=None,
+):
+    """Play a game and return its metrics and the input that was played.
+
+    The game runs for 'ticks' ticks or 'seconds' seconds, whichever is
+    first, and starts over from the same seed when it's over. It draws and
+    presents every frame if 'draw' is true. 'script' has the input of the
+    ticks by tick, the input is random if it's None."""
+
+    from .display import GameLoop
+    from .scene import SceneManager
+
+    manager = SceneManager()
+    game = GameLoop(seed)
+    start_game(game, seed, level, asteroids)
+    manager.push(game)
+    inputs = random_input(random.Random(seed))
+    played = {}
+    times = []
+    games = 1
+
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if seconds is not None and time.perf_counter() - start > seconds:
+            break
+        if script is None:
+            keys = next(inputs)
+        else:
+            keys = script.get(tick, [])
+        if keys:
+            played[tick] = keys
+        events = [
+            pygame.event.Event(
+                locals.KEYDOWN if pressed else locals.KEYUP, key=key
+            )
+            for pressed, key in keys
+        ]
+        before = time.perf_counter()
+        if draw:
+            manager.frame(events)
+        else:
+            for event in events:
+                game.handle_event(event)
+            game.update()
+        times.append(time.perf_counter() - before)
+        if manager.top is not game:
+            # Game over, play again.
+            games += 1
+            start_game(game, seed, level, asteroids)
+            manager.replace(game)
+    elapsed = time.perf_counter() - start
+
+    metrics = {
+        "seed": seed,
+        "level": level,
+        "asteroids": asteroids,
+        "ticks": len(times),
+        "seconds": round(elapsed, 3),
+        "ticks_per_s": round(len(times) / elapsed, 1) if elapsed else None,
+        "tick_ms": percentiles(times),
+        "games": games,
+        "entities": len(list(get_entities(game))),
+        "max_rss_kb": max_rss_kb(),
+        "digest": digest(game),
+    }
+    manager.quit()
+    return metrics, played
+
+
+def save_script(file, metrics, script):
+    """Write the input of a run and how it ended as NDJSON."""
+    with open(file, "w") as fh:
+        fh.write(json.dumps(metrics) + "\n")
+        for tick, keys in sorted(script.items()):
+            fh.write(json.dumps([tick, keys]) + "\n")
+
+
+def load_script(file):
+    """Returns the metrics and input save_script() wrote."""
+    with open(file) as fh:
+        metrics = json.loads(fh.readline())
+        script = {}
+        for line in fh:
+            if line.strip():
+                tick, keys = json.loads(line)
+                script[tick] = [tuple(key) for key in keys]
+    return metrics, script
+
+
+def _output(args, metrics):
+    text = json.dumps(metrics, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+
+
+def _run_args(args, **kwargs):
+    return run(
+        seed=args.seed,
+        level=args.level,
+        asteroids=args.asteroids,
+        ticks=args.ticks,
+        seconds=args.seconds,
+        **kwargs,
+    )
+
+
+def bench(args):
+    metrics, _ = _run_args(args, draw=True)
+    _output(args, dict(command="bench", **metrics))
+    return 0
+
+
+def simulate(args):
+    metrics, script = _run_args(args)
+    if args.record:
+        save_script(args.record, metrics, script)
+    _output(args, dict(command="simulate", **metrics))
+    return 0
+
+
+def replay(args):
+    recorded, script = load_script(args.file)
+    metrics, _ = run(
+        seed=recorded["seed"],
+        level=recorded["level"],
+        asteroids=recorded["asteroids"],
+        ticks=recorded["ticks"],
+        draw=args.draw,
+        script=script,
+    )
+    metrics["match"] = metrics["digest"] == recorded["digest"]
+    _output(args, dict(command="replay", **metrics))
+    return 0 if metrics["match"] else 1
+
+
+def profile(args):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    metrics, _ = _run_args(args, draw=True)
+    profiler.disable()
+    if args.stats:
+        profiler.dump_stats(args.stats)
+    listing = io.StringIO()
+    stats = pstats.Stats(profiler, stream=listing)
+    stats.sort_stats(args.sort).print_stats(args.limit)
+    # The listing goes to stderr, so stdout is only the metrics.
+    print(listing.getvalue(), file=sys.stderr)
+    _output(args, dict(command="profile", **metrics))
+    return 0
+
+
+def add_commands(subparsers):
+    """Add the harness's commands to the script's argument parser."""
+    options = {
+        "bench": ("Play whole frames as fast as possible.", bench),
+        "simulate": ("Run only the game logic as fast as possible.", simulate),
+        "profile": ("Run the benchmark under cProfile.", profile),
+    }
+    for name, (description, function) in options.items():
+        parser = subparsers.add_parser(
+            name, description=description, help=description
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--level", type=int, default=1)
+        parser.add_argument(
+            "--asteroids",
+            type=int,
+            help="asteroids instead of the level's",
+        )
+        parser.add_argument("--ticks", type=int, default=1000)
+        parser.add_argument(
+            "--seconds", type=float, help="stop after this long"
+        )
+        parser.add_argument("--output", help="also write the JSON here")
+        parser.set_defaults(run=function)
+    subparsers.choices["simulate"].add_argument(
+        "--record", help="write the input to replay it"
+    )
+    parser = subparsers.choices["profile"]
+    parser.add_argument("--stats", help="write the pstats file here")
+    parser.add_argument("--sort", default="cumulative")
+    parser.add_argument("--limit", type=int, default=25)
+
+    description = "Play a recorded simulation, fail if it ends differently."
+    parser = subparsers.add_parser(
+        "replay", description=description, help=description
+    )
+    parser.add_argument("file", help="a file simulate --record wrote")
+    parser.add_argument("--draw", action="store_true")
+    parser.add_argument("--output", help="also write the JSON here")
+    parser.set_defaults(run=replay)
+
+
+def main(args):
+    """Run the command in 'args', returns the exit code."""
+    headless()
+    return args.run(args)
@@ -0,0 +1,42 @@
+import pygame
+
+
+class StaticLayer(pygame.sprite.Group):
+    """A group of sprites that rarely change, drawn as one surface.
+
+    The sprites are drawn once to a cached surface, which is blitted to the
+    screen every frame instead of every sprite on its own. The cache is
+    redrawn when a sprite is added or removed, moves or gets a new image."""
+
+    def __init__(self, *sprites):
+        super().__init__(*sprites)
+        self.image = None
+        self.rect = None
+        self._state = None
+        # Number of times the cache has been redrawn.
+        self.renders = 0
+
+    def _current_state(self):
+        return [(sprite.image, sprite.rect.topleft) for sprite in self]
+
+    def _render(self):
+        """Draw every sprite to the cached surface."""
+        sprites = self.sprites()
+        self.rect = sprites[0].rect.unionall([s.rect for s in sprites[1:]])
+        self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        for sprite in sprites:
+            self.image.blit(
+                sprite.image, sprite.rect.move(-self.rect.x, -self.rect.y)
+            )
+        self.renders += 1
+
+    def draw(self, surface):
+        """Draw the cached surface, redrawing it first if it's stale."""
+        if not self:
+            return []
+        state = self._current_state()
+        if state != self._state:
+            self._render()
+            self._state = state
+        surface.blit(self.image, self.rect)
+        return [self.rect]
@@ -0,0 +1,191 @@
+import csv
+import os
+import sqlite3
+import time
+
+from . import settings
+
+
+class Leaderboard:
+    """Stores the highscores in SQLite and answers rank queries.
+
+    Browsing uses keyset pagination on an index over the score, so a page
+    costs the same no matter how deep into the table it is. Triggers keep
+    the number of scores in every 'bucket' points in highscore_count, so a
+    rank adds up the buckets above the score and only counts the scores in
+    its own bucket in the index. It costs the number of buckets plus the
+    scores in one bucket, not the number of scores above it."""
+
+    def __init__(self, database, bucket=None):
+        self.bucket = bucket or settings.HIGHSCORE_BUCKET
+        self._check_dir(database)
+        self.db_conn = sqlite3.connect(database)
+        self.db_curs = self.db_conn.cursor()
+        self.create_table()
+
+    def _check_dir(self, database):
+        """Create directory if not exists"""
+        directory = os.path.dirname(database)
+        if directory and not os.path.exists(directory):
+            os.mkdir(directory)
+
+    def create_table(self):
+        """Creates the table and its indexes if they don't exist."""
+        queries = (
+            "CREATE TABLE IF NOT EXISTS highscore"
+            "(score int, player text, date text)",
+            "CREATE INDEX IF NOT EXISTS highscore_score ON highscore(score)",
+            "CREATE INDEX IF NOT EXISTS highscore_player "
+            "ON highscore(player, score)",
+        )
+        for query in queries:
+            self.db_curs.execute(query)
+        # The user version is the bucket size the counts were made with.
+        version = self.db_curs.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.bucket:
+            self.create_counts()
+        self.db_conn.commit()
+
+    def create_counts(self):
+        """Count the scores in buckets again and keep the counts updated."""
+
+        def bucket(score):
+            # Negative scores are counted in the first bucket.
+            return f"MAX({score}, 0) / {self.bucket}"
+
+        queries = (
+            "DROP TABLE IF EXISTS highscore_count",
+            "CREATE TABLE highscore_count (bucket INTEGER PRIMARY KEY, n int)",
+            f"INSERT INTO highscore_count SELECT {bucket('score')}, COUNT(*) "
+            "FROM highscore GROUP BY 1",
+            "DROP TRIGGER IF EXISTS highscore_insert",
+            "CREATE TRIGGER highscore_insert AFTER INSERT ON highscore BEGIN "
+            "INSERT OR IGNORE INTO highscore_count "
+            f"VALUES ({bucket('NEW.score')}, 0); "
+            "UPDATE highscore_count SET n = n + 1 "
+            f"WHERE bucket = {bucket('NEW.score')}; END",
+            "DROP TRIGGER IF EXISTS highscore_delete",
+            "CREATE TRIGGER highscore_delete AFTER DELETE ON highscore BEGIN "
+            "UPDATE highscore_count SET n = n - 1 "
+            f"WHERE bucket = {bucket('OLD.score')}; END",
+            f"PRAGMA user_version = {self.bucket}",
+        )
+        for query in queries:
+            self.db_curs.execute(query)
+
+    def close(self):
+        """Close the database connection."""
+        self.db_conn.close()
+
+    def save(self, score, player="anonymous", date=None):
+        """Insert one score, returns True if it was saved."""
+        if date is None:
+            date = time.strftime("%Y/%m/%d")
+        try:
+            query = "INSERT INTO highscore VALUES (?,?,?)"
+            self.db_curs.execute(query, (score, player, date))
+        except sqlite3.OperationalError as error:
+            print(f"Leaderboard.save(): {error}")
+            return False
+        self.db_conn.commit()
+        return True
+
+    def top(self, limit=10):
+        """Returns the best (score, player, date) rows."""
+        query = (
+            "SELECT score, player, date FROM highscore "
+            "ORDER BY score DESC, rowid DESC LIMIT ?"
+        )
+        return self.db_curs.execute(query, (limit,)).fetchall()
+
+    def page(self, size=10, after=None):
+        """Returns one page of (score, player, date, rowid) rows.
+
+        'after' is the (score, rowid) of the last row on the previous page,
+        or None for the first page."""
+        if after is None:
+            query = (
+                "SELECT score, player, date, rowid FROM highscore "
+                "ORDER BY score DESC, rowid DESC LIMIT ?"
+            )
+            return self.db_curs.execute(query, (size,)).fetchall()
+        query = (
+            "SELECT score, player, date, rowid FROM highscore "
+            "WHERE (score, rowid) < (?, ?) "
+            "ORDER BY score DESC, rowid DESC LIMIT ?"
+        )
+        return self.db_curs.execute(query, (*after, size)).fetchall()
+
+    def count(self):
+        """Returns the number of saved scores."""
+        query = "SELECT TOTAL(n) FROM highscore_count"
+        return int(self.db_curs.execute(query).fetchone()[0])
+
+    def count_above(self, score):
+        """Returns the number of saved scores that are higher."""
+        bucket = max(score, 0) // self.bucket
+        query = "SELECT TOTAL(n) FROM highscore_count WHERE bucket > ?"
+        above = self.db_curs.execute(query, (bucket,)).fetchone()[0]
+        # The rest are in the score's bucket.
+        query = "SELECT COUNT(*) FROM highscore WHERE score > ? AND score < ?"
+        upper = (bucket + 1) * self.bucket
+        inside = self.db_curs.execute(query, (score, upper)).fetchone()[0]
+        return int(above) + inside
+
+    def rank(self, score):
+        """Returns the position the score has, or would have, in the list."""
+        return self.count_above(score) + 1
+
+    def percentile(self, score):
+        """Returns the percentage of saved scores that are lower or equal."""
+        total = self.count()
+        if not total:
+            return 100.0
+        return 100.0 * (total - self.count_above(score)) / total
+
+    def player_best(self, player):
+        """Returns the best score of a player, or None if there is none."""
+        query = "SELECT MAX(score) FROM highscore WHERE player = ?"
+        return self.db_curs.execute(query, (player,)).fetchone()[0]
+
+    def player_bests(self, limit=10):
+        """Returns (player, best score) pairs for the best players."""
+        query = (
+            "SELECT player, MAX(score) AS best FROM highscore "
+            "GROUP BY player ORDER BY best DESC LIMIT ?"
+        )
+        return self.db_curs.execute(query, (limit,)).fetchall()
+
+    def import_csv(self, file):
+        """Append the rows of a 'score,player,date' CSV file.
+
+        Everything is inserted in a single transaction. Returns the number
+        of imported rows."""
+        with open(file, newline="") as fh:
+            reader = csv.reader(fh)
+            rows = (
+                (int(score), player, date)
+                for score, player, date in reader
+                if score != "score"  # Skip the header.
+            )
+            with self.db_conn:
+                self.db_curs.executemany(
+                    "INSERT INTO highscore VALUES (?,?,?)", rows
+                )
+        # The rows changed by the triggers aren't counted.
+        return self.db_curs.rowcount
+
+    def export_csv(self, file):
+        """Write every row to a 'score,player,date' CSV file.
+
+        Rows are streamed from the cursor so the table never has to fit
+        in memory. Returns the number of exported rows."""
+        exported = 0
+        query = "SELECT score, player, date FROM highscore ORDER BY rowid"
+        with open(file, "w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(("score", "player", "date"))
+            for row in self.db_conn.execute(query):
+                writer.writerow(row)
+                exported += 1
+        return exported
@@ -3,6 +3,7 @@ import random
 import pygame
 
 from . import settings
+from .assets import get_assets
 from .object import Asteroid, PowerUp
 from .sound import SoundEffect
 
@@ -11,8 +12,9 @@ class LevelDesign(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
         self.current_level = 1
-        self.level_design = self.generate_level()
-        self.font = pygame.font.Font(settings.FONT, 15)
+        # Generated by reset(), or loaded with a saved game.
+        self.level_design = ([], [])
+        self.font = get_assets().font(15)
         self.text = f"LEVEL: {self.current_level}"
         self.image = self.font.render(self.text, 1, settings.TEXT_COLOR)
         self.rect = self.image.get_rect()
@@ -23,26 +25,59 @@ class LevelDesign(pygame.sprite.Sprite):
         self.text = f"LEVEL: {self.current_level}"
         self.image = self.font.render(self.text, 1, settings.TEXT_COLOR)
 
+    def reset(self):
+        """Go back to the first level."""
+        self.current_level = 1
+        self.level_design = self.generate_level()
+        self.update()
+
     def get_level(self):
         return self.level_design
 
-    def next_level(self):
+    def start_at(self, level, asteroids=None):
+        """Go to 'level', with 'asteroids' asteroids instead of the level's."""
+        self.current_level = level
+        self.level_design = (
+            self._get_enemies(asteroids),
+            self._get_powerups(),
+        )
+        self.update()
+        return self.level_design
+
+    def next_level(self, room=None):
+        """Go to the next level, with at most 'room' asteroids."""
         self.sfx.play()
         self.current_level += 1
-        self.level_design = self.generate_level()
+        self.level_design = self.generate_level(room)
 
         return self.level_design
 
-    def _get_enemies(self):
-        """Generates enemies, which is tripled each level up."""
-        num = self.current_level * 3  # Total number of objects on this level.
+    def _get_enemies(self, num=None, room=None):
+        """Generates enemies, which is tripled each level up.
+
+        There are at most 'room' of them, but always one to shoot."""
+        if num is None:
+            # Total number of objects on this level.
+            num = self.current_level * 3
+        if room is not None:
+            num = max(1, min(num, room))
         enemies = []
         for enemy in range(num):
             x = random.randint(600, 2000)
             y = random.randint(settings.LIMIT_UP, settings.LIMIT_DOWN)
             pos = [x, y]
             speed = [random.randint(3, 6), 0]
-            enemies.append(Asteroid(settings.ASTEROID_SPRITE, pos, speed))
+            scale = random.choice(settings.ASTEROID_SCALES)
+            spin = random.uniform(-1, 1) * settings.ASTEROID_SPIN
+            enemies.append(
+                Asteroid(
+                    settings.ASTEROID_SPRITE,
+                    pos,
+                    speed,
+                    scale=scale,
+                    spin=spin,
+                )
+            )
 
         return enemies
 
@@ -58,9 +93,14 @@ class LevelDesign(pygame.sprite.Sprite):
 
         return powerups
 
-    def generate_level(self):
-        """Returns a tuple with all objects for the level."""
-        enemies = self._get_enemies()
+    def generate_level(self, room=None):
+        """Returns a tuple with all objects for the level.
+
+        'room' is how many asteroids there's room for, ENTITY_BUDGET if
+        it's None."""
+        if room is None:
+            room = settings.ENTITY_BUDGET
+        enemies = self._get_enemies(room=room)
         powerups = self._get_powerups()
         objs = (enemies, powerups)
 
@@ -0,0 +1,248 @@
+"""Finds memory that isn't released between games.
+
+A MemoryMonitor on the SceneManager takes a tracemalloc snapshot and
+counts the live scenes, sprites, surfaces, sounds and database
+connections every time another scene comes to the top of the stack. Every
+return to the menu ends a session, and after the first sessions have
+filled the caches the memory should be back at the same level every time.
+
+'python -m killerasteroids.memory' plays a few sessions headlessly, prints
+the growth between them and fails if the memory didn't return to the
+baseline."""
+
+import argparse
+import collections
+import gc
+import itertools
+import random
+import sqlite3
+import sys
+import tracemalloc
+
+import pygame
+from pygame import locals
+
+from . import settings
+from .harness import headless
+from .scene import Scene
+
+# Objects that are counted at every checkpoint.
+TRACKED = (
+    ("scenes", Scene),
+    ("sprites", pygame.sprite.Sprite),
+    ("surfaces", pygame.Surface),
+    ("sounds", pygame.mixer.Sound),
+    ("connections", sqlite3.Connection),
+)
+# Counts that have to be back at the baseline after every session.
+NO_GROWTH = ("scenes", "sprites", "connections")
+
+Checkpoint = collections.namedtuple(
+    "Checkpoint", "label session current peak counts"
+)
+
+
+def count_objects():
+    """Returns how many objects of every tracked type are alive."""
+    gc.collect()
+    objects = gc.get_objects()
+    counts = dict.fromkeys([name for name, _ in TRACKED], 0)
+    # The name every type is counted as, or None if it isn't tracked.
+    names = {}
+    seen = set()
+    # Surfaces and sounds aren't tracked by the garbage collector, they're
+    # found through the objects that refer to them.
+    for obj in itertools.chain(objects, gc.get_referents(*objects)):
+        cls = type(obj)
+        if cls not in names:
+            names[cls] = next(
+                (name for name, kind in TRACKED if issubclass(cls, kind)), None
+            )
+        name = names[cls]
+        if name is not None and id(obj) not in seen:
+            seen.add(id(obj))
+            counts[name] += 1
+    return counts
+
+
+class MemoryMonitor:
+    """Records the memory at every scene change and compares sessions.
+
+    A session ends every time 'label' comes back to the top of the stack.
+    The checkpoint after 'warmup' sessions is the baseline that every
+    later session is compared with."""
+
+    def __init__(self, label="MenuScreen", warmup=1, tolerance=None):
+        self.label = label
+        self.warmup = warmup
+        self.tolerance = tolerance or settings.MEMORY_TOLERANCE
+        self.session = 0
+        self.checkpoints = []
+        self.baseline = None
+        # Only the baseline and latest snapshots are kept.
+        self._snapshots = {}
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.MEMORY_FRAMES)
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def checkpoint(self, label):
+        """Record the memory when the scene 'label' is at the top."""
+        self.start()
+        counts = count_objects()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        if label == self.label and self.checkpoints:
+            self.session += 1
+        checkpoint = Checkpoint(label, self.session, current, peak, counts)
+        self.checkpoints.append(checkpoint)
+        if label == self.label:
+            self._snapshots["latest"] = snapshot
+            if self.session == self.warmup:
+                self.baseline = checkpoint
+                self._snapshots["baseline"] = snapshot
+        return checkpoint
+
+    def sessions(self):
+        """Returns the checkpoint at the end of every session."""
+        return [c for c in self.checkpoints if c.label == self.label]
+
+    def growth(self):
+        """Returns the growth since the baseline after every session.
+
+        Every item is the session and a dict with 'bytes' and the change
+        in every count."""
+
+        if self.baseline is None:
+            return []
+        growth = []
+        for checkpoint in self.sessions():
+            if checkpoint.session <= self.baseline.session:
+                continue
+            change = {"bytes": checkpoint.current - self.baseline.current}
+            for name, count in checkpoint.counts.items():
+                change[name] = count - self.baseline.counts[name]
+            growth.append((checkpoint.session, change))
+        return growth
+
+    def top_growth(self, limit=10):
+        """Returns the lines that allocated the most since the baseline."""
+        if "baseline" not in self._snapshots:
+            return []
+        stats = self._snapshots["latest"].compare_to(
+            self._snapshots["baseline"], "lineno"
+        )
+        return [stat for stat in stats if stat.size_diff > 0][:limit]
+
+    def check(self):
+        """Returns a list of problems, empty if memory is at the baseline."""
+        growth = self.growth()
+        if not growth:
+            return []
+        session, change = growth[-1]
+        problems = []
+        if change["bytes"] > self.tolerance:
+            problems.append(
+                f"session {session}: {change['bytes']} bytes more than the "
+                f"baseline (tolerance {self.tolerance})"
+            )
+        for name in NO_GROWTH:
+            if change[name] > 0:
+                problems.append(f"session {session}: {change[name]} {name}")
+        return problems
+
+    def report(self):
+        """Returns a text report of every checkpoint and the growth."""
+        lines = [
+            "session  scene              KiB  "
+            + "  ".join(name for name, _ in TRACKED)
+        ]
+        for c in self.checkpoints:
+            counts = "  ".join(
+                f"{c.counts[name]:>{len(name)}}" for name, _ in TRACKED
+            )
+            lines.append(
+                f"{c.session:>7}  {c.label:<14} {c.current // 1024:>7}  "
+                f"{counts}"
+            )
+        for session, change in self.growth():
+            lines.append(f"Growth after session {session}: {change}")
+        stats = self.top_growth()
+        if stats:
+            lines.append("Biggest growth since the baseline:")
+            lines.extend(f"  {stat}" for stat in stats)
+        return "\n".join(lines)
+
+
+def _key(key):
+    return pygame.event.Event(locals.KEYDOWN, key=key)
+
+
+def _select(manager, menu, label):
+    """Move down the menu to the option called 'label'."""
+    for _ in menu.option.all:
+        if menu.option.active.text == label:
+            return
+        manager.frame([_key(locals.K_DOWN)])
+    raise ValueError(f"_select(): there's no {label} option")
+
+
+def play_sessions(manager, sessions, frames, seed=None):
+    """Play games from the menu headlessly and go back to the menu.
+
+    The player flies and fires at random for 'frames' frames, or until the
+    game is over."""
+
+    from .menu import MenuScreen
+
+    rng = random.Random(seed)
+    controls = [locals.K_UP, locals.K_DOWN, locals.K_SPACE]
+    menu = MenuScreen()
+    manager.push(menu)
+    for _ in range(sessions):
+        _select(manager, menu, "START GAME")
+        manager.frame([_key(locals.K_RETURN)])
+        for _ in range(frames):
+            if manager.top is not menu.game:
+                break
+            manager.frame([_key(rng.choice(controls))])
+        if manager.top is menu.game:
+            menu.game.playing = False
+            manager.frame([])
+        while manager.top is not menu:
+            # Leave the game over screen.
+            manager.frame([_key(locals.K_RETURN)])
+    manager.quit()
+
+
+def main(argv=None):
+    """Play sessions and fail if the memory doesn't return to the baseline."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    headless()
+    from .scene import SceneManager
+
+    manager = SceneManager()
+    manager.monitor = MemoryMonitor()
+    manager.monitor.start()
+    play_sessions(manager, args.sessions, args.frames, args.seed)
+    print(manager.monitor.report())
+    problems = manager.monitor.check()
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
-import sys
-
 import pygame
 from pygame import locals
 
 from . import settings
 from .display import GameLoop, HelpSection, HighscoreSection
+from .layer import StaticLayer
 from .object import Space
+from .savegame import has_save, load, remove
+from .scene import Scene
 from .sound import SoundEffect
-from .text import GenericText, MenuOptionText
+from .text import GenericText, LoadingText, MenuOptionText
 
 
 class Option:
@@ -105,40 +106,59 @@ class MenuOptions:
         self.current.data.is_selected = True
 
 
-class MenuScreen:
+class MenuScreen(Scene):
     """Main menu screen."""
 
     def __init__(self):
 
-        pygame.mixer.pre_init(44100, -16, 2, 512)
-        pygame.init()
-        self.screen_size = (settings.WIDTH, settings.HEIGHT)
-        self.screen = pygame.display.set_mode(self.screen_size)
-        pygame.display.set_caption(settings.CAPTION)
-        pygame.mouse.set_visible(0)
+        super().__init__()
 
         # Sprites.
         self.title = GenericText(25, settings.CAPTION, [150, 50])
+        self.loading = LoadingText([250, settings.HEIGHT - 40])
         self.space_sprites = [
             Space([0, 0], settings.SPACE_SPRITE),
             Space([640, 0], settings.SPACE_SPRITE),
         ]
 
-        self.option = MenuOptions([250, 150])
-        self.option.add("START GAME", active=True)
-        self.option.add("HIGHSCORE")
-        self.option.add("HELP")
-        self.option.add("QUIT")
+        self.option = None
+        self.saved = None
 
         # Groups.
         self.space_group = pygame.sprite.RenderPlain(self.space_sprites)
-        self.menu_group = pygame.sprite.RenderPlain(self.title, self.option.all)
+        self.menu_group = None
+        self.build_options()
 
         # Sound effects.
         self.choice_sfx = SoundEffect(settings.MENU_BEEP, 0.5)
         self.startgame_sfx = SoundEffect(settings.START_GAME, 1.0)
+        # The game is created once and reset for every new game.
+        self.game = None
+
+    def build_options(self):
+        """Build the options, CONTINUE is only there while a save is."""
+
+        saved = has_save()
+        if self.option is not None and saved == self.saved:
+            return
+        self.saved = saved
 
-    def update(self, key):
+        self.option = MenuOptions([250, 150])
+        # A saved game is continued from the first option.
+        if saved:
+            self.option.add("CONTINUE", active=True)
+            self.option.add("START GAME")
+        else:
+            self.option.add("START GAME", active=True)
+        self.option.add("HIGHSCORE")
+        self.option.add("HELP")
+        self.option.add("QUIT")
+        self.menu_group = StaticLayer(self.title, self.option.all)
+        # Only until the assets that are preloaded are there.
+        if not self.loading.done:
+            self.menu_group.add(self.loading)
+
+    def update_selected_option(self, key):
         """Update and activate option in menu."""
 
         if key == locals.K_DOWN:
@@ -152,55 +172,66 @@ class MenuScreen:
         elif key == locals.K_RETURN:
             active = self.option.active.text
 
-            if active == "START GAME":
+            if active == "CONTINUE":
+                saved = load()
+                # A saved game is only continued once.
+                remove()
+                if saved is None:
+                    return
+                self.startgame_sfx.play()
+                if self.game is None:
+                    self.game = GameLoop(saved=saved)
+                else:
+                    self.game.load(saved)
+                self.manager.push(self.game)
+
+            elif active == "START GAME":
                 self.startgame_sfx.play()
-                GameLoop().main()
+                if self.game is None:
+                    self.game = GameLoop()
+                else:
+                    self.game.reset()
+                self.manager.push(self.game)
 
             elif active == "HIGHSCORE":
-                HighscoreSection(self.screen, self.space_group).main()
+                self.manager.push(HighscoreSection(self.space_group))
 
             elif active == "HELP":
-                HelpSection(self.screen, self.space_group).main()
+                self.manager.push(HelpSection(self.space_group))
 
             elif active == "QUIT":
-                sys.exit()
-
-    def game_menu(self):
-        """Menu screen loop."""
-
-        while True:
-            pygame.time.Clock().tick(settings.FPS)
-
-            # Handle user input.
-            for event in pygame.event.get():
-                if event.type == locals.KEYDOWN:
-                    menu_exit = (
-                        event.type == locals.QUIT
-                        or event.type == locals.KEYDOWN
-                        and event.key == locals.K_ESCAPE
-                    )
-                    menu_event = (
-                        event.key == locals.K_UP
-                        or event.key == locals.K_DOWN
-                        or event.key == locals.K_RETURN
-                    )
-
-                    if menu_exit:
-                        sys.exit()
-                    elif menu_event:
-                        self.update(event.key)
-
-            # Animate space.
-            for space in self.space_group.sprites():
-                space.animate(pygame.time.get_ticks())
-
-            # Update sprites.
-            self.space_group.update()
-            self.menu_group.update()
-
-            # Draw sprites.
-            self.screen.fill(settings.BG_COLOR)
-            self.space_group.draw(self.screen)
-            self.menu_group.draw(self.screen)
-
-            pygame.display.update()
+                self.manager.quit()
+
+    def enter(self):
+        self.build_options()
+
+    def resume(self, result):
+        # The game may have been saved or its save continued.
+        self.build_options()
+
+    def handle_event(self, event):
+        """Handle user input."""
+        if event.type == locals.KEYDOWN:
+            menu_event = (
+                event.key == locals.K_UP
+                or event.key == locals.K_DOWN
+                or event.key == locals.K_RETURN
+            )
+
+            if menu_event:
+                self.update_selected_option(event.key)
+
+    def update(self):
+        # Animate space.
+        for space in self.space_group.sprites():
+            space.animate(pygame.time.get_ticks())
+
+        # Update sprites.
+        self.space_group.update()
+        self.menu_group.update()
+
+    def draw(self, screen):
+        # Draw sprites.
+        screen.fill(settings.BG_COLOR)
+        self.space_group.draw(screen)
+        self.menu_group.draw(screen)
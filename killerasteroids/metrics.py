@@ -0,0 +1,217 @@
+"""Live metrics for Prometheus, served over a local socket.
+
+While the game runs with --metrics, the SceneManager writes the frame
+rate and the time every phase of a frame took to a Metrics object, and
+the game the sprites in every group and its level. A server thread
+answers every request on METRICS_HOST:METRICS_PORT, or on the Unix socket
+METRICS_SOCKET if it's set, with them in Prometheus' text format:
+
+    curl -s localhost:9464/metrics
+    curl -s --unix-socket /tmp/killerasteroids.sock localhost/metrics
+
+The game thread only assigns numbers, it never takes a lock or waits for
+the server. The server copies them when it's asked, and reads how many
+audio channels are playing from the mixer then."""
+
+import http.server
+import os
+import socketserver
+import threading
+import time
+
+import pygame
+
+from . import settings
+
+PHASES = ("events", "update", "draw", "present")
+GROUPS = ("asteroids", "lasers", "powerups", "effects")
+PREFIX = "killerasteroids_"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header(
+            "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+        )
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scraped every few seconds, that would fill the console.
+        pass
+
+
+class _TCPServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    def get_request(self):
+        # The handler expects the client's address to be a pair.
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+
+class Metrics:
+    """The game's counters, and the server that answers with them."""
+
+    def __init__(self):
+        self.frames = 0
+        self.fps = 0.0
+        self.scene = ""
+        self.level = 0
+        # Seconds the phases took in the last frame and in every frame.
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.phase_totals = dict.fromkeys(PHASES, 0.0)
+        self.entities = dict.fromkeys(GROUPS, 0)
+        self._lap = time.perf_counter()
+        self._server = None
+        self._thread = None
+
+    def begin(self):
+        """Start timing a frame."""
+        self._lap = time.perf_counter()
+
+    def lap(self, phase):
+        """The frame's 'phase' has ended."""
+        now = time.perf_counter()
+        self.phases[phase] = now - self._lap
+        self.phase_totals[phase] += now - self._lap
+        self._lap = now
+
+    def frame(self, fps, scene):
+        """A frame of 'scene' has been presented."""
+        self.frames += 1
+        self.fps = fps
+        self.scene = scene
+
+    def game(self, level, *counts):
+        """The game's level and the sprites in each of GROUPS."""
+        self.level = level
+        # One new dict, so a request never sees half of a tick.
+        self.entities = dict(zip(GROUPS, counts))
+
+    def render(self):
+        """Returns the metrics in Prometheus' text format."""
+        phases = dict(self.phases)
+        totals = dict(self.phase_totals)
+        channels = busy = 0
+        if pygame.mixer.get_init():
+            channels = pygame.mixer.get_num_channels()
+            busy = sum(
+                pygame.mixer.Channel(i).get_busy() for i in range(channels)
+            )
+        metrics = [
+            ("frames_total", "counter", "Frames presented.", self.frames),
+            ("fps", "gauge", "Frames per second.", round(self.fps, 2)),
+            (
+                "scene",
+                "gauge",
+                "The scene that is running.",
+                {("scene", self.scene): 1},
+            ),
+            (
+                "phase_seconds",
+                "gauge",
+                "Seconds each phase of the last frame took.",
+                {("phase", name): phases[name] for name in PHASES},
+            ),
+            (
+                "phase_seconds_total",
+                "counter",
+                "Seconds each phase of every frame took.",
+                {("phase", name): totals[name] for name in PHASES},
+            ),
+            (
+                "entities",
+                "gauge",
+                "Sprites in each group of the game.",
+                {("group", name): n for name, n in self.entities.items()},
+            ),
+            ("level", "gauge", "The level being played.", self.level),
+            ("audio_channels", "gauge", "Mixer channels.", channels),
+            (
+                "audio_channels_busy",
+                "gauge",
+                "Mixer channels that are playing.",
+                busy,
+            ),
+        ]
+        lines = []
+        for name, kind, description, values in metrics:
+            lines.append(f"# HELP {PREFIX}{name} {description}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            if not isinstance(values, dict):
+                values = {None: values}
+            for label, value in values.items():
+                labels = "" if label is None else '{%s="%s"}' % label
+                lines.append(f"{PREFIX}{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+    def start(self, host=None, port=None, path=None):
+        """Serve the metrics on a server thread.
+
+        On the Unix socket 'path' if it's given, or METRICS_SOCKET, and on
+        'host':'port' if it isn't. Returns the address it listens on."""
+
+        path = path or settings.METRICS_SOCKET
+        try:
+            if path:
+                if os.path.exists(path):
+                    # Left behind by a game that crashed.
+                    os.remove(path)
+                self._server = _UnixServer(path, _Handler)
+            else:
+                self._server = _TCPServer(
+                    (
+                        host or settings.METRICS_HOST,
+                        settings.METRICS_PORT if port is None else port,
+                    ),
+                    _Handler,
+                )
+        except OSError as error:
+            print(f"Metrics.start(): {error}")
+            self._server = None
+            return None
+        self._server.metrics = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics", daemon=True
+        )
+        self._thread.start()
+        return self._server.server_address
+
+    def close(self):
+        """Stop the server."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        if isinstance(self._server, _UnixServer):
+            os.remove(self._server.server_address)
+        self._server = self._thread = None
+
+
+class NoMetrics:
+    """Stand-in that ignores everything when the metrics are turned off."""
+
+    def begin(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def frame(self, fps, scene):
+        pass
+
+    def game(self, level, *counts):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,694 @@
+"""Two player games over the network.
+
+A Server runs the game's rules without drawing anything and is the only
+one who decides what happens. Every tick it reads the players' input over
+UDP, steps the game and sends every client a snapshot of it. A snapshot
+only has what changed since the last snapshot the client acknowledged, so
+a lost packet costs nothing but a bigger next one.
+
+A Client sends the player's input every frame and keeps the last few
+snapshots. It draws the game a couple of ticks in the past, interpolating
+between the two snapshots around that time, so the movement is smooth
+even though the server only sends NET_TICK_RATE snapshots a second. The
+entities are sent by their centers, and the asteroids with their size and
+how far they've turned, so they're drawn where the server hits them.
+
+Run a server with 'python -m killerasteroids.network server' and play on
+it with 'python -m killerasteroids.network client'. 'loopback' runs a
+server and two scripted clients on localhost and prints the bandwidth
+every client uses and how long the ticks take."""
+
+import argparse
+import collections
+import json
+import os
+import random
+import socket
+import struct
+import time
+
+import pygame
+
+from . import rules, settings
+from .assets import get_assets
+from .controls import (
+    BINDINGS,
+    DOWN,
+    FIRE,
+    LEFT,
+    PAUSE,
+    REWIND,
+    RIGHT,
+    UP,
+    Controls,
+)
+from .level import LevelDesign
+from .object import Laser, Player, RotationCache
+from .scene import Scene
+
+# The buttons that are held down are sent as a bit field of the actions,
+# a network game can't be paused or rewound.
+KEYS = {
+    key: action
+    for key, action in BINDINGS.items()
+    if action not in (PAUSE, REWIND)
+}
+
+# Kinds of entities in a snapshot, the players are PLAYER + their slot.
+ASTEROID = 0
+LASER = 1
+POWERUP = 2
+PLAYER = 3
+SPRITES = {
+    ASTEROID: settings.ASTEROID_SPRITE,
+    LASER: settings.LASER_SPRITE,
+    POWERUP: settings.POWER_UP_SPRITE,
+}
+
+# Client -> server: input sequence number, acknowledged tick and buttons.
+INPUT = struct.Struct("<IIB")
+# Server -> client: tick, tick the delta is against (0 for a full
+# snapshot), the client's slot and the number of players, changed,
+# moved and removed entities that follow.
+HEADER = struct.Struct("<IIBBHHH")
+# Slot, lives and score of every player.
+PLAYER_STATE = struct.Struct("<Bbi")
+# Id, kind, center, size and turn of an added or changed entity. The size
+# is an index in ASTEROID_SCALES and the turn is in ROTATION_STEP degrees,
+# they're 0 for everything but the asteroids.
+ENTITY = struct.Struct("<HBhhBB")
+# Id, offset and turn of an entity that only moved a little.
+MOVED = struct.Struct("<HbbB")
+REMOVED = struct.Struct("<H")
+
+
+class NetIds:
+    """Gives out the 16 bit ids of the entities in the snapshots.
+
+    The id of an entity that is gone is given out again, but only after
+    NET_HISTORY ticks, when no snapshot that is kept still has it, so a
+    client never mistakes a new entity for an old one."""
+
+    def __init__(self, history=None):
+        self.history = settings.NET_HISTORY if history is None else history
+        self.tick = 0
+        self._next = 1
+        # The sprites by id, and (tick, id) of the ids that were freed.
+        self._sprites = {}
+        self._free = collections.deque()
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def acquire(self, sprite):
+        """Returns the sprite's id, giving it one if it has none."""
+        net_id = getattr(sprite, "net_id", None)
+        if net_id is not None:
+            return net_id
+        if self._free and self._free[0][0] <= self.tick - self.history:
+            net_id = self._free.popleft()[1]
+        elif self._next <= 0xFFFF:
+            net_id = self._next
+            self._next += 1
+        else:
+            raise RuntimeError("NetIds.acquire(): out of entity ids")
+        sprite.net_id = net_id
+        self._sprites[net_id] = sprite
+        return net_id
+
+    def release(self, live):
+        """The tick is over and only the ids in 'live' are still used."""
+        for net_id in [key for key in self._sprites if key not in live]:
+            del self._sprites.pop(net_id).net_id
+            self._free.append((self.tick, net_id))
+        self.tick += 1
+
+
+def delta(base, state):
+    """Returns what changed between two states.
+
+    That's a dict of new or changed entities, a dict of id -> (dx, dy,
+    turn) for the entities that only moved less than 128 pixels and turned,
+    which is most of them, and a list of the removed ids."""
+
+    changed = {}
+    moved = {}
+    for key, value in state.items():
+        old = base.get(key)
+        if old == value:
+            continue
+        if old is not None and old[0] == value[0] and old[3] == value[3]:
+            dx = value[1] - old[1]
+            dy = value[2] - old[2]
+            if -128 <= dx < 128 and -128 <= dy < 128:
+                moved[key] = (dx, dy, value[4])
+                continue
+        changed[key] = value
+    removed = [key for key in base if key not in state]
+    return changed, moved, removed
+
+
+def apply_delta(base, changed, moved, removed):
+    """Returns a new state with the changes applied to 'base'."""
+    state = dict(base)
+    state.update(changed)
+    for key, (dx, dy, turn) in moved.items():
+        kind, x, y, size, _ = state[key]
+        state[key] = (kind, x + dx, y + dy, size, turn)
+    for key in removed:
+        state.pop(key, None)
+    return state
+
+
+def encode(tick, base_tick, slot, players, changed, moved, removed):
+    """Pack a snapshot into a datagram."""
+    parts = [
+        HEADER.pack(
+            tick,
+            base_tick,
+            slot,
+            len(players),
+            len(changed),
+            len(moved),
+            len(removed),
+        )
+    ]
+    for player_slot, (lives, score) in enumerate(players):
+        parts.append(PLAYER_STATE.pack(player_slot, lives, score))
+    for key, entity in changed.items():
+        parts.append(ENTITY.pack(key, *entity))
+    for key, offset in moved.items():
+        parts.append(MOVED.pack(key, *offset))
+    for key in removed:
+        parts.append(REMOVED.pack(key))
+    return b"".join(parts)
+
+
+def decode(data):
+    """Unpack a datagram made by encode()."""
+    header = HEADER.unpack_from(data)
+    tick, base_tick, slot, n_players, n_changed, n_moved, n_removed = header
+    offset = HEADER.size
+    players = []
+    for _ in range(n_players):
+        _, lives, score = PLAYER_STATE.unpack_from(data, offset)
+        players.append((lives, score))
+        offset += PLAYER_STATE.size
+    changed = {}
+    for _ in range(n_changed):
+        key, *entity = ENTITY.unpack_from(data, offset)
+        changed[key] = tuple(entity)
+        offset += ENTITY.size
+    moved = {}
+    for _ in range(n_moved):
+        key, *move = MOVED.unpack_from(data, offset)
+        moved[key] = tuple(move)
+        offset += MOVED.size
+    removed = []
+    for _ in range(n_removed):
+        removed.append(REMOVED.unpack_from(data, offset)[0])
+        offset += REMOVED.size
+    return tick, base_tick, slot, players, changed, moved, removed
+
+
+class NetworkGame:
+    """The game's rules for several players, without drawing anything.
+
+    It's GameLoop.step() with one ship per player, where the lasers score
+    for the ship that fired them and the game is over when every ship has
+    been destroyed."""
+
+    def __init__(self, players=2, seed=None):
+        random.seed(seed)
+        self.playing = True
+        self.players = []
+        for slot in range(players):
+            player = Player(settings.PLAYER_SPRITE)
+            player.rect.topleft = [0, 120 + slot * 160]
+            self.players.append(player)
+        self.buttons = [0] * players
+        self.level = LevelDesign()
+        self.level.reset()
+        self.player_group = pygame.sprite.Group(self.players)
+        self.laser_group = pygame.sprite.Group()
+        self.asteroid_group = pygame.sprite.Group()
+        self.powerup_group = pygame.sprite.Group()
+        enemies, powerups = self.level.get_level()
+        self.asteroid_group.add(enemies)
+        self.powerup_group.add(powerups)
+        # Every sprite gets an id the first time it's in a snapshot.
+        self.ids = NetIds()
+
+    def handle_input(self, slot, buttons):
+        """Steer a player's ship by the buttons that are held down."""
+        player = self.players[slot]
+        if not player.alive():
+            return
+        player.steer(buttons)
+        # Fire once every time the button is pressed.
+        if buttons & FIRE and not self.buttons[slot] & FIRE:
+            player.update_score("fire")
+            laser = Laser(settings.LASER_SPRITE, player.rect.center)
+            laser.owner = player
+            self.laser_group.add(laser)
+        self.buttons[slot] = buttons
+
+    def step(self):
+        """Run the game one tick."""
+        for laser in rules.shoot_asteroids(
+            self.laser_group, self.asteroid_group
+        ):
+            laser.owner.update_score("kill")
+
+        for player in self.player_group.sprites():
+            if rules.damage(player, self.asteroid_group):
+                if player.lives_left() == 0:
+                    player.kill()
+                    continue
+            rules.power_up(player, self.powerup_group)
+        if not self.player_group:
+            self.playing = False
+            return
+
+        rules.next_level(
+            self.player_group,
+            self.level,
+            self.asteroid_group,
+            self.powerup_group,
+            len(self.laser_group) + len(self.powerup_group),
+        )
+
+        self.player_group.update()
+        self.laser_group.update()
+        self.asteroid_group.update()
+        self.powerup_group.update()
+        rules.clean(self.laser_group, self.powerup_group)
+
+    def _entities(self, group, kind):
+        for sprite in group:
+            net_id = self.ids.acquire(sprite)
+            x, y = getattr(sprite, "hitbox", sprite.rect).center
+            yield net_id, (kind, x, y, *_look(sprite))
+
+    def state(self):
+        """Returns every entity as a dict of id -> (kind, x, y, size, turn).
+
+        The ids of the entities that are gone are freed, so it's called
+        once a tick."""
+
+        state = {}
+        for slot, player in enumerate(self.players):
+            if player.alive():
+                state.update(self._entities([player], PLAYER + slot))
+        state.update(self._entities(self.asteroid_group, ASTEROID))
+        state.update(self._entities(self.laser_group, LASER))
+        state.update(self._entities(self.powerup_group, POWERUP))
+        self.ids.release(state)
+        return state
+
+    def scores(self):
+        """Returns the lives and score of every player."""
+        return [
+            (player.lives_left(), player.get_score())
+            for player in self.players
+        ]
+
+
+class RemoteClient:
+    """What the server knows about one client."""
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.buttons = 0
+        self.sequence = 0
+        # The newest snapshot the client has.
+        self.ack = 0
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        # What full snapshots would have cost.
+        self.full_bytes = 0
+
+
+class Server:
+    """Runs a NetworkGame and sends snapshots of it to the clients."""
+
+    def __init__(self, address=None, players=2, tick_rate=None, seed=None):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(address or (settings.NET_HOST, settings.NET_PORT))
+        self.socket.setblocking(False)
+        self.address = self.socket.getsockname()
+        self.tick_rate = tick_rate or settings.NET_TICK_RATE
+        self.game = NetworkGame(players, seed)
+        self.clients = {}
+        self.tick = 0
+        # The snapshots the clients may have acknowledged, by tick.
+        self.history = collections.OrderedDict()
+        # Milliseconds every tick took.
+        self.tick_times = collections.deque(maxlen=1000)
+
+    def poll(self):
+        """Read every input that has arrived."""
+        while True:
+            try:
+                data, address = self.socket.recvfrom(INPUT.size)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            if len(data) != INPUT.size:
+                continue
+            client = self.clients.get(address)
+            if client is None:
+                if len(self.clients) == len(self.game.players):
+                    continue  # The game is full.
+                client = RemoteClient(len(self.clients))
+                self.clients[address] = client
+            sequence, ack, buttons = INPUT.unpack(data)
+            # Datagrams can arrive out of order.
+            if sequence > client.sequence:
+                client.sequence = sequence
+                client.buttons = buttons
+            client.ack = max(client.ack, ack)
+
+    def step(self):
+        """Run one tick and send every client its snapshot."""
+        start = time.perf_counter()
+        self.poll()
+        for client in self.clients.values():
+            self.game.handle_input(client.slot, client.buttons)
+        self.game.step()
+        self.tick += 1
+
+        state = self.game.state()
+        self.history[self.tick] = state
+        while len(self.history) > settings.NET_HISTORY:
+            self.history.popitem(last=False)
+        scores = self.game.scores()
+        for address, client in self.clients.items():
+            self.send(address, client, state, scores)
+        self.tick_times.append((time.perf_counter() - start) * 1000)
+
+    def send(self, address, client, state, scores):
+        base = self.history.get(client.ack)
+        base_tick = client.ack if base is not None else 0
+        changed, moved, removed = delta(base or {}, state)
+        data = encode(
+            self.tick, base_tick, client.slot, scores, changed, moved, removed
+        )
+        try:
+            self.socket.sendto(data, address)
+        except OSError as error:
+            print(f"Server.send(): {error}")
+            return
+        client.bytes_sent += len(data)
+        client.packets_sent += 1
+        client.full_bytes += (
+            HEADER.size
+            + PLAYER_STATE.size * len(scores)
+            + ENTITY.size * len(state)
+        )
+
+    def run(self, ticks=None):
+        """Step the game at the tick rate until it's over."""
+        interval = 1.0 / self.tick_rate
+        deadline = time.perf_counter()
+        while self.game.playing and (ticks is None or self.tick < ticks):
+            self.step()
+            deadline += interval
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.perf_counter()
+
+    def stats(self):
+        """Returns the tick times and the bandwidth of every client."""
+        seconds = max(self.tick, 1) / self.tick_rate
+        times = list(self.tick_times)
+        return {
+            "ticks": self.tick,
+            "tick_ms": {
+                "mean": sum(times) / len(times) if times else 0,
+                "max": max(times, default=0),
+            },
+            "clients": {
+                f"{address[0]}:{address[1]}": {
+                    "slot": client.slot,
+                    "bytes": client.bytes_sent,
+                    "packets": client.packets_sent,
+                    "bytes_per_packet": client.bytes_sent
+                    / max(client.packets_sent, 1),
+                    "bytes_per_second": client.bytes_sent / seconds,
+                    "full_snapshot_bytes": client.full_bytes,
+                }
+                for address, client in self.clients.items()
+            },
+        }
+
+    def close(self):
+        self.socket.close()
+
+
+class Client:
+    """Sends input to a server and interpolates the snapshots it sends."""
+
+    def __init__(self, address=None, tick_rate=None):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.connect(address or (settings.NET_HOST, settings.NET_PORT))
+        self.socket.setblocking(False)
+        self.interval = 1.0 / (tick_rate or settings.NET_TICK_RATE)
+        self.sequence = 0
+        self.slot = None
+        self.players = []
+        # tick -> (arrival time, state) of the last snapshots.
+        self.snapshots = collections.OrderedDict()
+        self.latest = 0
+        self.bytes_received = 0
+        # Deltas against a snapshot that is no longer kept.
+        self.dropped = 0
+
+    def send_input(self, buttons):
+        """Send the buttons that are held down, acknowledging the latest."""
+        self.sequence += 1
+        try:
+            self.socket.send(INPUT.pack(self.sequence, self.latest, buttons))
+        except OSError as error:
+            print(f"Client.send_input(): {error}")
+
+    def poll(self, now=None):
+        """Read every snapshot that has arrived."""
+        now = time.perf_counter() if now is None else now
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except (BlockingIOError, ConnectionRefusedError):
+                return
+            self.bytes_received += len(data)
+            tick, base_tick, slot, players, *changes = decode(data)
+            if tick <= self.latest:
+                continue  # Old or duplicated.
+            if base_tick:
+                if base_tick not in self.snapshots:
+                    self.dropped += 1
+                    continue
+                base = self.snapshots[base_tick][1]
+            else:
+                base = {}
+            self.snapshots[tick] = (now, apply_delta(base, *changes))
+            self.latest = tick
+            self.slot = slot
+            self.players = players
+        while len(self.snapshots) > settings.NET_HISTORY:
+            self.snapshots.popitem(last=False)
+
+    @property
+    def state(self):
+        """The newest state, or an empty one before the first snapshot."""
+        if not self.latest:
+            return {}
+        return self.snapshots[self.latest][1]
+
+    def interpolated(self, now=None):
+        """Returns a list of (kind, x, y, size, turn) NET_INTERP_TICKS ago.
+
+        The time is in ticks, counted from when the newest snapshot
+        arrived, and the positions are interpolated between the snapshots
+        just before and after it."""
+
+        if not self.latest:
+            return []
+        now = time.perf_counter() if now is None else now
+        arrival = self.snapshots[self.latest][0]
+        render_tick = (
+            self.latest
+            + (now - arrival) / self.interval
+            - settings.NET_INTERP_TICKS
+        )
+        before = after = None
+        for tick in self.snapshots:
+            if tick <= render_tick:
+                before = tick
+            elif after is None:
+                after = tick
+        if before is None or after is None:
+            # Older or newer than every snapshot that is kept.
+            tick = after if before is None else before
+            return list(self.snapshots[tick][1].values())
+        start = self.snapshots[before][1]
+        end = self.snapshots[after][1]
+        t = (render_tick - before) / (after - before)
+
+        entities = []
+        for key, (kind, x, y, size, turn) in start.items():
+            if key in end:
+                _, x2, y2, _, _ = end[key]
+                x += (x2 - x) * t
+                y += (y2 - y) * t
+            entities.append((kind, x, y, size, turn))
+        return entities
+
+    def close(self):
+        self.socket.close()
+
+
+class NetworkScene(Scene):
+    """Plays on a server, drawing the interpolated snapshots.
+
+    The asteroids are turned and scaled like in GameLoop, with frames from
+    a RotationCache."""
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self.controls = Controls(KEYS)
+        self.font = get_assets().font(15)
+        self.frames = {kind: _frames(s) for kind, s in SPRITES.items()}
+        self.frames[PLAYER] = _frames(settings.PLAYER_SPRITE)
+        self.rotations = RotationCache()
+
+    def leave(self):
+        self.client.close()
+
+    def handle_event(self, event):
+        self.controls.handle(event)
+
+    def update(self):
+        self.controls.poll()
+        self.client.poll()
+        self.client.send_input(self.controls.held)
+
+    def draw(self, screen):
+        screen.fill(settings.BG_COLOR)
+        frame = pygame.time.get_ticks() // 150
+        for kind, x, y, size, turn in self.client.interpolated():
+            frames = self.frames[min(kind, PLAYER)]
+            index = frame % len(frames)
+            image = frames[index]
+            scale = settings.ASTEROID_SCALES[size]
+            if kind == ASTEROID and (turn or scale != 1):
+                key = (settings.ASTEROID_SPRITE["file"], index)
+                angle = turn * settings.ROTATION_STEP
+                image = self.rotations.get(image, key, angle, scale)
+            screen.blit(image, image.get_rect(center=(x, y)))
+        for slot, (lives, score) in enumerate(self.client.players):
+            you = "*" if slot == self.client.slot else " "
+            text = f"{you}P{slot + 1} SCORE: {score} LIFE x {lives}"
+            image = self.font.render(text, 1, settings.TEXT_COLOR)
+            screen.blit(image, (10, 10 + slot * 20))
+
+
+def _look(sprite):
+    """Returns the size and turn of an asteroid, and 0, 0 for the rest."""
+    scale = getattr(sprite, "scale", None)
+    if scale is None:
+        return 0, 0
+    turns = 360 // settings.ROTATION_STEP
+    turn = round(sprite.angle / settings.ROTATION_STEP) % turns
+    return settings.ASTEROID_SCALES.index(scale), turn
+
+
+def _frames(sprite):
+    """The frames of a sprite sheet."""
+    w, h = sprite["size"]
+    sheet = get_assets().image(sprite["file"])
+    return [
+        sheet.subsurface((i * w, 0, w, h))
+        for i in range(sheet.get_width() // w)
+    ]
+
+
+def _headless():
+    """Initialize pygame without showing or playing anything."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    # The sprites are converted to the display's format.
+    pygame.display.set_mode((1, 1))
+
+
+def loopback(seconds, seed=None):
+    """Run a server and two scripted clients and return the server's stats.
+
+    Everything runs in lock step on one thread, so the numbers are the
+    same on any machine except for the tick times."""
+
+    server = Server(("127.0.0.1", 0), seed=seed)
+    clients = [Client(server.address, server.tick_rate) for _ in range(2)]
+    rng = random.Random(seed)
+    buttons = [0, 0]
+    try:
+        for _ in range(int(seconds * server.tick_rate)):
+            for i, client in enumerate(clients):
+                client.poll()
+                if rng.random() < 0.1:
+                    buttons[i] = rng.choice([UP, DOWN, LEFT, RIGHT, 0])
+                client.send_input(buttons[i] | FIRE * (rng.random() < 0.2))
+            server.step()
+            if not server.game.playing:
+                break
+        for client in clients:
+            client.poll()
+        stats = server.stats()
+        stats["dropped"] = sum(client.dropped for client in clients)
+        return stats
+    finally:
+        for client in clients:
+            client.close()
+        server.close()
+
+
+def main(argv=None):
+    """Run a two player server, a client or a loopback benchmark."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("mode", choices=["server", "client", "loopback"])
+    parser.add_argument("--host", default=settings.NET_HOST)
+    parser.add_argument("--port", type=int, default=settings.NET_PORT)
+    parser.add_argument(
+        "--seconds", type=float, default=10, help="loopback run time"
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    address = (args.host, args.port)
+
+    if args.mode == "client":
+        from .scene import SceneManager
+
+        manager = SceneManager()
+        manager.run(NetworkScene(Client(address)))
+        return
+
+    _headless()
+    if args.mode == "loopback":
+        print(json.dumps(loopback(args.seconds, args.seed), indent=2))
+        return
+    server = Server(address, seed=args.seed)
+    print(f"Serving on {server.address[0]}:{server.address[1]}")
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats(), indent=2))
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,70 @@
+import collections
 import os
 import random
 
 import pygame
-from pygame import locals
 
-from . import settings
+from . import controls, settings
+from .assets import get_assets
 from .sound import SoundEffect
 
+# Sliced sprite frames by file and frame size, so a sprite sheet is only
+# loaded from the disk once.
+_sprite_cache = {}
+
+
+class RotationCache:
+    """Rotated and scaled frames, transformed once and reused.
+
+    The angles are rounded to ROTATION_STEP degrees so there's a limited
+    number of versions of every frame, and the least recently used ones
+    are dropped when there are more than 'size'."""
+
+    def __init__(self, size=None):
+        self.size = size or settings.ROTATION_CACHE_SIZE
+        self._frames = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, image, key, angle, scale):
+        """Returns 'image' rotated by 'angle' and scaled by 'scale'.
+
+        'key' identifies the image, like its file and frame number."""
+
+        step = settings.ROTATION_STEP
+        bucket = round(angle / step) % (360 // step)
+        cache_key = (key, bucket, scale)
+        frame = self._frames.get(cache_key)
+        if frame is not None:
+            self._frames.move_to_end(cache_key)
+            self.hits += 1
+            return frame
+        self.misses += 1
+        frame = pygame.transform.rotozoom(image, bucket * step, scale)
+        self._frames[cache_key] = frame
+        if len(self._frames) > self.size:
+            self._frames.popitem(last=False)
+        return frame
+
+    def clear(self):
+        self._frames.clear()
+
+
+_rotation_cache = RotationCache()
+
+
+def collide_hitbox(left, right):
+    """Collision test for groupcollide() with the sprites' hit boxes.
+
+    Sprites without a hitbox are hit anywhere in their rect."""
+
+    return getattr(left, "hitbox", left.rect).colliderect(
+        getattr(right, "hitbox", right.rect)
+    )
+
 
 class AnimatedObject(pygame.sprite.Sprite):
     """This class animates the game objects sprites."""
@@ -43,15 +101,21 @@ class AnimatedObject(pygame.sprite.Sprite):
         """This loads the game objects sprite file and slices it into frames.
 
         The 'master' can be any height, but sprites frames width must be the
-        same width. Master width must be len(frames)*frame.width."""
+        same width. Master width must be len(frames)*frame.width. The frames
+        are cached and shared by every object that uses the same file."""
+
+        key = (file, tuple(size))
+        if key in _sprite_cache:
+            return _sprite_cache[key]
 
         w, h = size
         images = []
-        master_image = pygame.image.load(file).convert_alpha()
+        master_image = get_assets().image(file)
         master_width, master_height = master_image.get_size()
 
         for i in range(int(master_width / w)):
             images.append(master_image.subsurface((i * w, 0, w, h)))
+        _sprite_cache[key] = images
         return images
 
 
@@ -65,50 +129,41 @@ class Player(AnimatedObject):
     def __init__(self, sprite, fps=10):
         super().__init__(sprite, fps)
         self.rect.topleft = [0, 200]
-        self.vertical = "STILL"
-        self.horizontal = "STILL"
+        # The controls.UP/DOWN/LEFT/RIGHT bits the ship is steered by.
+        self.steering = 0
         self.speed = [5, 5]
         self.life = Life()
         self.score = Score()
 
+    def reset(self):
+        """Put the player back at the start with a new score and lives."""
+        self.rect.topleft = [0, 200]
+        self.steering = 0
+        self.life.reset()
+        self.score.reset()
+
     def update(self):
         """Update the players movments on the screen."""
 
         # Move spaceship vertical
-        if self.vertical == "UP":
+        if self.steering & controls.UP:
             if not self.rect[1] <= settings.LIMIT_UP:
                 self.rect[1] -= self.speed[1]
-        elif self.vertical == "DOWN":
+        elif self.steering & controls.DOWN:
             if not self.rect[1] >= settings.LIMIT_DOWN:
                 self.rect[1] += self.speed[1]
 
         # Move spaceship horizontal
-        if self.horizontal == "LEFT":
+        if self.steering & controls.LEFT:
             if not self.rect[0] <= settings.LIMIT_LEFT:
                 self.rect[0] -= self.speed[0]
-        elif self.horizontal == "RIGHT":
+        elif self.steering & controls.RIGHT:
             if not self.rect[0] >= settings.LIMIT_RIGHT:
                 self.rect[0] += self.speed[0]
 
-    def move(self, key):
-        """Takes the user's input on how to steer the playable object."""
-
-        if key == locals.K_UP:
-            self.vertical = "UP"
-        elif key == locals.K_DOWN:
-            self.vertical = "DOWN"
-        elif key == locals.K_LEFT:
-            self.horizontal = "LEFT"
-        elif key == locals.K_RIGHT:
-            self.horizontal = "RIGHT"
-
-    def stop_moving(self, key):
-        """Stops the movement of the object if key is released."""
-
-        if key == locals.K_UP or key == locals.K_DOWN:
-            self.vertical = "STILL"
-        if key == locals.K_LEFT or key == locals.K_RIGHT:
-            self.horizontal = "STILL"
+    def steer(self, actions):
+        """Steer by the bit field of the actions that are held down."""
+        self.steering = actions
 
     def update_score(self, event):
         """Updates the players total score based on what happened ingame.
@@ -231,10 +286,51 @@ class PowerUpEffect(AnimatedObject):
 
 
 class Asteroid(AnimatedObject):
-    def __init__(self, sprite, position, speed, fps=10):
+    """An asteroid that flies to the left, spinning.
+
+    'scale' is its size compared to the sprite and 'spin' how many degrees
+    it turns every frame. The turned frames come from the RotationCache,
+    so they're only transformed the first time they're needed. A turned
+    frame is bigger than the asteroid, so the rect is only where it's
+    drawn and the hitbox is what is hit."""
+
+    def __init__(self, sprite, position, speed, fps=10, scale=1.0, spin=0):
         super().__init__(sprite, fps)
+        # Counts the times an AsteroidPool has given the asteroid out.
+        self.generation = 0
+        self.place(position, speed, scale, spin)
+
+    def place(self, position, speed, scale=1.0, spin=0):
+        """Put the asteroid at 'position' with a new speed, size and spin."""
+        self.scale = scale
+        self.spin = spin
+        self.angle = 0
         self.rect.topleft = position
         self.speed = speed
+        self.turn()
+
+    def turn(self):
+        """Show the current frame at the current angle."""
+        key = (self.file, self._frame)
+        frame = self._images[self._frame]
+        if self.spin or self.scale != 1:
+            frame = _rotation_cache.get(frame, key, self.angle, self.scale)
+        self.image = frame
+        # Rotated frames are bigger, they're kept centered.
+        self.rect = frame.get_rect(center=self.rect.center)
+
+    @property
+    def hitbox(self):
+        """The rect of the unturned asteroid, kept on the rect's center."""
+        width, height = self.size
+        return self.rect.inflate(
+            round(width * self.scale) - self.rect.width,
+            round(height * self.scale) - self.rect.height,
+        )
+
+    def animate(self, t):
+        super().animate(t)
+        self.turn()
 
     def update(self):
         """Move asteroids."""
@@ -242,6 +338,9 @@ class Asteroid(AnimatedObject):
             self.rect[0] -= self.speed[0]
         else:
             self.rect.topleft = self.respawn()
+        if self.spin:
+            self.angle = (self.angle + self.spin) % 360
+            self.turn()
 
     def respawn(self):
         x = random.randint(600, 1000)
@@ -250,6 +349,30 @@ class Asteroid(AnimatedObject):
         return spawn_point
 
 
+class AsteroidPool:
+    """Asteroids that are created once and reused as fragments.
+
+    An asteroid is free when it isn't in any group, so the fragments that
+    are destroyed or emptied out of the groups can be used again."""
+
+    def __init__(self, size=None):
+        size = settings.FRAGMENT_POOL if size is None else size
+        self.asteroids = [
+            Asteroid(settings.ASTEROID_SPRITE, [0, 0], [0, 0])
+            for _ in range(size)
+        ]
+
+    def acquire(self, position, speed, scale, spin):
+        """Returns a free asteroid placed at 'position', or None."""
+        for asteroid in self.asteroids:
+            if not asteroid.alive():
+                # It's a new asteroid every time it's used.
+                asteroid.generation += 1
+                asteroid.place(position, speed, scale, spin)
+                return asteroid
+        return None
+
+
 class PowerUp(AnimatedObject):
     def __init__(self, sprite, position, fps=10):
         super().__init__(sprite, fps)
@@ -267,7 +390,7 @@ class Score(pygame.sprite.Sprite):
         super().__init__()
         self.score = 0
         self.text = f"SCORE: {self.score}"
-        self.font = pygame.font.Font(settings.FONT, 15)
+        self.font = get_assets().font(15)
         self.image = self.font.render(self.text, 1, settings.TEXT_COLOR)
         self.rect = self.image.get_rect()
         self.rect.topleft = [10, 10]
@@ -276,6 +399,11 @@ class Score(pygame.sprite.Sprite):
         self.text = f"SCORE: {self.score}"
         self.image = self.font.render(self.text, 1, settings.TEXT_COLOR)
 
+    def reset(self):
+        """Start over from zero."""
+        self.score = 0
+        self.update()
+
     def game_score(self, event):
         if event == "fire":
             if self.score > 0:
@@ -294,17 +422,23 @@ class Life(pygame.sprite.Sprite):
         super().__init__()
         self.life = 3
         self.text = f"LIFE x {self.life}"
-        self.font = pygame.font.Font(settings.FONT, 15)
+        self.font = get_assets().font(15)
         self.image = self.font.render(self.text, 1, settings.TEXT_COLOR)
         self.rect = self.image.get_rect()
         self.rect.topleft = [530, 10]
-        self.lose_sfx = SoundEffect(settings.BEEP, 0.7)
-        self.gain_sfx = SoundEffect(settings.BEEP, 0.7)
+        # Both are faded out, so neither may cut the other off.
+        self.lose_sfx = SoundEffect(settings.BEEP, 0.7, shared=False)
+        self.gain_sfx = SoundEffect(settings.BEEP, 0.7, shared=False)
 
     def update(self):
         self.text = f"LIFE x {self.life}"
         self.image = self.font.render(self.text, 1, settings.TEXT_COLOR)
 
+    def reset(self):
+        """Start over with three lives."""
+        self.life = 3
+        self.update()
+
     def gain_life_sfx(self):
         """Gain one extra life sound effect."""
         self.gain_sfx.play(1)
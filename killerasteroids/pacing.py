@@ -0,0 +1,155 @@
+"""Frame pacing that keeps the frames evenly spaced.
+
+pygame's Clock sleeps for the rest of the frame, but sleeps wake up late
+by up to a few milliseconds, which makes the frame intervals uneven. The
+FramePacer sleeps until a short while before the frame is due and then
+busy-waits the rest, so the frames start within a fraction of a
+millisecond of their deadline while the CPU is only busy for the last
+PACING_SPIN milliseconds of every frame."""
+
+import bisect
+import collections
+import time
+
+import pygame
+
+from . import settings
+
+# Frames get_fps() averages over, as many as pygame's Clock does.
+FPS_FRAMES = 10
+
+
+class JitterHistogram:
+    """Counts how far the frame intervals are from the target interval."""
+
+    # Upper edges of the buckets in milliseconds, the last is open.
+    EDGES = (0.25, 0.5, 1, 2, 4, 8, 16)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.EDGES) + 1)
+        self.frames = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.worst = 0.0
+
+    def add(self, interval, target):
+        """Add a frame interval and the interval it should have been."""
+        error = abs(interval - target)
+        self.counts[bisect.bisect_left(self.EDGES, error)] += 1
+        self.worst = max(self.worst, error)
+        # Welford's running mean and variance of the intervals.
+        self.frames += 1
+        delta = interval - self.mean
+        self.mean += delta / self.frames
+        self._m2 += delta * (interval - self.mean)
+
+    @property
+    def stdev(self):
+        if self.frames < 2:
+            return 0.0
+        return (self._m2 / (self.frames - 1)) ** 0.5
+
+    def as_dict(self):
+        labels = [f"<{edge}" for edge in self.EDGES]
+        labels.append(f">={self.EDGES[-1]}")
+        return {
+            "frames": self.frames,
+            "mean_ms": round(self.mean, 3),
+            "stdev_ms": round(self.stdev, 3),
+            "worst_ms": round(self.worst, 3),
+            "jitter_ms": dict(zip(labels, self.counts)),
+        }
+
+
+class FramePacer:
+    """Waits for the next frame, a drop-in for pygame.time.Clock.
+
+    tick() waits with a sleep and a busy-wait tail when 'precise' is true
+    and with only a sleep, like pygame's Clock, when it isn't. The frame
+    intervals are added to a JitterHistogram for every label, which is
+    the scene's name in the SceneManager."""
+
+    def __init__(self, spin=None, align=None):
+        # Seconds to busy-wait at the end of every frame.
+        self.spin = (settings.PACING_SPIN if spin is None else spin) / 1000
+        self.align = settings.PACING_ALIGN if align is None else align
+        self.histograms = collections.defaultdict(JitterHistogram)
+        self._deadline = None
+        self._last = None
+        self._rawtime = 0.0
+        self._interval = 0.0
+        self._recent = collections.deque(maxlen=FPS_FRAMES)
+
+    def refresh_rate(self):
+        """The display's refresh rate in Hz, or 0 if it isn't known."""
+        try:
+            return pygame.display.get_current_refresh_rate()
+        except (AttributeError, pygame.error):
+            return 0
+
+    def interval(self, fps):
+        """Seconds between frames at 'fps', 0 without a frame cap.
+
+        With 'align' the interval is a whole number of refreshes of the
+        display, so every frame is shown for as many refreshes."""
+
+        if not fps:
+            return 0.0
+        refresh = self.refresh_rate() if self.align else 0
+        if refresh:
+            return max(1, round(refresh / fps)) / refresh
+        return 1.0 / fps
+
+    def _wait(self, deadline, precise):
+        remaining = deadline - time.perf_counter()
+        if not precise:
+            if remaining > 0:
+                time.sleep(remaining)
+            return
+        if remaining > self.spin:
+            time.sleep(remaining - self.spin)
+        while time.perf_counter() < deadline:
+            pass
+
+    def tick(self, fps=0, precise=True, label=None):
+        """Wait until the next frame is due, returns milliseconds since the
+        last tick like pygame's Clock."""
+
+        start = time.perf_counter()
+        if self._last is not None:
+            self._rawtime = (start - self._last) * 1000
+        interval = self.interval(fps)
+        if self._deadline is None or interval != self._interval:
+            self._deadline = start
+            self._interval = interval
+        self._deadline += interval
+        self._wait(self._deadline, precise)
+
+        now = time.perf_counter()
+        if now - self._deadline > interval:
+            # Fell more than a frame behind, don't catch up in a burst.
+            self._deadline = now
+        elapsed = 0.0
+        if self._last is not None:
+            elapsed = (now - self._last) * 1000
+            target = interval * 1000 or elapsed
+            self.histograms[label].add(elapsed, target)
+            self._recent.append(elapsed)
+        self._last = now
+        return round(elapsed)
+
+    def get_rawtime(self):
+        """Milliseconds the last frame took before the wait."""
+        return round(self._rawtime)
+
+    def get_fps(self):
+        """The frame rate over the last FPS_FRAMES frames."""
+        total = sum(self._recent)
+        return 1000 * len(self._recent) / total if total else 0.0
+
+    def stats(self):
+        """Returns the frame intervals and jitter of every label."""
+        return {
+            label: histogram.as_dict()
+            for label, histogram in self.histograms.items()
+        }
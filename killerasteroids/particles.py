@@ -0,0 +1,172 @@
+import pygame
+
+from . import settings
+
+try:
+    import numpy
+except ImportError:  # The particles are turned off without NumPy.
+    numpy = None
+
+# Colours the particles are picked from.
+FIRE = [(255, 240, 160), (255, 170, 40), (230, 80, 20), (140, 140, 140)]
+SPARKLE = [(255, 255, 255), (120, 255, 120), (80, 200, 255)]
+
+
+class ParticleSystem:
+    """Moves and draws lots of small particles with NumPy.
+
+    Every particle is a row in a few preallocated arrays, and the live ones
+    are kept at the front of them. update() moves every particle with one
+    vectorized step and draw() writes them all straight into the screen's
+    pixels, so a burst of a thousand particles costs about as much as one
+    sprite."""
+
+    def __init__(self, capacity=None, seed=None):
+        self.capacity = capacity or settings.MAX_PARTICLES
+        self.position = numpy.zeros((self.capacity, 2), numpy.float32)
+        self.velocity = numpy.zeros((self.capacity, 2), numpy.float32)
+        self.drag = numpy.ones(self.capacity, numpy.float32)
+        self.age = numpy.zeros(self.capacity, numpy.float32)
+        self.life = numpy.ones(self.capacity, numpy.float32)
+        self.color = numpy.zeros((self.capacity, 3), numpy.float32)
+        self.count = 0
+        self.enabled = True
+        # Scales how many particles every burst has.
+        self.density = settings.EFFECT_DENSITY
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Remove every particle and reseed the random number generator."""
+        self.count = 0
+        self.rng = numpy.random.default_rng(seed)
+
+    def emit(self, position, count, speed, life, colors, drag=0.95):
+        """Spread 'count' particles in every direction from 'position'.
+
+        'speed' and 'life' are the largest speed in pixels per frame and the
+        largest age in frames, every particle gets a random part of them.
+        Particles that don't fit in the arrays are dropped."""
+
+        count = min(int(count * self.density), self.capacity - self.count)
+        if count <= 0:
+            return
+        new = slice(self.count, self.count + count)
+        rng = self.rng
+
+        angle = rng.uniform(0, 2 * numpy.pi, count)
+        magnitude = rng.uniform(0.2, 1.0, count) * speed
+        self.position[new] = position
+        self.velocity[new, 0] = numpy.cos(angle) * magnitude
+        self.velocity[new, 1] = numpy.sin(angle) * magnitude
+        self.age[new] = 0
+        self.life[new] = rng.uniform(0.5, 1.0, count) * life
+        palette = numpy.array(colors, numpy.float32)
+        self.color[new] = palette[rng.integers(0, len(palette), count)]
+        self.drag[new] = drag
+        self.count += count
+
+    def update(self):
+        """Move every particle one frame and remove the dead ones."""
+        n = self.count
+        if not n:
+            return
+        self.position[:n] += self.velocity[:n]
+        self.velocity[:n] *= self.drag[:n, None]
+        self.age[:n] += 1
+
+        alive = numpy.flatnonzero(self.age[:n] < self.life[:n])
+        if len(alive) < n:
+            # Pack the live particles at the front of the arrays.
+            for array in (
+                self.position,
+                self.velocity,
+                self.drag,
+                self.age,
+                self.life,
+                self.color,
+            ):
+                array[: len(alive)] = array[alive]
+            self.count = len(alive)
+
+    def points(self):
+        """Returns copies of the particles' positions and faded colours."""
+        n = self.count
+        xy = self.position[:n].astype(numpy.int32)
+        fade = 1.0 - self.age[:n] / self.life[:n]
+        rgb = (self.color[:n] * fade[:, None]).astype(numpy.uint32)
+        return xy, rgb
+
+    def draw(self, surface):
+        """Draw every particle as a 2x2 dot that fades with age."""
+        if self.count:
+            draw_points(surface, self.points())
+
+    def explosion(self, position):
+        """Debris and fire from a destroyed object."""
+        self.emit(position, 120, 6, 30, FIRE)
+
+    def sparkle(self, position):
+        """Sparkles around a picked up power up."""
+        self.emit(position, 60, 3, 20, SPARKLE, drag=0.9)
+
+
+class NoParticles:
+    """Stand-in that ignores everything when the particles are off."""
+
+    count = 0
+    enabled = False
+    density = 1.0
+
+    def reset(self, seed=None):
+        pass
+
+    def update(self):
+        pass
+
+    def points(self):
+        return None
+
+    def draw(self, surface):
+        pass
+
+    def explosion(self, position):
+        pass
+
+    def sparkle(self, position):
+        pass
+
+
+def draw_points(surface, points):
+    """Draw the positions and colours from points() as 2x2 dots."""
+    if points is None:
+        return
+    xy, rgb = points
+    width, height = surface.get_size()
+
+    if surface.get_bitsize() != 32:
+        # Slow path for screens that can't be written to directly.
+        for (x, y), color in zip(xy.tolist(), rgb.tolist()):
+            surface.fill(color, (x, y, 2, 2))
+        return
+
+    rshift, gshift, bshift, _ = surface.get_shifts()
+    mapped = (
+        (rgb[:, 0] << rshift) | (rgb[:, 1] << gshift) | (rgb[:, 2] << bshift)
+    )
+    pixels = pygame.surfarray.pixels2d(surface)
+    try:
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            x = xy[:, 0] + dx
+            y = xy[:, 1] + dy
+            inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+            pixels[x[inside], y[inside]] = mapped[inside]
+    finally:
+        # Unlocks the surface.
+        del pixels
+
+
+def create_particles(seed=None):
+    """Returns a ParticleSystem if it's enabled and NumPy is installed."""
+    if settings.PARTICLES and numpy is not None:
+        return ParticleSystem(seed=seed)
+    return NoParticles()
@@ -0,0 +1,207 @@
+"""Profiles the running game for a number of frames.
+
+Press F11 to profile the next PROFILER_FRAMES frames, or until F11 is
+pressed again, or start the game with --profile-frames to profile the
+first game. The profile is written to PROFILER_DIR as a pstats file and
+as collapsed stacks, one "caller;callee;... microseconds" line per stack,
+which flamegraph.pl, speedscope and inferno read. The files are named
+after the scene, for a game its seed and level.
+
+PROFILER chooses how: "cprofile" traces every call on the game's thread,
+"sample" looks at the stacks of the game's threads every
+PROFILER_INTERVAL seconds from a background thread, which slows the game
+down much less."""
+
+import cProfile
+import collections
+import marshal
+import os
+import sys
+import threading
+import time
+
+from . import settings
+
+# The threads that run the game, the others mostly wait.
+THREADS = ("MainThread", "simulation")
+# Shares of a stack shorter than this are left out of the collapsed stacks.
+MIN_SECONDS = 1e-6
+MAX_DEPTH = 64
+
+
+def _label(key):
+    file, line, name = key
+    if file == "~":  # A built-in function.
+        return name
+    return f"{name} ({os.path.basename(file)}:{line})"
+
+
+def collapse(stats):
+    """Returns {stack: seconds} from a pstats call graph.
+
+    cProfile only knows who called whom, so the time of a function is
+    split between its callers by how long the calls from each took."""
+
+    callees = collections.defaultdict(list)
+    roots = []
+    for key, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            roots.append(key)
+        for caller, (_, _, _, cumtime) in callers.items():
+            callees[caller].append((key, cumtime))
+
+    stacks = collections.Counter()
+
+    def walk(key, seconds, stack):
+        _, _, tottime, cumtime, _ = stats[key]
+        stack = stack + (_label(key),)
+        if not cumtime:
+            return
+        if tottime:
+            stacks[";".join(stack)] += seconds * tottime / cumtime
+        if len(stack) >= MAX_DEPTH:
+            return
+        for callee, cumtime_from in callees[key]:
+            share = seconds * cumtime_from / cumtime
+            if share >= MIN_SECONDS and _label(callee) not in stack:
+                walk(callee, share, stack)
+
+    for root in roots:
+        walk(root, stats[root][3], ())
+    return stacks
+
+
+class Profiler:
+    """Profiles the game's thread with cProfile for 'frames' frames."""
+
+    def __init__(self, name, frames=None):
+        self.name = name
+        self.frames = frames or settings.PROFILER_FRAMES
+        self.profiled = 0
+        self.started = time.strftime("%Y%m%d-%H%M%S")
+        self._profile = cProfile.Profile()
+
+    @property
+    def done(self):
+        return self.profiled >= self.frames
+
+    def start(self):
+        self._profile.enable()
+
+    def frame(self):
+        """A frame has been presented."""
+        self.profiled += 1
+
+    def stop(self):
+        self._profile.disable()
+
+    def stats(self):
+        """Returns the profile as a pstats dict."""
+        self._profile.create_stats()
+        return self._profile.stats
+
+    def stacks(self):
+        """Returns {stack: seconds} of the profile."""
+        return collapse(self.stats())
+
+    def save(self, directory=None):
+        """Write the pstats and collapsed stacks, returns their files."""
+        directory = directory or settings.PROFILER_DIR
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{self.name}-{self.started}")
+        with open(base + ".pstats", "wb") as fh:
+            marshal.dump(self.stats(), fh)
+        with open(base + ".folded", "w") as fh:
+            for stack, seconds in sorted(self.stacks().items()):
+                microseconds = round(seconds * 1e6)
+                if microseconds:
+                    fh.write(f"{stack} {microseconds}\n")
+        return base + ".pstats", base + ".folded"
+
+
+class SamplingProfiler(Profiler):
+    """Samples the stacks of the game's THREADS from a background thread."""
+
+    def __init__(self, name, frames=None, interval=None):
+        super().__init__(name, frames)
+        self.interval = interval or settings.PROFILER_INTERVAL
+        self.samples = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        # The sampler would otherwise mostly wait for the GIL until the game
+        # releases it, and then only ever find it blitting or presenting.
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 10))
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if names.get(ident) not in THREADS:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        (code.co_filename, code.co_firstlineno, code.co_name)
+                    )
+                    frame = frame.f_back
+                stack.append(("~", 0, f"<{names[ident]}>"))
+                self.samples[tuple(reversed(stack))] += 1
+
+    def stats(self):
+        """Returns the samples as a pstats dict.
+
+        The numbers of calls are the numbers of samples."""
+
+        self_time = collections.Counter()
+        total = collections.Counter()
+        callers = collections.defaultdict(collections.Counter)
+        for stack, count in self.samples.items():
+            self_time[stack[-1]] += count
+            for key in set(stack):
+                total[key] += count
+            for caller, callee in set(zip(stack, stack[1:])):
+                callers[callee][caller] += count
+        seconds = self.interval
+        return {
+            key: (
+                count,
+                count,
+                self_time[key] * seconds,
+                count * seconds,
+                {
+                    caller: (n, n, 0.0, n * seconds)
+                    for caller, n in callers[key].items()
+                },
+            )
+            for key, count in total.items()
+        }
+
+    def stacks(self):
+        return {
+            ";".join(_label(key) for key in stack): count * self.interval
+            for stack, count in self.samples.items()
+        }
+
+
+def create_profiler(name, frames=None):
+    """Returns the profiler PROFILER chooses."""
+    if settings.PROFILER == "sample":
+        return SamplingProfiler(name, frames)
+    return Profiler(name, frames)
@@ -0,0 +1,103 @@
+"""Performance profiles that set how the game runs.
+
+A profile sets the frame cap, vsync, how much the window is scaled, the
+mixer's sample rate and buffer size, whether only the changed parts of
+the screen are updated, how many particles the effects throw and how
+precisely the frames are paced. It's
+chosen on the command line or in PROFILE_FILE, a JSON file like
+
+    {"profile": "low", "FPS": 25}
+
+where any of the profile's settings can be changed too. The profile is
+applied to the settings once at startup, before pygame is initialized,
+so every screen reads the same values."""
+
+import json
+import os
+
+from . import settings
+
+# The settings a profile sets.
+KEYS = (
+    "FPS",
+    "VSYNC",
+    "RENDER_SCALE",
+    "MIXER",
+    "DIRTY_RECTS",
+    "EFFECT_DENSITY",
+    "PACING",
+)
+
+# The game moves a fixed distance every frame, so every profile except the
+# uncapped benchmark runs at the same frame rate.
+PROFILES = {
+    "low": {
+        "FPS": 30,
+        "VSYNC": False,
+        "RENDER_SCALE": 1,
+        "MIXER": (22050, -16, 2, 1024),
+        # The background stands still and only the sprites are redrawn.
+        "DIRTY_RECTS": True,
+        "EFFECT_DENSITY": 0.25,
+        "PACING": "sleep",
+    },
+    "medium": {
+        "FPS": 30,
+        "VSYNC": False,
+        "RENDER_SCALE": 1,
+        "MIXER": (44100, -16, 2, 512),
+        "DIRTY_RECTS": False,
+        "EFFECT_DENSITY": 1.0,
+        "PACING": "precise",
+    },
+    "high": {
+        "FPS": 30,
+        "VSYNC": True,
+        "RENDER_SCALE": 2,
+        "MIXER": (44100, -16, 2, 256),
+        "DIRTY_RECTS": False,
+        "EFFECT_DENSITY": 1.0,
+        "PACING": "precise",
+    },
+    "benchmark": {
+        "FPS": 0,  # Uncapped.
+        "VSYNC": False,
+        "RENDER_SCALE": 1,
+        "MIXER": (44100, -16, 2, 512),
+        "DIRTY_RECTS": False,
+        "EFFECT_DENSITY": 1.0,
+        "PACING": "precise",
+    },
+}
+
+
+def load_profile(name=None, file=None):
+    """Returns the name and settings of a profile.
+
+    'name' is used before the file's profile, which is used before
+    settings.PROFILE. The settings in the file change the profile's."""
+
+    file = file or settings.PROFILE_FILE
+    config = {}
+    if os.path.isfile(file):
+        try:
+            with open(file) as fh:
+                config = json.load(fh)
+        except (OSError, ValueError) as error:
+            print(f"load_profile(): {error}")
+
+    name = name or config.get("profile") or settings.PROFILE
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown profile '{name}', choose one of {', '.join(PROFILES)}"
+        )
+    values = dict(PROFILES[name])
+    values.update((key, config[key]) for key in KEYS if key in config)
+    values["MIXER"] = tuple(values["MIXER"])
+    return name, values
+
+
+def apply_profile(values):
+    """Change the settings to the profile's."""
+    for key, value in values.items():
+        setattr(settings, key, value)
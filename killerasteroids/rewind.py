@@ -0,0 +1,335 @@
+"""Rewinds the game while the rewind key is held down.
+
+The state of the game is captured every tick into a ring buffer of the
+last REWIND_TICKS ticks. Every REWIND_KEYFRAME-th tick is a keyframe that
+has every asteroid, laser and power up as a row of a structured NumPy
+array. The ticks in between only have how far the keyframe's entities
+moved, 15 bytes each, and the entities that were added since in full. The
+random number generator's state is shared by the ticks it didn't change
+in, so ten seconds of history are a few hundred kilobytes."""
+
+import collections
+import itertools
+import random
+
+from . import settings
+from .object import Asteroid, Laser, PowerUp
+
+try:
+    import numpy
+except ImportError:  # There's no rewinding without NumPy.
+    numpy = None
+
+# Kinds of entities, the group every kind is in is in GROUPS.
+ASTEROID = 0
+LASER = 1
+POWERUP = 2
+GROUPS = {
+    ASTEROID: "asteroid_group",
+    LASER: "laser_group",
+    POWERUP: "powerup_group",
+}
+if numpy is not None:
+    # x and y are the center of asteroids and the topleft of the others.
+    ENTITY = numpy.dtype(
+        [
+            ("kind", "u1"),
+            ("id", "<u4"),
+            ("x", "<i2"),
+            ("y", "<i2"),
+            ("speed", "<i2"),
+            ("frame", "u1"),
+            ("scale", "<f8"),
+            ("spin", "<f8"),
+            ("angle", "<f8"),
+        ]
+    )
+    # An entity of the keyframe at 'index' that has moved.
+    MOVED = numpy.dtype(
+        [
+            ("index", "<u2"),
+            ("dx", "<i2"),
+            ("dy", "<i2"),
+            ("frame", "u1"),
+            ("angle", "<f8"),
+        ]
+    )
+
+# A keyframe has every entity in 'entities' and the row of every id in
+# 'index'. Other frames have the MOVED rows of their 'key' frame and the
+# added entities in 'entities'.
+Frame = collections.namedtuple("Frame", "header entities moved key index rng")
+
+
+class RewindBuffer:
+    """A ring buffer of the last 'size' ticks of a game."""
+
+    enabled = True
+
+    def __init__(self, size=None, keyframe=None):
+        self.size = size or settings.REWIND_TICKS
+        self.keyframe = keyframe or settings.REWIND_KEYFRAME
+        self._frames = [None] * self.size
+        # Where the next frame goes and how many frames there are.
+        self._head = 0
+        self.count = 0
+        self._key = None
+        self._since_key = 0
+        self._rng = None
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self._frames = [None] * self.size
+        self._head = self.count = 0
+        self._key = self._rng = None
+        self._since_key = 0
+
+    def nbytes(self):
+        """Returns the bytes the arrays of the frames take."""
+        total = 0
+        for frame in self._frames:
+            if frame is None:
+                continue
+            total += frame.header.nbytes + frame.entities.nbytes
+            if frame.moved is not None:
+                total += frame.moved.nbytes
+        return total
+
+    def capture(self, game):
+        """Add the state of 'game' after a tick."""
+        header = numpy.array(get_header(game), numpy.int32)
+        rng = random.getstate()
+        if rng == self._rng:
+            # Share the state with the ticks before.
+            rng = self._rng
+        self._rng = rng
+        entities = list(get_entities(game, self._ids))
+
+        if self._key is None or self._since_key >= self.keyframe:
+            rows = numpy.array(entities, ENTITY)
+            index = {
+                id: (i, x, y) for i, (_, id, x, y, *_) in enumerate(entities)
+            }
+            frame = Frame(header, rows, None, None, index, rng)
+            self._key = frame
+            self._since_key = 0
+        else:
+            key = self._key
+            moved = []
+            added = []
+            for entity in entities:
+                found = key.index.get(entity[1])
+                if found is None:
+                    added.append(entity)
+                    continue
+                i, x, y = found
+                moved.append(
+                    (i, entity[2] - x, entity[3] - y, entity[5], entity[8])
+                )
+            frame = Frame(
+                header,
+                numpy.array(added, ENTITY),
+                numpy.array(moved, MOVED),
+                key,
+                None,
+                rng,
+            )
+        self._since_key += 1
+        self._frames[self._head] = frame
+        self._head = (self._head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def pop(self):
+        """Remove the latest frame and return it, or None if it's empty."""
+        if not self.count:
+            return None
+        self._head = (self._head - 1) % self.size
+        frame = self._frames[self._head]
+        self._frames[self._head] = None
+        self.count -= 1
+        # The next frame is captured against a keyframe that's still here.
+        self._key = None
+        self._rng = None
+        return frame
+
+    def rewind(self, game, ticks=1):
+        """Put 'game' back 'ticks' ticks, returns False if there's no more
+        history.
+
+        The latest frame is the state the game is in, so it's kept."""
+
+        if self.count < 2:
+            return False
+        for _ in range(min(ticks, self.count - 1)):
+            self.pop()
+        frame = self._frames[(self._head - 1) % self.size]
+        restore(game, frame.header.tolist(), decode(frame).tolist(), frame.rng)
+        return True
+
+
+def get_header(game):
+    """Returns the player's position and steering, lives, score, the level
+    and where the two halves of the background are."""
+
+    player = game.player_sprite
+    return [
+        player.rect.x,
+        player.rect.y,
+        player.steering,
+        player.life.life,
+        player.score.score,
+        game.level.current_level,
+        game.space_sprites[0].rect.x,
+        game.space_sprites[1].rect.x,
+    ]
+
+
+def get_entities(game, ids=None):
+    """Yield every asteroid, laser and power up as a tuple of the ENTITY
+    fields.
+
+    The sprites get an id from 'ids' the first time they're seen, and a
+    new one when a pooled asteroid is used again. Without 'ids' the id is
+    0."""
+
+    for kind, name in GROUPS.items():
+        for sprite in getattr(game, name).sprites():
+            if ids is None:
+                id = 0
+            else:
+                id = _rewind_id(sprite)
+                if id is None:
+                    id = _set_rewind_id(sprite, next(ids))
+            if kind == ASTEROID:
+                x, y = sprite.rect.center
+                yield (
+                    kind,
+                    id,
+                    x,
+                    y,
+                    sprite.speed[0],
+                    sprite._frame,
+                    sprite.scale,
+                    sprite.spin,
+                    sprite.angle,
+                )
+            else:
+                x, y = sprite.rect.topleft
+                yield (kind, id, x, y, 0, 0, 1.0, 0.0, 0.0)
+
+
+def _rewind_id(sprite):
+    """Returns the sprite's id, or None if it has none for this use."""
+    if getattr(sprite, "rewind_generation", None) != getattr(
+        sprite, "generation", 0
+    ):
+        return None
+    return sprite.rewind_id
+
+
+def _set_rewind_id(sprite, id):
+    sprite.rewind_id = id
+    sprite.rewind_generation = getattr(sprite, "generation", 0)
+    return id
+
+
+def decode(frame):
+    """Returns every entity of a frame as an ENTITY array, oldest first."""
+    if frame.moved is None:
+        return frame.entities
+    moved = frame.key.entities[frame.moved["index"]]
+    moved["x"] += frame.moved["dx"]
+    moved["y"] += frame.moved["dy"]
+    moved["frame"] = frame.moved["frame"]
+    moved["angle"] = frame.moved["angle"]
+    rows = numpy.concatenate([moved, frame.entities])
+    return rows[numpy.argsort(rows["id"], kind="stable")]
+
+
+def _create(kind, row):
+    _, _, x, y, speed, _, scale, spin, _ = row
+    if kind == ASTEROID:
+        return Asteroid(
+            settings.ASTEROID_SPRITE,
+            [0, 0],
+            [speed, 0],
+            scale=scale,
+            spin=spin,
+        )
+    if kind == LASER:
+        return Laser(settings.LASER_SPRITE, (0, 0))
+    return PowerUp(settings.POWER_UP_SPRITE, [x, y])
+
+
+def restore(game, header, entities, rng):
+    """Put 'game' in a captured state.
+
+    'header' is what get_header() returned and 'entities' what
+    get_entities() yielded. The sprites with the same id as a captured
+    entity are reused."""
+
+    x, y, steering, life, score, level, space, space2 = header
+    player = game.player_sprite
+    player.rect.topleft = (x, y)
+    player.steer(steering)
+    player.life.life = life
+    player.life.update()
+    player.score.score = score
+    player.score.update()
+    game.level.current_level = level
+    game.level.update()
+    game.space_sprites[0].rect.x = space
+    game.space_sprites[1].rect.x = space2
+    random.setstate(rng)
+
+    # The sprites that are still alive are reused.
+    sprites = {}
+    for name in GROUPS.values():
+        group = getattr(game, name)
+        for sprite in group.sprites():
+            sprites[_rewind_id(sprite)] = sprite
+        group.empty()
+    for row in entities:
+        kind, id, x, y, _, animation, _, _, angle = row
+        sprite = sprites.get(id) if id else None
+        if sprite is None:
+            sprite = _create(kind, row)
+            if id:
+                _set_rewind_id(sprite, id)
+        if kind == ASTEROID:
+            sprite._frame = animation
+            sprite.angle = angle
+            sprite.rect.center = (x, y)
+            sprite.turn()
+        else:
+            sprite.rect.topleft = (x, y)
+        getattr(game, GROUPS[kind]).add(sprite)
+
+
+class NoRewind:
+    """Stand-in that keeps no history when rewinding is off."""
+
+    count = 0
+    enabled = False
+
+    def __len__(self):
+        return 0
+
+    def clear(self):
+        pass
+
+    def capture(self, game):
+        pass
+
+    def rewind(self, game, ticks=1):
+        return False
+
+
+def create_rewind():
+    """Returns a RewindBuffer if it's enabled and NumPy is installed."""
+    if settings.REWIND and numpy is not None:
+        return RewindBuffer()
+    return NoRewind()
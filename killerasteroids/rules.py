@@ -0,0 +1,70 @@
+"""The rules of the game, shared by GameLoop and the NetworkGame.
+
+They only change the sprites and the ships' scores and lives. What is
+shown and heard when something happens, and how it's recorded, is left to
+the game that calls them."""
+
+import pygame
+
+from . import settings
+from .object import collide_hitbox
+
+
+def shoot_asteroids(lasers, asteroids):
+    """Destroy the lasers and the asteroids they hit.
+
+    Returns {laser: [asteroid]} like pygame.sprite.groupcollide()."""
+
+    return pygame.sprite.groupcollide(
+        lasers, asteroids, True, True, collide_hitbox
+    )
+
+
+def damage(ship, asteroids):
+    """Destroy the asteroids that hit the ship, which loses a life.
+
+    Returns whether it was hit."""
+
+    if not pygame.sprite.spritecollide(ship, asteroids, True, collide_hitbox):
+        return False
+    ship.update_score("damaged")
+    ship.lose_life()
+    return True
+
+
+def power_up(ship, powerups):
+    """Pick up the power ups the ship touches, which gives it a life.
+
+    Returns whether it picked one up."""
+
+    if not pygame.sprite.spritecollide(ship, powerups, True):
+        return False
+    ship.get_extra_life()
+    return True
+
+
+def next_level(ships, level, asteroids, powerups, entities=0):
+    """Go to the next level when every asteroid has been destroyed.
+
+    'entities' are the other entities that are alive, the new asteroids
+    are what's left of the ENTITY_BUDGET. Returns the new level's
+    asteroids and power ups, or None if there are asteroids left."""
+
+    if asteroids:
+        return None
+    for ship in ships:
+        ship.update_score("level up")
+    enemies, new_powerups = level.next_level(settings.ENTITY_BUDGET - entities)
+    asteroids.add(enemies)
+    powerups.add(new_powerups)
+    return enemies, new_powerups
+
+
+def clean(lasers, powerups):
+    """Remove the lasers and power ups that have left the screen."""
+    for laser in lasers.sprites():
+        if laser.rect[0] > settings.WIDTH:
+            lasers.remove(laser)
+    for powerup in powerups.sprites():
+        if powerup.rect[0] < 0:
+            powerups.remove(powerup)
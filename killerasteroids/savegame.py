@@ -0,0 +1,109 @@
+"""Saves a game in progress and loads it back.
+
+A save file is a HEADER with the format's VERSION, the game's seed, the
+player, level and background and the number of entities, then an ENTITY
+record for every asteroid, laser and power up and last the state of the
+random number generator. The records are the fields rewind.get_header()
+and get_entities() capture, so the game is loaded back with
+rewind.restore() and the level isn't generated again."""
+
+import collections
+import os
+import random
+import struct
+
+from . import settings
+from .rewind import get_entities, get_header
+
+MAGIC = b"KASV"
+VERSION = 1
+# Magic, version, seed, rewind.get_header() and the number of entities.
+HEADER = struct.Struct("<4sHI8iH")
+# Kind, position, speed, animation frame, scale, spin and angle.
+ENTITY = struct.Struct("<BhhhBddd")
+# The Mersenne Twister's words and position, and whether the next Gaussian
+# is known and what it is.
+RANDOM = struct.Struct("<625I?d")
+
+SavedGame = collections.namedtuple("SavedGame", "seed header entities rng")
+
+
+def dumps(game):
+    """Returns the state of 'game' as bytes."""
+    entities = list(get_entities(game))
+    parts = [
+        HEADER.pack(
+            MAGIC, VERSION, game.seed, *get_header(game), len(entities)
+        )
+    ]
+    for kind, _, *fields in entities:
+        parts.append(ENTITY.pack(kind, *fields))
+    _, words, gauss = random.getstate()
+    parts.append(RANDOM.pack(*words, gauss is not None, gauss or 0.0))
+    return b"".join(parts)
+
+
+def loads(data):
+    """Returns the SavedGame in 'data', raises ValueError if it isn't one."""
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        raise ValueError("Not a saved game")
+    magic, version, seed, *header, count = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"Saved game version {version} isn't supported")
+    offset = HEADER.size
+    if len(data) != offset + count * ENTITY.size + RANDOM.size:
+        raise ValueError("The saved game is truncated")
+    entities = []
+    for kind, *fields in ENTITY.iter_unpack(
+        data[offset : offset + count * ENTITY.size]
+    ):
+        # Ids only mean something in the session they were given in.
+        entities.append((kind, 0, *fields))
+    offset += count * ENTITY.size
+    *words, has_gauss, gauss = RANDOM.unpack_from(data, offset)
+    rng = (3, tuple(words), gauss if has_gauss else None)
+    return SavedGame(seed, header, entities, rng)
+
+
+def save(game, file=None):
+    """Write the state of 'game' to 'file', returns whether it was saved.
+
+    The file is replaced in one step, so a crash never leaves half a save
+    behind."""
+
+    file = file or settings.SAVE_FILE
+    temp = file + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        with open(temp, "wb") as fh:
+            fh.write(dumps(game))
+        os.replace(temp, file)
+    except OSError as error:
+        print(f"save(): {error}")
+        return False
+    return True
+
+
+def load(file=None):
+    """Returns the SavedGame in 'file', or None if there isn't one."""
+    file = file or settings.SAVE_FILE
+    if not os.path.isfile(file):
+        return None
+    try:
+        with open(file, "rb") as fh:
+            return loads(fh.read())
+    except (OSError, ValueError) as error:
+        print(f"load(): {error}")
+        return None
+
+
+def has_save(file=None):
+    return os.path.isfile(file or settings.SAVE_FILE)
+
+
+def remove(file=None):
+    """Delete the save, a saved game is only continued once."""
+    try:
+        os.remove(file or settings.SAVE_FILE)
+    except FileNotFoundError:
+        pass
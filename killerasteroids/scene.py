@@ -0,0 +1,233 @@
+import pygame
+from pygame import locals
+
+from . import settings
+from .capture import Recorder, capture_file
+from .controls import InputLatency, allow_events
+from .metrics import NoMetrics
+from .pacing import FramePacer
+from .profiler import create_profiler
+
+
+class Scene:
+    """A screen in the game, like the menu or the game itself.
+
+    Scenes don't have loops of their own. Every frame the SceneManager
+    passes the events to the scene at the top of the stack and then calls
+    its update() and draw() methods."""
+
+    # How the frames are paced while the scene runs, "precise" or "sleep".
+    # None uses settings.PACING.
+    pacing = None
+
+    def __init__(self):
+        self.manager = None
+
+    def enter(self):
+        """Called when the scene has been pushed on the stack."""
+
+    def leave(self):
+        """Called when the scene has been removed from the stack."""
+
+    def resume(self, result):
+        """Called when the scene above this one has been popped.
+
+        'result' is the value the popped scene was popped with."""
+
+    def handle_event(self, event):
+        """Handle one user event."""
+
+    def update(self):
+        """Update the scene one frame."""
+
+    def draw(self, screen):
+        """Draw the scene to the screen."""
+
+    def describe(self):
+        """A short name for the files about the scene, like profiles."""
+        return type(self).__name__.lower()
+
+
+class SceneManager:
+    """Runs the game's only loop on a stack of scenes.
+
+    The scene at the top of the stack is the one that runs. Pushing a
+    scene pauses the one below it and popping it resumes the one below,
+    so the screens never have to call each other."""
+
+    def __init__(self):
+        """Initialize pygame and create the screen that every scene uses."""
+
+        pygame.mixer.pre_init(*settings.MIXER)
+        pygame.init()
+        self.screen_size = (settings.WIDTH, settings.HEIGHT)
+        # The scenes draw to 'screen', which is scaled to the window.
+        self.window = self.screen = self._open_window()
+        if self.window.get_size() != self.screen_size:
+            self.screen = pygame.Surface(self.screen_size).convert()
+        pygame.display.set_caption(settings.CAPTION)
+        pygame.mouse.set_visible(0)
+        # Mouse motion and the other unused events are never queued.
+        allow_events()
+        # The one clock that sets the frame rate of every scene.
+        self.clock = FramePacer()
+        self.latency = InputLatency()
+        self.stack = []
+        self.recorder = None
+        self.profiler = None
+        # A MemoryMonitor that checks the memory at every scene change.
+        self.monitor = None
+        # Metrics that are served while the game runs, see metrics.py.
+        self.metrics = NoMetrics()
+
+    def _open_window(self):
+        """Open the window the profile asks for."""
+        scale = settings.RENDER_SCALE
+        width, height = self.screen_size
+        size = (width * scale, height * scale)
+        if settings.VSYNC:
+            try:
+                return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+            except (pygame.error, TypeError, AttributeError) as error:
+                # Not supported by the driver or this version of pygame.
+                print(f"SceneManager._open_window(): {error}")
+        return pygame.display.set_mode(size)
+
+    @property
+    def top(self):
+        """The scene that is running, or None if the stack is empty."""
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        """Run a new scene on top of the current one."""
+        scene.manager = self
+        self.stack.append(scene)
+        scene.enter()
+        self._checkpoint()
+
+    def pop(self, result=None):
+        """Remove the running scene and resume the one below it."""
+        scene = self.stack.pop()
+        scene.leave()
+        scene.manager = None
+        if self.stack:
+            self.top.resume(result)
+            self._checkpoint()
+
+    def replace(self, scene):
+        """Swap the running scene for a new one."""
+        old = self.stack.pop()
+        old.leave()
+        old.manager = None
+        self.push(scene)
+
+    def quit(self):
+        """Remove every scene, which ends the main loop."""
+        while self.stack:
+            scene = self.stack.pop()
+            scene.leave()
+            scene.manager = None
+
+    def _checkpoint(self):
+        if self.monitor is not None and self.stack:
+            self.monitor.checkpoint(type(self.top).__name__)
+
+    def toggle_recording(self):
+        """Start recording the screen, or stop and print the stats."""
+        if self.recorder is None:
+            self.recorder = Recorder(capture_file())
+            self.recorder.start(self.screen)
+        else:
+            self.recorder.stop()
+            print(f"Recorded {self.recorder.stats()}")
+            self.recorder = None
+
+    def toggle_profiling(self, frames=None):
+        """Start profiling the next frames, or stop and save the profile."""
+        if self.profiler is None:
+            self.profiler = create_profiler(self.top.describe(), frames)
+            self.profiler.start()
+        else:
+            self.profiler.stop()
+            files = self.profiler.save()
+            print(f"Profiled {self.profiler.profiled} frames to {files}")
+            self.profiler = None
+
+    def _is_quit_event(self, event):
+        """Exit anytime by pressing escape or the window's close button."""
+        return (
+            event.type == locals.QUIT
+            or event.type == locals.KEYDOWN
+            and event.key == locals.K_ESCAPE
+        )
+
+    def run(self, scene=None):
+        """The main loop, runs until there are no scenes left."""
+        if scene is not None:
+            self.push(scene)
+        try:
+            while self.stack:
+                # Set the maximum frame rate.
+                pacing = self.top.pacing or settings.PACING
+                self.clock.tick(
+                    settings.FPS, pacing == "precise", type(self.top).__name__
+                )
+                self.frame(pygame.event.get())
+        finally:
+            if self.recorder is not None:
+                self.toggle_recording()
+            if self.profiler is not None:
+                self.toggle_profiling()
+
+    def frame(self, events):
+        """Run the scene at the top of the stack one frame."""
+        self.metrics.begin()
+        self.latency.stamp(events)
+        for event in events:
+            if self._is_quit_event(event):
+                self.quit()
+                return
+            if event.type == locals.KEYDOWN and event.key == locals.K_F12:
+                self.toggle_recording()
+                continue
+            if event.type == locals.KEYDOWN and event.key == locals.K_F11:
+                self.toggle_profiling()
+                continue
+            # Events after a scene change go to the new scene.
+            self.top.handle_event(event)
+            if not self.stack:
+                return
+        self.metrics.lap("events")
+
+        self.top.update()
+        if not self.stack:
+            return
+        self.metrics.lap("update")
+        rects = self.top.draw(self.screen)
+        if self.recorder is not None:
+            self.recorder.capture(self.screen)
+        self.metrics.lap("draw")
+        self.present(rects)
+        self.metrics.lap("present")
+        self.metrics.frame(self.clock.get_fps(), type(self.top).__name__)
+        if self.profiler is not None:
+            self.profiler.frame()
+            if self.profiler.done:
+                self.toggle_profiling()
+
+    def present(self, rects=None):
+        """Make everything visible on the screen for the user.
+
+        Only 'rects' are updated if the profile uses dirty rects and the
+        scene returned them from draw(), otherwise the whole window."""
+
+        if self.screen is not self.window:
+            pygame.transform.scale(
+                self.screen, self.window.get_size(), self.window
+            )
+            rects = None
+        if settings.DIRTY_RECTS and rects is not None:
+            pygame.display.update(rects)
+        else:
+            pygame.display.update()
+        self.latency.presented()
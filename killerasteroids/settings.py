@@ -1,7 +1,31 @@
 import os.path
 
-# Maximum frames per seconds.
+# The settings down to PACING are the "medium" performance profile's, the
+# chosen profile replaces them at startup, see profiles.py.
+
+# Maximum frames per seconds, 0 for no limit.
 FPS = 30
+# Wait for the screen's refresh. The window is still RENDER_SCALE times
+# bigger than the game, and SDL may scale it further to fit the screen.
+VSYNC = False
+# The window is this many times bigger than the game.
+RENDER_SCALE = 1
+# Only update the parts of the screen that changed in the game.
+DIRTY_RECTS = False
+# Scales how many particles the effects throw.
+EFFECT_DENSITY = 1.0
+# Mixer frequency, sample size, channels and buffer size.
+MIXER = (44100, -16, 2, 512)
+# "precise" frames sleep and then busy-wait the last PACING_SPIN ms,
+# "sleep" frames only sleep, see pacing.py.
+PACING = "precise"
+
+# Milliseconds of every frame that "precise" pacing busy-waits.
+PACING_SPIN = 2
+# Make the frame interval a whole number of display refreshes.
+PACING_ALIGN = False
+# Print the frame intervals and jitter of every scene at exit.
+PACING_STATS = False
 
 # The screens width & height.
 WIDTH = 640
@@ -27,14 +51,140 @@ SCORE_DIR = os.path.join(DATA_DIR, "score")
 AUDIO_DIR = os.path.join(DATA_DIR, "audio")
 IMAGE_DIR = os.path.join(DATA_DIR, "img")
 
+# The performance profile and a file that chooses it or changes it.
+PROFILE = "medium"
+PROFILE_FILE = os.path.join(DATA_DIR, "profile.json")
+
+# Assets packed by 'python -m killerasteroids.bundle', used if it exists.
+BUNDLE = os.path.join(DATA_DIR, "assets.bundle")
+
 # The font that will be used in game.
 FONT = os.path.join(FONT_DIR, "commodore64.ttf")
 
+# A game saved from the pause menu, continued from the main menu.
+SAVE_FILE = os.path.join(DATA_DIR, "save", "game.sav")
+
 # Database for highscores.
 DATABASE = os.path.join(SCORE_DIR, "highscore.db")
+# Number of highscores shown on each page.
+HIGHSCORE_PAGE_SIZE = 10
+# The highscores are also counted in buckets of this many points, so a
+# rank only counts the scores in its own bucket one by one.
+HIGHSCORE_BUCKET = 100
+
+# Run the game logic on a worker thread and draw snapshots of it.
+THREADED_SIMULATION = False
+
+# Two player games, see network.py.
+NET_HOST = "127.0.0.1"
+NET_PORT = 7777
+NET_TICK_RATE = 30
+# Clients draw the game this many ticks in the past to interpolate.
+NET_INTERP_TICKS = 2
+# Snapshots kept to send deltas against.
+NET_HISTORY = 64
+
+# Press F12 to record the game, as a GIF if ffmpeg is installed and as
+# PNG files if it isn't.
+CAPTURE_DIR = os.path.join(DATA_DIR, "capture")
+CAPTURE_FORMAT = ".gif"
+# Frames that can wait for the encoder before new ones are dropped.
+CAPTURE_SLOTS = 8
+
+# Press F11 to profile the next PROFILER_FRAMES frames with cProfile, or
+# with a thread that samples the stacks every PROFILER_INTERVAL seconds if
+# PROFILER is "sample". --profile-frames profiles the first game.
+PROFILER = "cprofile"
+PROFILER_FRAMES = 600
+PROFILER_INTERVAL = 0.002
+PROFILER_DIR = os.path.join(DATA_DIR, "profiler")
+PROFILER_FIRST_GAME = False
+
+# Check the memory at every scene change and print a report at exit.
+MEMORY_MONITOR = False
+# Frames of traceback tracemalloc keeps for every allocation.
+MEMORY_FRAMES = 1
+# Bytes a session may grow before 'python -m killerasteroids.memory' fails.
+MEMORY_TOLERANCE = 512 * 1024
+
+# Serve live metrics for Prometheus on METRICS_HOST:METRICS_PORT, or on
+# the Unix socket METRICS_SOCKET if it's set. --metrics turns it on too.
+METRICS = False
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+METRICS_SOCKET = None
+
+# Print the time from reading the keys to showing the frame at exit, over
+# the last INPUT_LATENCY_SAMPLES frames that had key events.
+INPUT_LATENCY_STATS = False
+INPUT_LATENCY_SAMPLES = 1000
+
+# Hold R to rewind the game, the last REWIND_TICKS ticks are kept with a
+# full keyframe every REWIND_KEYFRAME ticks. Rewinds REWIND_SPEED ticks a
+# frame. Needs NumPy.
+REWIND = True
+REWIND_TICKS = 300
+REWIND_KEYFRAME = 30
+REWIND_SPEED = 2
+
+# 'python -m killerasteroids.benchmarks' times every benchmark for about
+# BENCHMARK_BUDGET seconds, and fails if one got more than
+# BENCHMARK_THRESHOLD slower than in the baseline.
+BENCHMARK_DIR = os.path.join(DATA_DIR, "benchmarks")
+BENCHMARK_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+BENCHMARK_RESULTS = os.path.join(BENCHMARK_DIR, "latest.json")
+BENCHMARK_BUDGET = 0.2
+BENCHMARK_THRESHOLD = 0.25
+
+# Asteroids are one of these sizes and turn up to ASTEROID_SPIN degrees a
+# frame. Their turned frames are rounded to ROTATION_STEP degrees and the
+# last ROTATION_CACHE_SIZE are kept.
+ASTEROID_SCALES = (0.6, 1.0, 1.6)
+ASTEROID_SPIN = 6
+ROTATION_STEP = 10
+ROTATION_CACHE_SIZE = 1024
+
+# Shed load when GOVERNOR_OVERRUNS of the last GOVERNOR_WINDOW frames took
+# longer than a frame at FPS, see governor.py. Degraded, the particles are
+# GOVERNOR_EFFECT_SCALE of EFFECT_DENSITY and at most
+# GOVERNOR_MAX_ASTEROIDS asteroids are on the screen. It steps back when
+# a whole window took less than GOVERNOR_HEADROOM of a frame.
+GOVERNOR = True
+GOVERNOR_WINDOW = 30
+GOVERNOR_OVERRUNS = 3
+GOVERNOR_HEADROOM = 0.6
+GOVERNOR_EFFECT_SCALE = 0.5
+GOVERNOR_MAX_ASTEROIDS = 24
+
+# Destroyed asteroids split into FRAGMENTS asteroids of the next smaller
+# size that fly FRAGMENT_SPEEDUP faster. The fragments come from a pool of
+# FRAGMENT_POOL asteroids, at most FRAGMENT_SPAWN_LIMIT are spawned a frame
+# and none while the asteroids, lasers, power ups and effects add up to
+# ENTITY_BUDGET. A new level only has as many asteroids as there is room
+# for in the budget, and at least one. The lasers are always fired.
+FRAGMENTS = 2
+FRAGMENT_SPEEDUP = 2
+FRAGMENT_POOL = 32
+FRAGMENT_SPAWN_LIMIT = 4
+ENTITY_BUDGET = 120
+
+# Explosions and power ups throw particles, which needs NumPy.
+PARTICLES = True
+MAX_PARTICLES = 4096
+
+# Session telemetry, written as rotating NDJSON logs. Off unless the game
+# is started with --telemetry.
+TELEMETRY = False
+TELEMETRY_DIR = os.path.join(DATA_DIR, "telemetry")
+TELEMETRY_FILE = os.path.join(TELEMETRY_DIR, "telemetry.ndjson")
+TELEMETRY_BATCH_SIZE = 256
+TELEMETRY_MAX_BYTES = 1024 * 1024
+TELEMETRY_BACKUPS = 5
 
 # Background music.
 BG_MUSIC = os.path.join(AUDIO_DIR, "bgmusic.ogg")
+# Milliseconds the game music fades in and out.
+MUSIC_FADE = 1000
 
 # Sound effects.
 BEEP = os.path.join(AUDIO_DIR, "beep.wav")
@@ -76,3 +226,29 @@ PLAYER_SPRITE = {
     "file": os.path.join(IMAGE_DIR, "spaceship2.png"),
     "size": [92, 36],
 }
+
+# Files that are loaded in the background while the menu is shown.
+PRELOAD_IMAGES = [
+    sprite["file"]
+    for sprite in (
+        PLAYER_SPRITE,
+        ASTEROID_SPRITE,
+        LASER_SPRITE,
+        EXPLOSION_SPRITE,
+        POWER_UP_SPRITE,
+        POWER_UP_EFFECT_SPRITE,
+        SPACE_SPRITE,
+    )
+]
+PRELOAD_SOUNDS = [
+    BG_MUSIC,
+    LASER,
+    EXPLOSION,
+    BEEP,
+    POWER_UP,
+    LEVEL_UP,
+    GAME_OVER,
+    COLLISION,
+    START_GAME,
+    MENU_BEEP,
+]
@@ -0,0 +1,98 @@
+import collections
+import queue
+import threading
+import time
+
+from . import settings
+
+# Everything the renderer needs to draw one tick of the game. 'sprites' and
+# 'hud' are lists of (image, topleft) drawn below and above the particles,
+# and 'points' is what ParticleSystem.points() returned.
+Snapshot = collections.namedtuple("Snapshot", "tick sprites points hud")
+
+
+class Simulation:
+    """Runs a game's logic on a worker thread at a fixed rate.
+
+    The worker takes the queued input, steps the game and publishes a new
+    Snapshot by swapping one reference, so the previous snapshot stays
+    valid while the next one is built and the main thread can draw the
+    latest one without locking. A slow frame then never delays the game
+    logic, and the blits and display updates, which release the GIL,
+    overlap with the next step."""
+
+    def __init__(self, game, fps=None):
+        self.game = game
+        fps = fps or settings.FPS
+        # Without a frame cap the game runs as fast as it can.
+        self.interval = 1.0 / fps if fps else 0.0
+        self.tick = 0
+        # Milliseconds the last step took.
+        self.tick_time = 0
+        self.latest = None
+        self._inputs = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start stepping the game on a new worker thread."""
+        if self.running:
+            return
+        self.latest = self.game.snapshot(self.tick)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="simulation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker and wait for it to finish its step."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def send(self, event):
+        """Queue an input event, or a function to call, for the next step.
+
+        The functions change the game on the worker, between two steps."""
+        self._inputs.put(event)
+
+    def _drain(self):
+        while True:
+            try:
+                event = self._inputs.get_nowait()
+            except queue.Empty:
+                return
+            if callable(event):
+                event()
+            else:
+                self.game.handle_input(event)
+
+    def step(self):
+        """Run one step of the game and publish its snapshot."""
+        start = time.perf_counter()
+        self._drain()
+        self.game.step()
+        self.tick += 1
+        self.tick_time = (time.perf_counter() - start) * 1000
+        self.latest = self.game.snapshot(self.tick)
+
+    def _run(self):
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            self.step()
+            if not self.game.playing:
+                # The main thread shows the game over screen.
+                return
+            deadline += self.interval
+            delay = deadline - time.perf_counter()
+            if delay < 0:
+                # Fell behind, don't try to catch up in a burst.
+                deadline = time.perf_counter()
+            self._stop.wait(max(delay, 0))
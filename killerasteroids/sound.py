@@ -1,33 +1,60 @@
 import os.path
+import time
 
 import pygame
 
+from .assets import get_assets
+
+# Loaded sounds by file and volume, so every object that plays the same
+# sound shares it instead of loading it again.
+_sound_cache = {}
+
 
 class SoundEffect:
-    """This class handles the sound effects in the game."""
+    """This class handles the sound effects in the game.
 
-    def __init__(self, file, volume):
+    Fading a sound out fades out every channel it plays on, so a sound
+    effect that is faded out has to be created with shared=False to get a
+    Sound of its own."""
+
+    def __init__(self, file, volume, shared=True):
+        self.file = file
         self.file_exists = os.path.isfile(file)  # Check if file exists.
-        if self.file_exists:
-            self.sfx = self.load_sound(file)
+        if self.file_exists and shared:
+            key = (file, volume)
+            if key not in _sound_cache:
+                _sound_cache[key] = self.load_sound(file)
+                _sound_cache[key].set_volume(volume)
+            self.sfx = _sound_cache[key]
+        elif self.file_exists:
+            self.sfx = self.load_sound(file, copy=True)
             self.sfx.set_volume(volume)
         else:
             print(f"ERROR: {self.file} is missing.")
 
-    def load_sound(self, file):
+    def load_sound(self, file, copy=False):
         """This will load the sound effect from the file."""
 
         class NoneSound:
-            def play(self):
+            def play(self, loop=0):
+                pass
+
+            def set_volume(self, volume):
+                pass
+
+            def fadeout(self, time):
                 pass
 
         if not pygame.mixer or not pygame.mixer.get_init():
             return NoneSound()
         try:
-            sound = pygame.mixer.Sound(file)
+            sound = get_assets().sound(file)
         except pygame.error:
             print("Cannot load sound:", file)
             raise SystemExit
+        if copy or any(key[0] == file for key in _sound_cache):
+            # Already used with another volume, so it needs its own copy.
+            sound = pygame.mixer.Sound(buffer=sound.get_raw())
         return sound
 
     def play(self, loop=0):
@@ -41,35 +68,158 @@ class SoundEffect:
             self.sfx.fadeout(time)
 
 
+class MusicService:
+    """Plays looping music on two reserved mixer channels.
+
+    Every track is decoded once per process and kept in memory, so pausing
+    and switching tracks never restarts a decoder. Switching to another
+    track fades the old channel out while the new one fades in."""
+
+    def __init__(self):
+        self.tracks = {}
+        self.current = None
+        self.enabled = bool(pygame.mixer.get_init())
+        self._channel = 0
+        self._started = 0.0
+        self._paused_at = None
+        if self.enabled:
+            # Keep the music channels away from the sound effects.
+            pygame.mixer.set_reserved(2)
+
+    def load(self, file):
+        """Decode the track if it hasn't been loaded yet."""
+        if self.enabled and file not in self.tracks:
+            self.tracks[file] = get_assets().sound(file)
+
+    def _channels(self):
+        """Returns the channel that is playing and the spare one."""
+        current = pygame.mixer.Channel(self._channel)
+        other = pygame.mixer.Channel(self._channel ^ 1)
+        return current, other
+
+    def play(self, file, volume, fade_ms=0):
+        """Play a track, crossfading from the one that is playing."""
+        if not self.enabled:
+            return
+        current, other = self._channels()
+
+        if file == self.current and current.get_busy():
+            # Keep the track going instead of starting it over.
+            current.set_volume(volume)
+            self.unpause()
+            return
+
+        self.load(file)
+        if fade_ms:
+            current.fadeout(fade_ms)
+        else:
+            current.stop()
+        other.stop()
+        other.set_volume(volume)
+        other.play(self.tracks[file], loops=-1, fade_ms=fade_ms)
+
+        self._channel ^= 1
+        self.current = file
+        self._started = time.perf_counter()
+        self._paused_at = None
+
+    def pause(self):
+        """Pause the music where it is."""
+        if self.enabled and self._paused_at is None:
+            for channel in self._channels():
+                channel.pause()
+            self._paused_at = time.perf_counter()
+
+    def unpause(self):
+        """Continue the music from where it was paused."""
+        if self.enabled and self._paused_at is not None:
+            for channel in self._channels():
+                channel.unpause()
+            self._started += time.perf_counter() - self._paused_at
+            self._paused_at = None
+
+    def stop(self, fade_ms=0):
+        """Stop the music, optionally fading it out."""
+        if not self.enabled:
+            return
+        for channel in self._channels():
+            # A paused channel wouldn't fade, it's stopped right away.
+            if fade_ms and self._paused_at is None:
+                channel.fadeout(fade_ms)
+            else:
+                channel.stop()
+        self.current = None
+        self._paused_at = None
+
+    @property
+    def position(self):
+        """Seconds into the current track, or None if nothing is playing."""
+        if self.current is None:
+            return None
+        now = self._paused_at or time.perf_counter()
+        return (now - self._started) % self.tracks[self.current].get_length()
+
+
+_music_service = None
+
+
+def get_music_service():
+    """Returns the MusicService that is shared by the whole game."""
+    global _music_service
+    if _music_service is None:
+        _music_service = MusicService()
+    return _music_service
+
+
 class BackgroundMusic:
     """This class handles the background music in the game."""
 
     def __init__(self, file, volume):
-        self.music = pygame.mixer.music
+        self.music = get_music_service()
         self.file = file
+        self.volume = volume
         self.file_exists = os.path.isfile(self.file)  # Check if file exists.
         if self.file_exists:
             self.load(self.file)
-            self.set_volume(volume)
         else:
             print(f"ERROR: {self.file} is missing.")
 
     def load(self, file):
-        """This will load the music file."""
+        """This will load the music file, unless it's already loaded."""
         if self.file_exists:
             self.music.load(file)
 
     def set_volume(self, volume):
         """This will set the volume of the music."""
+        self.volume = volume
+        if self.file_exists and self.music.current == self.file:
+            self.music.play(self.file, volume)
+
+    def play(self, fade_ms=0):
+        """This will start the music and repeat it indefinitely.
+
+        If another track is playing it's crossfaded over 'fade_ms'."""
+        if self.file_exists:
+            self.music.play(self.file, self.volume, fade_ms)
+
+    def pause(self):
+        """This will pause the music."""
         if self.file_exists:
-            self.music.set_volume(volume)
+            self.music.pause()
 
-    def play(self):
-        """This will start the music and repeat it indefinitely."""
+    def unpause(self):
+        """This will resume the music where it was paused."""
         if self.file_exists:
-            self.music.play(-1)
+            self.music.unpause()
 
-    def stop(self):
+    def stop(self, fade_ms=0):
         """This will stop the music."""
         if self.file_exists:
-            self.music.stop()
+            self.music.stop(fade_ms)
+
+    @property
+    def position(self):
+        """Seconds played of the track, or None if it's not playing."""
+        if self.music.current == self.file:
+            return self.music.position
+        return None
@@ -0,0 +1,203 @@
+"""Append-only session telemetry.
+
+The game loop appends small tuples to an in-memory buffer. Full buffers
+are handed to a background thread that writes them as NDJSON lines to a
+file that is rotated when it grows too big, so the game loop never waits
+for the disk.
+
+Every line is a JSON array that starts with the record kind and the time
+in milliseconds since the session started:
+
+    ["start", 0, "<session id>"]
+    ["event", t, "kill"]
+    ["tick", t, frame time, asteroids, lasers, powerups, effects]
+    ["end", t]
+
+Run 'python -m killerasteroids.telemetry' to summarize the saved logs."""
+
+import argparse
+import atexit
+import glob
+import json
+import os
+import queue
+import statistics
+import threading
+import time
+
+from . import settings
+
+
+class LogWriter(threading.Thread):
+    """Writes batches of records to a rotating NDJSON file."""
+
+    def __init__(self, file, max_bytes, backups):
+        super().__init__(name="telemetry", daemon=True)
+        self.file = file
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batches = queue.Queue()
+
+    def _rotate(self):
+        """Shift 'file' to 'file.1', 'file.1' to 'file.2' and so on."""
+        for i in range(self.backups - 1, 0, -1):
+            old = f"{self.file}.{i}"
+            if os.path.exists(old):
+                os.replace(old, f"{self.file}.{i + 1}")
+        os.replace(self.file, f"{self.file}.1")
+
+    def run(self):
+        os.makedirs(os.path.dirname(self.file), exist_ok=True)
+        while True:
+            batch = self.batches.get()
+            if batch is None:  # Sent by close().
+                return
+            lines = "".join(
+                json.dumps(record, separators=(",", ":")) + "\n"
+                for record in batch
+            )
+            with open(self.file, "a") as fh:
+                fh.write(lines)
+                size = fh.tell()
+            if size > self.max_bytes:
+                self._rotate()
+
+
+class Telemetry:
+    """Collects telemetry records for one game session.
+
+    The records are buffered and written in batches of 'batch_size' by a
+    LogWriter thread. Call close() when the session is over to write what
+    is left in the buffer."""
+
+    def __init__(self, file=None, batch_size=None):
+        self.file = file or settings.TELEMETRY_FILE
+        self.batch_size = batch_size or settings.TELEMETRY_BATCH_SIZE
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self._start = time.perf_counter()
+        self._buffer = []
+        self._writer = LogWriter(
+            self.file, settings.TELEMETRY_MAX_BYTES, settings.TELEMETRY_BACKUPS
+        )
+        self._writer.start()
+        # Don't lose the buffer when the game is quit with sys.exit().
+        atexit.register(self.close)
+        self._append(("start", 0, self.session))
+
+    def _now(self):
+        return int((time.perf_counter() - self._start) * 1000)
+
+    def _append(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def event(self, name):
+        """Record something that happened, like the events of a score."""
+        self._append(("event", self._now(), name))
+
+    def tick(self, frame_time, *counts):
+        """Record the frame time and the number of entities in a frame."""
+        self._append(("tick", self._now(), frame_time, *counts))
+
+    def flush(self):
+        """Hand the buffered records over to the writer thread."""
+        if self._buffer:
+            self._writer.batches.put(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        """End the session and wait for every record to be written."""
+        if not self._writer.is_alive():
+            return
+        atexit.unregister(self.close)
+        self._append(("end", self._now()))
+        self.flush()
+        self._writer.batches.put(None)
+        self._writer.join()
+
+
+class NoTelemetry:
+    """Stand-in that ignores everything when telemetry is turned off."""
+
+    def event(self, name):
+        pass
+
+    def tick(self, frame_time, *counts):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def create_telemetry():
+    """Returns a Telemetry object if it is enabled in the settings."""
+    if settings.TELEMETRY:
+        return Telemetry()
+    return NoTelemetry()
+
+
+def read_logs(files):
+    """Yield every record in the given NDJSON files, oldest file first."""
+    for file in files:
+        with open(file) as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def summarize(records):
+    """Returns a dict with aggregated numbers from telemetry records."""
+    sessions = 0
+    events = {}
+    frame_times = []
+    max_entities = 0
+
+    for record in records:
+        kind = record[0]
+        if kind == "start":
+            sessions += 1
+        elif kind == "event":
+            events[record[2]] = events.get(record[2], 0) + 1
+        elif kind == "tick":
+            frame_times.append(record[2])
+            max_entities = max(max_entities, sum(record[3:]))
+
+    summary = {"sessions": sessions, "events": events, "ticks": 0}
+    if frame_times:
+        frame_times.sort()
+        summary.update(
+            ticks=len(frame_times),
+            frame_time_mean=round(statistics.fmean(frame_times), 2),
+            frame_time_p95=frame_times[int(len(frame_times) * 0.95)],
+            frame_time_max=frame_times[-1],
+            max_entities=max_entities,
+        )
+    return summary
+
+
+def main(argv=None):
+    """Print a summary of the telemetry logs as JSON."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="log files to read, defaults to every rotated telemetry log",
+    )
+    args = parser.parse_args(argv)
+
+    files = args.files
+    if not files:
+        # Oldest rotated file first so the records stay in order.
+        files = sorted(
+            glob.glob(glob.escape(settings.TELEMETRY_FILE) + "*"),
+            key=os.path.getmtime,
+        )
+    print(json.dumps(summarize(read_logs(files)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import pygame
 
 from . import settings
+from .assets import get_assets
 
 
 class RenderText(pygame.sprite.Sprite):
@@ -12,7 +13,7 @@ class RenderText(pygame.sprite.Sprite):
     def __init__(self, size, text):
         super().__init__()
         self.text = text
-        self.font = pygame.font.Font(settings.FONT, size)
+        self.font = get_assets().font(size)
         self.image = self._render_text(self.text, settings.TEXT_COLOR)
         self.rect = self.image.get_rect()
 
@@ -48,19 +49,49 @@ class BannerText(GenericText):
             self.rect[0] = -200
 
 
+class LoadingText(GenericText):
+    """Shows how much of the preloaded files the AssetManager has loaded.
+
+    It removes itself from its groups when everything is loaded."""
+
+    def __init__(self, position, assets=None):
+        self.assets = assets or get_assets()
+        self.percent = None
+        super().__init__(15, "", position)
+        self.update()
+
+    @property
+    def done(self):
+        done, total = self.assets.progress
+        return done == total
+
+    def update(self):
+        done, total = self.assets.progress
+        if done == total:
+            self.kill()
+            return
+        percent = 100 * done // total
+        if percent != self.percent:
+            self.percent = percent
+            self.text = f"LOADING {percent}%"
+            self.image = self._render_text(self.text, settings.TEXT_COLOR)
+
+
 class MenuOptionText(GenericText):
     """This class is for different options on a menu."""
 
     def __init__(self, size, text, position, selected):
         super().__init__(size, text, position)
         self.is_selected = selected
+        # Both looks are rendered once, update() only swaps between them.
+        self._images = {
+            True: self._render_text(self.text, settings.ACTIVE_OPTION),
+            False: self.image,
+        }
 
     def update(self):
         """Change the color of the options to indicate which on is active."""
-        if self.get_state():
-            self.image = self._render_text(self.text, settings.ACTIVE_OPTION)
-        else:
-            self.image = self._render_text(self.text, settings.TEXT_COLOR)
+        self.image = self._images[self.get_state()]
 
     def get_state(self):
         """Tells if the option is selected or not."""
@@ -11,8 +11,8 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     packages=setuptools.find_packages(),
-    package_data={"": ["*.wav", "*.ogg", "*.ttf", "*.png"]},
-    python_requires=">=3.7.4",
+    package_data={"": ["*.wav", "*.ogg", "*.ttf", "*.png", "*.bundle"]},
+    python_requires=">=3.8",
     entry_points={
         "console_scripts": ["killerasteroids = killerasteroids.__main__:main"]
     },
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from killerasteroids import settings
+
+
+class GameTestCase(unittest.TestCase):
+    """Plays a GameLoop on a SceneManager with its files in a temporary
+    directory and the simulation on the test's thread.
+
+    The game is seeded with 'seed', and 'settings' are patched on top of
+    the ones every game test needs."""
+
+    seed = 0
+    settings = {}
+
+    def setUp(self):
+        pygame.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = patch.multiple(
+            settings,
+            **{
+                "TELEMETRY": False,
+                "THREADED_SIMULATION": False,
+                "DATABASE": os.path.join(self.directory.name, "highscore.db"),
+                "SAVE_FILE": os.path.join(
+                    self.directory.name, "save", "game.sav"
+                ),
+                **self.settings,
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        from killerasteroids.display import GameLoop
+        from killerasteroids.scene import SceneManager
+
+        self.GameLoop = GameLoop
+        self.manager = SceneManager()
+        self.addCleanup(self.manager.quit)
+        self.game = GameLoop(seed=self.seed)
+        self.manager.push(self.game)
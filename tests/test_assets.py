@@ -0,0 +1,34 @@
+import unittest
+
+import pygame
+
+from killerasteroids import assets, settings
+
+
+class AssetManagerTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.test = assets.AssetManager()
+
+    def test_image_is_cached(self):
+        file = settings.ASTEROID_SPRITE["file"]
+        self.assertIs(self.test.image(file), self.test.image(file))
+
+    def test_font_is_cached_per_size(self):
+        self.assertIs(self.test.font(15), self.test.font(15))
+        self.assertIsNot(self.test.font(15), self.test.font(20))
+
+    def test_preload_progress(self):
+        files = [
+            settings.ASTEROID_SPRITE["file"],
+            settings.LASER_SPRITE["file"],
+        ]
+        self.test.preload(images=files, fonts=[settings.FONT])
+        self.test.wait()
+        self.assertEqual(self.test.progress, (3, 3))
+
+    def test_preloaded_image(self):
+        file = settings.SPACE_SPRITE["file"]
+        self.test.preload(images=[file])
+        self.assertEqual(self.test.image(file).get_size(), (1920, 400))
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from killerasteroids import benchmarks, settings
+
+
+class BenchmarksTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.baseline = os.path.join(self.directory.name, "baseline.json")
+        self.output = os.path.join(self.directory.name, "latest.json")
+        patcher = patch.multiple(
+            settings,
+            # main() runs headless(), which changes these.
+            DATABASE=settings.DATABASE,
+            TELEMETRY_FILE=settings.TELEMETRY_FILE,
+            SAVE_FILE=settings.SAVE_FILE,
+            THREADED_SIMULATION=settings.THREADED_SIMULATION,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        settings.DATABASE = os.path.join(self.directory.name, "highscore.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_measure(self):
+        calls = []
+        microseconds = benchmarks.measure(lambda: calls.append(1), 0.01)
+        self.assertGreater(microseconds, 0)
+        self.assertGreater(len(calls), benchmarks.ROUNDS)
+
+    def test_compare(self):
+        baseline = {"a": 10.0, "b": 10.0, "c": 10.0}
+        results = {"a": 12.0, "b": 13.0, "d": 1.0}
+        rows, regressions = benchmarks.compare(results, baseline, 0.25)
+        self.assertEqual([row[0] for row in rows], ["a", "b"])
+        self.assertAlmostEqual(rows[1][3], 0.3)
+        self.assertEqual(regressions, ["b"])
+
+    def test_run(self):
+        names = ["groupcollide_10x10", "hud_text", "database_rank"]
+        results = benchmarks.run(names, 0.005, report=lambda text: None)
+        self.assertEqual(list(results), names)
+        self.assertTrue(all(us > 0 for us in results.values()))
+
+    def test_database_is_filled_once(self):
+        first = benchmarks._database(10)
+        second = benchmarks._database(10)
+        self.assertEqual(second.get_rank(-1000), (11, 10))
+        self.assertFalse(os.path.exists(settings.DATABASE))
+        first.close()
+        second.close()
+
+    def test_baseline(self):
+        benchmarks.save(self.baseline, {"a": 1.0})
+        self.assertEqual(benchmarks.load(self.baseline), {"a": 1.0})
+        self.assertIsNone(benchmarks.load(self.output))
+
+    def test_main_flags_regressions(self):
+        argv = [
+            "--filter=groupcollide_10x10",
+            "--budget=0.005",
+            f"--baseline={self.baseline}",
+            f"--output={self.output}",
+        ]
+        with patch("builtins.print"):
+            benchmarks.main(argv)
+            self.assertTrue(os.path.isfile(self.baseline))
+            benchmarks.save(self.baseline, {"groupcollide_10x10": 1e-6})
+            with self.assertRaises(SystemExit) as exit:
+                benchmarks.main(argv)
+        self.assertEqual(exit.exception.code, 1)
+        self.assertIn("groupcollide_10x10", benchmarks.load(self.output))
+
+    def test_update_baseline_keeps_the_others(self):
+        benchmarks.save(self.baseline, {"a": 1.0, "groupcollide_10x10": 1.0})
+        with patch("builtins.print"):
+            benchmarks.main(
+                [
+                    "--filter=groupcollide_10x10",
+                    "--budget=0.005",
+                    "--update-baseline",
+                    f"--baseline={self.baseline}",
+                    f"--output={self.output}",
+                ]
+            )
+        baseline = benchmarks.load(self.baseline)
+        self.assertEqual(baseline["a"], 1.0)
+        self.assertNotEqual(baseline["groupcollide_10x10"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
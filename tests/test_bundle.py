@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from killerasteroids import bundle, settings
+
+
+class PackAtlasTest(unittest.TestCase):
+    def test_rects_do_not_overlap(self):
+        sizes = {"a": (30, 10), "b": (20, 20), "c": (40, 5), "d": (10, 10)}
+        height, rects = bundle.pack_atlas(sizes, 50)
+        rects = [pygame.Rect(rect) for rect in rects.values()]
+        for i, rect in enumerate(rects):
+            self.assertEqual(rect.collidelist(rects[i + 1 :]), -1)
+            self.assertLessEqual(rect.right, 50)
+            self.assertLessEqual(rect.bottom, height)
+
+
+class BundleTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, "test.bundle")
+        self.images = [
+            settings.ASTEROID_SPRITE["file"],
+            settings.LASER_SPRITE["file"],
+        ]
+        bundle.build(self.file, self.images, [settings.BEEP], [settings.FONT])
+        self.test = bundle.Bundle(self.file)
+
+    def tearDown(self):
+        self.test.close()
+        self.directory.cleanup()
+
+    def test_images_match_files(self):
+        for file in self.images:
+            image = pygame.image.load(file).convert_alpha()
+            self.assertEqual(
+                pygame.image.tostring(self.test.image(file), "RGBA"),
+                pygame.image.tostring(image, "RGBA"),
+            )
+
+    def test_font_data(self):
+        with open(settings.FONT, "rb") as fh:
+            self.assertEqual(self.test.font_data(settings.FONT), fh.read())
+
+    def test_has(self):
+        self.assertTrue(self.test.has_image(self.images[0]))
+        self.assertFalse(self.test.has_image(settings.SPACE_SPRITE["file"]))
+        self.assertTrue(self.test.has_font(settings.FONT))
+
+    def test_changed_files_are_not_taken_from_the_bundle(self):
+        font = os.path.join(self.directory.name, "font.ttf")
+        with open(settings.FONT, "rb") as fh, open(font, "wb") as out:
+            out.write(fh.read())
+        bundle.build(self.file + "2", [], [], [font])
+
+        # Copied or installed again, with a new modification time.
+        os.utime(font, (2000, 2000))
+        test = bundle.Bundle(self.file + "2")
+        self.assertTrue(test.has_font(font))
+        test.close()
+
+        with open(font, "r+b") as fh:
+            fh.write(b"X")
+        os.utime(font, (3000, 3000))
+        test = bundle.Bundle(self.file + "2")
+        self.assertFalse(test.has_font(font))
+        test.close()
+
+    def test_images_can_be_drawn_on(self):
+        image = self.test.image(self.images[0])
+        image.fill((255, 0, 0, 255))
+        self.assertEqual(image.get_at((0, 0)), (255, 0, 0, 255))
+        test = bundle.Bundle(self.file)
+        self.assertNotEqual(
+            test.image(self.images[0]).get_at((0, 0)), (255, 0, 0, 255)
+        )
+        test.close()
+
+    def test_bad_file(self):
+        with open(self.file, "wb") as fh:
+            fh.write(b"not a bundle")
+        self.assertIsNone(bundle.open_bundle(self.file))
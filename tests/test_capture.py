@@ -0,0 +1,53 @@
+import os
+import queue
+import tempfile
+import unittest
+
+import pygame
+
+from killerasteroids import capture
+
+
+class RecorderTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.surface = pygame.Surface((32, 16), 0, 32)
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "frames")
+        self.test = capture.Recorder(self.output, slots=4)
+
+    def tearDown(self):
+        self.test.stop()
+        self.directory.cleanup()
+
+    def test_frames_are_written(self):
+        self.test.start(self.surface)
+        for color in ((255, 0, 0), (0, 255, 0), (0, 0, 255)):
+            self.surface.fill(color)
+            self.test.capture(self.surface)
+        self.test.stop()
+        stats = self.test.stats()
+        self.assertEqual(stats["captured"], 3)
+        self.assertEqual(stats["encoded"], 3)
+        files = sorted(os.listdir(self.output))
+        self.assertEqual(len(files), 3)
+        frame = pygame.image.load(os.path.join(self.output, files[-1]))
+        self.assertEqual(frame.get_size(), (32, 16))
+        self.assertEqual(frame.get_at((0, 0))[:3], (0, 0, 255))
+
+    def test_frames_are_dropped_when_no_slot_is_free(self):
+        self.test.start(self.surface)
+        # Every slot is taken.
+        self.test._unused = []
+        self.test._free = queue.Queue()
+        self.test.capture(self.surface)
+        self.assertEqual(self.test.dropped, 1)
+        self.assertEqual(self.test.captured, 0)
+
+    def test_capture_before_start_does_nothing(self):
+        self.test.capture(self.surface)
+        self.assertEqual(self.test.stats()["captured"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+
+import pygame
+from pygame import locals
+
+from killerasteroids import controls
+
+
+def key(type, key):
+    return pygame.event.Event(type, key=key)
+
+
+class Pressed(dict):
+    """A stand-in for what pygame.key.get_pressed() returns."""
+
+    def __missing__(self, key):
+        return False
+
+
+class ControlsTest(unittest.TestCase):
+    def setUp(self):
+        self.test = controls.Controls()
+
+    def test_pressed_key_returns_action(self):
+        event = key(locals.KEYDOWN, locals.K_SPACE)
+        self.assertEqual(self.test.handle(event), controls.FIRE)
+
+    def test_held_actions(self):
+        self.test.handle(key(locals.KEYDOWN, locals.K_UP))
+        self.test.handle(key(locals.KEYDOWN, locals.K_LEFT))
+        self.assertEqual(self.test.held, controls.UP | controls.LEFT)
+        self.assertIsNone(self.test.handle(key(locals.KEYUP, locals.K_UP)))
+        self.assertEqual(self.test.held, controls.LEFT)
+
+    def test_unbound_events_are_ignored(self):
+        self.assertIsNone(self.test.handle(key(locals.KEYDOWN, locals.K_a)))
+        event = pygame.event.Event(locals.MOUSEMOTION, pos=(1, 1))
+        self.assertIsNone(self.test.handle(event))
+        self.assertEqual(self.test.held, 0)
+
+    def test_poll_reads_the_keyboard(self):
+        pressed = {locals.K_DOWN: True}
+        with patch("pygame.key.get_focused", return_value=True), patch(
+            "pygame.key.get_pressed", return_value=Pressed(pressed)
+        ):
+            self.test.held = controls.UP
+            self.test.poll()
+        self.assertEqual(self.test.held, controls.DOWN)
+
+    def test_poll_without_focus_keeps_the_events(self):
+        self.test.handle(key(locals.KEYDOWN, locals.K_UP))
+        with patch("pygame.key.get_focused", return_value=False):
+            self.test.poll()
+        self.assertEqual(self.test.held, controls.UP)
+
+
+class AllowEventsTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def tearDown(self):
+        pygame.event.set_allowed(None)
+
+    def test_only_used_events_are_queued(self):
+        controls.allow_events()
+        self.assertTrue(pygame.event.get_blocked(locals.MOUSEMOTION))
+        self.assertFalse(pygame.event.get_blocked(locals.KEYDOWN))
+        self.assertFalse(pygame.event.get_blocked(locals.QUIT))
+
+
+class InputLatencyTest(unittest.TestCase):
+    def setUp(self):
+        self.test = controls.InputLatency(size=3)
+
+    def test_only_frames_with_keys_are_measured(self):
+        self.test.stamp([])
+        self.test.presented()
+        self.assertEqual(self.test.stats(), {"frames": 0})
+        self.test.stamp([key(locals.KEYDOWN, locals.K_UP)])
+        self.test.presented()
+        stats = self.test.stats()
+        self.assertEqual(stats["frames"], 1)
+        self.assertGreaterEqual(stats["max_ms"], 0)
+
+    def test_keeps_the_latest_samples(self):
+        for _ in range(5):
+            self.test.stamp([key(locals.KEYUP, locals.K_UP)])
+            self.test.presented()
+        self.assertEqual(self.test.stats()["frames"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
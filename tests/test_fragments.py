@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import patch
+
+from killerasteroids import rewind, settings
+from killerasteroids.object import Asteroid, Laser
+from tests import GameTestCase
+
+
+class FragmentTest(GameTestCase):
+    seed = 8
+
+    def setUp(self):
+        super().setUp()
+        self.game.asteroid_group.empty()
+        self.game.powerup_group.empty()
+
+    def shoot(self, scale, position=(300, 200)):
+        asteroid = Asteroid(
+            settings.ASTEROID_SPRITE, [0, 0], [4, 0], scale=scale
+        )
+        asteroid.rect.center = position
+        laser = Laser(settings.LASER_SPRITE, position)
+        self.game.asteroid_group.add(asteroid)
+        self.game.laser_group.add(laser)
+        self.game.laser_hits_asteroid(
+            self.game.laser_group, self.game.asteroid_group
+        )
+        return asteroid
+
+    def test_large_asteroids_split(self):
+        asteroid = self.shoot(1.6)
+        fragments = self.game.asteroid_group.sprites()
+        self.assertFalse(asteroid.alive())
+        self.assertEqual(len(fragments), settings.FRAGMENTS)
+        for fragment in fragments:
+            self.assertIn(fragment, self.game.fragment_pool.asteroids)
+            self.assertEqual(fragment.scale, 1.0)
+            self.assertGreater(fragment.speed[0], asteroid.speed[0])
+        self.assertNotEqual(fragments[0].rect.center, fragments[1].rect.center)
+
+    def test_smallest_asteroids_vanish(self):
+        self.shoot(min(settings.ASTEROID_SCALES))
+        self.assertEqual(len(self.game.asteroid_group), 0)
+
+    def test_spawns_a_frame_are_limited(self):
+        with patch.object(settings, "FRAGMENT_SPAWN_LIMIT", 3):
+            for y in (50, 150, 250):
+                self.shoot(1.6, (300, y))
+            self.assertEqual(len(self.game.asteroid_group), 3)
+            self.game.step()
+            self.shoot(1.6, (400, 300))
+        self.assertEqual(len(self.game.asteroid_group), 5)
+
+    def test_entity_budget(self):
+        with patch.object(settings, "ENTITY_BUDGET", 3):
+            for _ in range(2):
+                self.game.laser_group.add(
+                    Laser(settings.LASER_SPRITE, (10, 10))
+                )
+            self.shoot(1.6)
+            self.assertLessEqual(self.game.count_entities(), 3)
+            self.assertEqual(len(self.game.asteroid_group), 1)
+
+    def test_levels_fit_in_the_entity_budget(self):
+        self.game.level.current_level = 9
+        with patch.object(settings, "ENTITY_BUDGET", 12):
+            for _ in range(2):
+                self.game.laser_group.add(
+                    Laser(settings.LASER_SPRITE, (10, 10))
+                )
+            self.game.is_asteroids_destroyed()
+        self.assertEqual(self.game.level.current_level, 10)
+        self.assertEqual(len(self.game.asteroid_group), 10)
+
+    def test_levels_always_have_an_asteroid(self):
+        with patch.object(settings, "ENTITY_BUDGET", 0):
+            self.game.is_asteroids_destroyed()
+        self.assertEqual(len(self.game.asteroid_group), 1)
+
+    def test_pool_runs_dry(self):
+        pool = self.game.fragment_pool.asteroids
+        self.game.asteroid_group.add(pool[:-1])
+        self.shoot(1.6)
+        self.assertEqual(len(self.game.asteroid_group), len(pool))
+
+    def test_reused_fragments_get_new_rewind_ids(self):
+        ids = iter(range(1, 100))
+        fragment = self.game.fragment_pool.acquire((0, 0), [4, 0], 1.0, 0)
+        self.game.asteroid_group.add(fragment)
+        first = [row[1] for row in rewind.get_entities(self.game, ids)]
+        fragment.kill()
+        again = self.game.fragment_pool.acquire((0, 0), [4, 0], 1.0, 0)
+        self.assertIs(again, fragment)
+        self.game.asteroid_group.add(again)
+        second = [row[1] for row in rewind.get_entities(self.game, ids)]
+        self.assertNotEqual(first, second)
+
+    def test_fragments_are_freed_with_the_level(self):
+        self.shoot(1.6)
+        self.game.reset(8)
+        self.assertFalse(
+            any(a.alive() for a in self.game.fragment_pool.asteroids)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
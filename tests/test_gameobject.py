@@ -3,7 +3,8 @@ from unittest.mock import patch
 
 import pygame
 
-from killerasteroids import object, settings
+from killerasteroids import controls, object, settings
+from killerasteroids.sound import SoundEffect
 
 
 class ScoreTest(unittest.TestCase):
@@ -41,6 +42,12 @@ class ScoreTest(unittest.TestCase):
         self.test.game_score("fire")
         self.assertEqual(self.test.score, 0)
 
+    def test_reset(self):
+        self.test.game_score("kill")
+        self.test.reset()
+        self.assertEqual(self.test.score, 0)
+        self.assertEqual(self.test.text, "SCORE: 0")
+
 
 class LifeTest(unittest.TestCase):
     def setUp(self):
@@ -71,6 +78,11 @@ class LifeTest(unittest.TestCase):
         self.assertTrue(lose_file)
         self.assertTrue(gain_file)
 
+    def test_sound_effects_fade_out_on_their_own(self):
+        self.assertIsNot(self.test.lose_sfx.sfx, self.test.gain_sfx.sfx)
+        laser = SoundEffect(settings.LASER, 0.5)
+        self.assertIs(laser.sfx, SoundEffect(settings.LASER, 0.5).sfx)
+
     @patch("killerasteroids.object.Life.lose_life_sfx")
     def test_lose_life(self, mock_sfx):
         self.test.lose_life()
@@ -86,3 +98,137 @@ class LifeTest(unittest.TestCase):
         self.test.extra_life()
         self.test.update()
         self.assertEqual(self.test.text, "LIFE x 4")
+
+    @patch("killerasteroids.object.Life.lose_life_sfx")
+    def test_reset(self, mock_sfx):
+        self.test.lose_life()
+        self.test.reset()
+        self.assertEqual(self.test.life, 3)
+        self.assertEqual(self.test.text, "LIFE x 3")
+
+
+class RotationCacheTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.test = object.RotationCache(size=2)
+        self.image = pygame.Surface((10, 10), pygame.SRCALPHA)
+
+    def test_transformed_once(self):
+        first = self.test.get(self.image, "a", 30, 1.0)
+        self.assertIs(self.test.get(self.image, "a", 30, 1.0), first)
+        self.assertEqual((self.test.hits, self.test.misses), (1, 1))
+
+    def test_angles_are_rounded(self):
+        step = settings.ROTATION_STEP
+        first = self.test.get(self.image, "a", 2 * step, 1.0)
+        near = self.test.get(self.image, "a", 2 * step + step / 3, 1.0)
+        self.assertIs(near, first)
+        self.assertIs(
+            self.test.get(self.image, "a", 360 + 2 * step, 1.0), first
+        )
+
+    def test_scale(self):
+        frame = self.test.get(self.image, "a", 0, 2.0)
+        self.assertEqual(frame.get_size(), (20, 20))
+
+    def test_least_recently_used_is_dropped(self):
+        first = self.test.get(self.image, "a", 0, 1.0)
+        self.test.get(self.image, "b", 0, 1.0)
+        self.test.get(self.image, "a", 0, 1.0)
+        self.test.get(self.image, "c", 0, 1.0)
+        self.assertEqual(len(self.test), 2)
+        self.assertIs(self.test.get(self.image, "a", 0, 1.0), first)
+        self.assertEqual(self.test.misses, 3)
+
+
+class AsteroidTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+
+    def test_scale(self):
+        test = object.Asteroid(
+            settings.ASTEROID_SPRITE, [300, 100], [3, 0], scale=2.0
+        )
+        self.assertEqual(test.rect.size, (70, 70))
+
+    def test_spin_keeps_center(self):
+        test = object.Asteroid(
+            settings.ASTEROID_SPRITE, [300, 100], [0, 0], spin=45
+        )
+        center = test.rect.center
+        test.update()
+        self.assertEqual(test.angle, 45)
+        self.assertEqual(test.rect.center, center)
+        self.assertGreater(test.rect.width, 35)
+
+    def test_hitbox_is_the_unturned_asteroid(self):
+        test = object.Asteroid(
+            settings.ASTEROID_SPRITE, [300, 100], [0, 0], scale=2.0, spin=45
+        )
+        test.update()
+        self.assertGreater(test.rect.width, 70)
+        self.assertEqual(test.hitbox.size, (70, 70))
+        self.assertEqual(test.hitbox.center, test.rect.center)
+
+        corner = pygame.sprite.Sprite()
+        corner.rect = pygame.Rect(test.rect.topleft, (2, 2))
+        self.assertTrue(pygame.sprite.collide_rect(corner, test))
+        self.assertFalse(object.collide_hitbox(corner, test))
+        corner.rect.center = test.rect.center
+        self.assertTrue(object.collide_hitbox(corner, test))
+
+    def test_no_spin_uses_the_frames(self):
+        test = object.Asteroid(settings.ASTEROID_SPRITE, [300, 100], [3, 0])
+        self.assertIs(test.image, test._images[0])
+
+
+class AsteroidPoolTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+        self.test = object.AsteroidPool(size=2)
+        self.group = pygame.sprite.Group()
+
+    def test_reuses_free_asteroids(self):
+        first = self.test.acquire([100, 50], [4, 0], 0.6, 3)
+        self.assertIn(first, self.test.asteroids)
+        self.assertEqual(
+            (first.scale, first.spin, first.speed), (0.6, 3, [4, 0])
+        )
+        self.group.add(first)
+        second = self.test.acquire([100, 50], [4, 0], 0.6, 0)
+        self.group.add(second)
+        self.assertIsNot(first, second)
+        self.assertIsNone(self.test.acquire([0, 0], [4, 0], 1.0, 0))
+
+        first.kill()
+        self.assertIs(self.test.acquire([0, 0], [5, 0], 1.0, 0), first)
+        self.assertEqual(first.speed, [5, 0])
+
+
+class PlayerTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+        self.test = object.Player(settings.PLAYER_SPRITE)
+
+    def test_steer(self):
+        self.test.rect.topleft = [100, 200]
+        self.test.steer(controls.DOWN | controls.RIGHT)
+        self.test.update()
+        self.assertEqual(self.test.rect.topleft, (105, 205))
+        self.test.steer(0)
+        self.test.update()
+        self.assertEqual(self.test.rect.topleft, (105, 205))
+
+    def test_stays_inside_the_limits(self):
+        self.test.rect.topleft = [settings.LIMIT_LEFT, settings.LIMIT_UP]
+        self.test.steer(controls.UP | controls.LEFT)
+        self.test.update()
+        self.assertEqual(
+            self.test.rect.topleft, (settings.LIMIT_LEFT, settings.LIMIT_UP)
+        )
@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch
+
+from killerasteroids import governor, settings
+from killerasteroids.object import Asteroid
+from tests import GameTestCase
+
+
+class GovernorTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.multiple(
+            settings,
+            GOVERNOR_WINDOW=10,
+            GOVERNOR_OVERRUNS=3,
+            GOVERNOR_HEADROOM=0.5,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.governor = governor.Governor(fps=50)
+        printer = patch("builtins.print")
+        self.printed = printer.start()
+        self.addCleanup(printer.stop)
+
+    def feed(self, frame_time, frames):
+        return [self.governor.observe(frame_time) for _ in range(frames)]
+
+    def test_degrades_after_overruns(self):
+        self.assertEqual(self.feed(25, 2), [None, None])
+        self.assertEqual(self.feed(25, 1), [governor.ANIMATION])
+        # The window starts over after a change.
+        self.assertEqual(self.feed(25, 3)[-1], governor.EFFECTS)
+        self.feed(25, 100)
+        self.assertEqual(self.governor.level, governor.ASTEROIDS)
+        self.assertIn(
+            "animation -> effects", self.printed.call_args_list[1][0][0]
+        )
+
+    def test_single_overruns_are_ignored(self):
+        for _ in range(10):
+            self.feed(30, 1)
+            self.feed(10, 5)
+        self.assertEqual(self.governor.level, governor.FULL)
+
+    def test_steps_back_with_headroom(self):
+        self.feed(25, 6)
+        self.assertEqual(self.governor.level, governor.EFFECTS)
+        # Not under half of the budget.
+        self.feed(15, 30)
+        self.assertEqual(self.governor.level, governor.EFFECTS)
+        self.assertEqual(self.feed(5, 10)[-1], governor.ANIMATION)
+        self.feed(5, 10)
+        self.assertEqual(self.governor.level, governor.FULL)
+        self.feed(5, 50)
+        self.assertEqual(self.governor.level, governor.FULL)
+
+    def test_uncapped(self):
+        uncapped = governor.Governor(fps=0)
+        self.assertEqual(
+            [uncapped.observe(1000) for _ in range(20)], [None] * 20
+        )
+
+
+class GameLoadTest(GameTestCase):
+    seed = 4
+    settings = {"GOVERNOR": True, "GOVERNOR_MAX_ASTEROIDS": 2}
+
+    def test_fewer_particles(self):
+        density = self.game.particles.density
+        with patch("builtins.print"):
+            self.game.shed_load(governor.EFFECTS)
+            self.assertEqual(
+                self.game.particles.density,
+                density * settings.GOVERNOR_EFFECT_SCALE,
+            )
+            self.game.shed_load(governor.ANIMATION)
+        self.assertEqual(self.game.particles.density, density)
+
+    def test_animates_every_other_frame(self):
+        self.game.governor.level = governor.ANIMATION
+        with patch.object(Asteroid, "animate") as animate:
+            for _ in range(4):
+                self.game.animate_groups()
+        self.assertEqual(animate.call_count, 2 * len(self.game.asteroid_group))
+
+    def test_asteroids_wait_off_screen(self):
+        self.game.asteroid_group.empty()
+        asteroids = [
+            Asteroid(settings.ASTEROID_SPRITE, [x, 100], [5, 0])
+            for x in (100, 300, settings.WIDTH + 3, settings.WIDTH + 50)
+        ]
+        self.game.asteroid_group.add(asteroids)
+        self.game.governor.level = governor.ASTEROIDS
+        waiting = [a.rect.left for a in asteroids[2:]]
+        self.game.update_groups()
+        self.assertEqual([a.rect.left for a in asteroids[2:]], waiting)
+        self.assertLess(asteroids[0].rect.left, 100)
+
+        self.game.asteroid_group.remove(asteroids[0])
+        self.game.update_groups()
+        self.assertLess(asteroids[2].rect.left, settings.WIDTH)
+        self.assertEqual(asteroids[3].rect.left, waiting[1])
+
+    def test_slow_frames_degrade_the_game(self):
+        with patch.object(self.manager.clock, "get_rawtime", return_value=500):
+            with patch("builtins.print") as printed:
+                for _ in range(settings.GOVERNOR_OVERRUNS):
+                    self.game.update()
+        self.assertEqual(self.game.governor.level, governor.ANIMATION)
+        printed.assert_called_once()
+        self.game.reset(1)
+        self.assertEqual(self.game.governor.level, governor.FULL)
+
+    def test_threaded_game_sheds_load_on_the_worker(self):
+        from killerasteroids.simulation import Simulation
+
+        self.game.simulation = Simulation(self.game)
+        self.game.simulation.tick_time = 500
+        density = self.game.particles.density
+        with patch.object(self.manager.clock, "get_rawtime", return_value=0):
+            with patch("builtins.print"):
+                for _ in range(2 * settings.GOVERNOR_OVERRUNS):
+                    self.game.update()
+        self.assertEqual(self.game.governor.level, governor.EFFECTS)
+        # Only changed when the worker takes its next step.
+        self.assertEqual(self.game.particles.density, density)
+        self.game.simulation.step()
+        self.assertLess(self.game.particles.density, density)
+        self.game.simulation = None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from killerasteroids import harness, settings
+
+
+class HarnessTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.multiple(
+            settings,
+            TELEMETRY=False,
+            THREADED_SIMULATION=False,
+            DATABASE=os.path.join(self.directory.name, "highscore.db"),
+            SAVE_FILE=os.path.join(self.directory.name, "game.sav"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_percentiles(self):
+        stats = harness.percentiles([i / 1000 for i in range(1, 101)])
+        self.assertEqual(stats["p50"], 51)
+        self.assertEqual(stats["p99"], 100)
+        self.assertEqual(stats["max"], 100)
+        self.assertEqual(harness.percentiles([]), {})
+
+    def test_metrics(self):
+        metrics, played = harness.run(seed=3, ticks=50, draw=True)
+        self.assertEqual(metrics["ticks"], 50)
+        self.assertGreater(metrics["ticks_per_s"], 0)
+        self.assertIn("p99", metrics["tick_ms"])
+        self.assertTrue(played)
+        json.dumps(metrics)
+
+    def test_level_and_asteroids(self):
+        metrics, _ = harness.run(level=4, asteroids=40, ticks=1)
+        self.assertGreaterEqual(metrics["entities"], 40)
+
+    def test_same_seed_same_game(self):
+        first, _ = harness.run(seed=5, ticks=100)
+        second, _ = harness.run(seed=5, ticks=100)
+        self.assertEqual(first["digest"], second["digest"])
+
+    def test_replay_a_recording(self):
+        file = os.path.join(self.directory.name, "run.ndjson")
+        metrics, script = harness.run(seed=2, asteroids=20, ticks=150)
+        harness.save_script(file, metrics, script)
+        recorded, loaded = harness.load_script(file)
+        self.assertEqual(recorded["digest"], metrics["digest"])
+        replayed, _ = harness.run(
+            seed=2, asteroids=20, ticks=150, draw=True, script=loaded
+        )
+        self.assertEqual(replayed["digest"], metrics["digest"])
+
+    def test_headless_cleans_up_one_directory(self):
+        names = ["DATABASE", "TELEMETRY_FILE", "SAVE_FILE", "GOVERNOR"]
+        saved = {name: getattr(settings, name) for name in names}
+        with patch.object(harness, "_directory", None), patch(
+            "atexit.register"
+        ) as register, patch.multiple(settings, **saved):
+            harness.headless()
+            database = settings.DATABASE
+            harness.headless()
+            self.assertEqual(settings.DATABASE, database)
+            register.assert_called_once()
+            directory = os.path.dirname(database)
+            self.assertTrue(os.path.isdir(directory))
+            register.call_args[0][0]()
+        self.assertFalse(os.path.isdir(directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
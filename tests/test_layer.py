@@ -0,0 +1,51 @@
+import unittest
+
+import pygame
+
+from killerasteroids import layer, text
+
+
+class StaticLayerTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((200, 100))
+        self.texts = [
+            text.GenericText(15, "one", [10, 10]),
+            text.GenericText(15, "two", [10, 40]),
+        ]
+        self.test = layer.StaticLayer(self.texts)
+
+    def test_renders_once(self):
+        for _ in range(3):
+            self.test.draw(self.screen)
+        self.assertEqual(self.test.renders, 1)
+
+    def test_same_pixels_as_drawing_each_sprite(self):
+        expected = pygame.Surface((200, 100))
+        pygame.sprite.RenderPlain(self.texts).draw(expected)
+        self.test.draw(self.screen)
+        self.assertEqual(
+            pygame.image.tostring(self.screen, "RGB"),
+            pygame.image.tostring(expected, "RGB"),
+        )
+
+    def test_moved_sprite_invalidates(self):
+        self.test.draw(self.screen)
+        self.texts[0].rect.x += 5
+        self.test.draw(self.screen)
+        self.assertEqual(self.test.renders, 2)
+
+    def test_added_sprite_invalidates(self):
+        self.test.draw(self.screen)
+        self.test.add(text.GenericText(15, "three", [10, 70]))
+        self.test.draw(self.screen)
+        self.assertEqual(self.test.renders, 2)
+
+    def test_menu_option_keeps_image(self):
+        option = text.MenuOptionText(15, "option", [10, 10], False)
+        self.test.add(option)
+        self.test.update()
+        self.test.draw(self.screen)
+        self.test.update()
+        self.test.draw(self.screen)
+        self.assertEqual(self.test.renders, 1)
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from killerasteroids import leaderboard
+
+
+class LeaderboardTest(unittest.TestCase):
+    def setUp(self):
+        self.test = leaderboard.Leaderboard(":memory:")
+        for score, player in [(500, "a"), (100, "b"), (300, "a"), (300, "c")]:
+            self.test.save(score, player, "2020/01/01")
+
+    def tearDown(self):
+        self.test.close()
+
+    def test_top(self):
+        self.assertEqual([row[0] for row in self.test.top(2)], [500, 300])
+
+    def test_pages_cover_every_row_once(self):
+        first = self.test.page(3)
+        last = first[-1]
+        second = self.test.page(3, (last[0], last[3]))
+        scores = [row[0] for row in first + second]
+        self.assertEqual(scores, [500, 300, 300, 100])
+
+    def test_rank(self):
+        self.assertEqual(self.test.rank(500), 1)
+        self.assertEqual(self.test.rank(300), 2)
+        self.assertEqual(self.test.rank(200), 4)
+
+    def test_rank_after_save(self):
+        self.test.save(1000, "d")
+        self.assertEqual(self.test.rank(500), 2)
+        self.assertEqual(self.test.count(), 5)
+
+    def test_rank_uses_the_index(self):
+        plan = self.test.db_curs.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM highscore "
+            "WHERE score > ? AND score < ?",
+            (0, 100),
+        ).fetchall()
+        self.assertIn("highscore_score", str(plan))
+
+    def test_rank_in_the_same_bucket(self):
+        self.test.save(350, "d")
+        self.test.save(-20, "e")
+        self.assertEqual(self.test.rank(320), 3)
+        self.assertEqual(self.test.rank(350), 2)
+        self.assertEqual(self.test.rank(0), 6)
+        self.assertEqual(self.test.rank(-50), 7)
+        self.assertEqual(self.test.count(), 6)
+
+    def test_counts_follow_deletes(self):
+        self.test.db_curs.execute("DELETE FROM highscore WHERE score = 300")
+        self.assertEqual(self.test.count(), 2)
+        self.assertEqual(self.test.rank(200), 2)
+
+    def test_counts_are_made_for_old_databases(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "highscore.db")
+            self.test.db_conn.backup(sqlite3.connect(file))
+            other = leaderboard.Leaderboard(file, bucket=1000)
+            try:
+                self.assertEqual(other.count(), 4)
+                self.assertEqual(other.rank(200), 4)
+                other.save(250)
+                self.assertEqual(other.rank(200), 5)
+            finally:
+                other.close()
+
+    def test_percentile(self):
+        self.assertEqual(self.test.percentile(500), 100.0)
+        self.assertEqual(self.test.percentile(100), 25.0)
+
+    def test_player_best(self):
+        self.assertEqual(self.test.player_best("a"), 500)
+        self.assertIsNone(self.test.player_best("nobody"))
+
+    def test_player_bests(self):
+        self.assertEqual(self.test.player_bests(2), [("a", 500), ("c", 300)])
+
+    def test_export_and_import(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "scores.csv")
+            self.assertEqual(self.test.export_csv(file), 4)
+            self.assertEqual(self.test.import_csv(file), 4)
+        self.assertEqual(self.test.count(), 8)
+        self.assertEqual(self.test.rank(300), 3)
@@ -0,0 +1,73 @@
+import unittest
+
+from killerasteroids import memory, savegame, scene
+from tests import GameTestCase
+
+
+class Menu(scene.Scene):
+    pass
+
+
+class Game(scene.Scene):
+    pass
+
+
+class MemoryMonitorTest(unittest.TestCase):
+    def setUp(self):
+        self.test = memory.MemoryMonitor(label="Menu", tolerance=10**6)
+        self.manager = scene.SceneManager()
+        self.manager.monitor = self.test
+        self.manager.push(Menu())
+
+    def tearDown(self):
+        self.test.stop()
+
+    def play(self, sessions, leak=None):
+        for _ in range(sessions):
+            game = Game()
+            self.manager.push(game)
+            self.manager.pop()
+            if leak is not None:
+                leak.append(game)
+
+    def test_count_objects(self):
+        before = memory.count_objects()["scenes"]
+        game = Game()
+        self.assertEqual(memory.count_objects()["scenes"], before + 1)
+
+    def test_checkpoint_at_every_scene_change(self):
+        self.play(2)
+        labels = [checkpoint.label for checkpoint in self.test.checkpoints]
+        self.assertEqual(labels, ["Menu", "Game", "Menu", "Game", "Menu"])
+        self.assertEqual(self.test.session, 2)
+        self.assertEqual(self.test.baseline.session, 1)
+
+    def test_no_growth(self):
+        self.play(4)
+        self.assertEqual(len(self.test.growth()), 3)
+        self.assertEqual(self.test.check(), [])
+
+    def test_leaked_scenes_fail_the_check(self):
+        leak = []
+        self.play(4, leak)
+        session, change = self.test.growth()[-1]
+        self.assertEqual(change["scenes"], 3)
+        self.assertEqual(len(self.test.check()), 1)
+
+    def test_report(self):
+        self.play(2)
+        report = self.test.report()
+        self.assertIn("Growth after session 2", report)
+
+
+class PlaySessionsTest(GameTestCase):
+    def test_starts_a_new_game_when_there_is_a_save(self):
+        savegame.save(self.game)
+        manager = scene.SceneManager()
+        memory.play_sessions(manager, 1, 5, seed=0)
+        # CONTINUE would have used the save up.
+        self.assertTrue(savegame.has_save())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import socket
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+from killerasteroids import metrics, settings
+from killerasteroids.scene import Scene, SceneManager
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = metrics.Metrics()
+        self.addCleanup(self.metrics.close)
+
+    def test_frame_phases(self):
+        manager = SceneManager()
+        manager.metrics = self.metrics
+        manager.push(Scene())
+        for _ in range(3):
+            manager.frame([])
+        manager.quit()
+        self.assertEqual(self.metrics.frames, 3)
+        self.assertEqual(self.metrics.scene, "Scene")
+        self.assertEqual(list(self.metrics.phases), list(metrics.PHASES))
+        self.assertTrue(all(t >= 0 for t in self.metrics.phases.values()))
+
+    def test_game_counts(self):
+        with patch.multiple(settings, TELEMETRY=False, REWIND=False):
+            from killerasteroids.display import GameLoop
+
+            manager = SceneManager()
+            manager.metrics = self.metrics
+            game = GameLoop(seed=1)
+            manager.push(game)
+            game.step()
+            asteroids = len(game.asteroid_group)
+            manager.quit()
+        self.assertEqual(self.metrics.level, 1)
+        self.assertEqual(self.metrics.entities["asteroids"], asteroids)
+
+    def test_text_format(self):
+        self.metrics.game(4, 10, 2, 1, 0)
+        text = self.metrics.render()
+        self.assertIn("# TYPE killerasteroids_level gauge\n", text)
+        self.assertIn("killerasteroids_level 4\n", text)
+        self.assertIn('killerasteroids_entities{group="asteroids"} 10\n', text)
+        self.assertIn("killerasteroids_audio_channels ", text)
+
+    def test_serve_over_tcp(self):
+        host, port = self.metrics.start("127.0.0.1", 0)
+        self.metrics.game(2, 1, 2, 3, 4)
+        url = f"http://{host}:{port}"
+        with urllib.request.urlopen(url + "/metrics") as response:
+            self.assertIn(b"killerasteroids_level 2", response.read())
+        with self.assertRaises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/nothing")
+
+    def test_serve_over_a_unix_socket(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "metrics.sock")
+        self.assertEqual(self.metrics.start(path=path), path)
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+        self.assertTrue(response.startswith(b"HTTP/1.0 200"))
+        self.assertIn(b"killerasteroids_frames_total 0", response)
+        self.metrics.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_port_in_use(self):
+        address = self.metrics.start("127.0.0.1", 0)
+        other = metrics.Metrics()
+        with patch("builtins.print"):
+            self.assertIsNone(other.start(*address))
+        other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
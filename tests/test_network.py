@@ -0,0 +1,158 @@
+import unittest
+
+import pygame
+
+from killerasteroids import network, settings
+
+
+class DeltaTest(unittest.TestCase):
+    def setUp(self):
+        self.base = {
+            1: (network.ASTEROID, 500, 100, 2, 0),
+            2: (network.LASER, 0, 0, 0, 0),
+        }
+        self.state = {
+            1: (network.ASTEROID, 495, 100, 2, 1),
+            3: (network.POWERUP, 600, 50, 0, 0),
+        }
+
+    def test_delta(self):
+        changed, moved, removed = network.delta(self.base, self.state)
+        self.assertEqual(changed, {3: (network.POWERUP, 600, 50, 0, 0)})
+        self.assertEqual(moved, {1: (-5, 0, 1)})
+        self.assertEqual(removed, [2])
+
+    def test_big_move_is_sent_in_full(self):
+        self.state[1] = (network.ASTEROID, 0, 100, 2, 0)
+        changed, moved, _ = network.delta(self.base, self.state)
+        self.assertIn(1, changed)
+        self.assertEqual(moved, {})
+
+    def test_new_size_is_sent_in_full(self):
+        self.state[1] = (network.ASTEROID, 495, 100, 1, 0)
+        changed, moved, _ = network.delta(self.base, self.state)
+        self.assertIn(1, changed)
+        self.assertEqual(moved, {})
+
+    def test_apply_delta(self):
+        changes = network.delta(self.base, self.state)
+        self.assertEqual(network.apply_delta(self.base, *changes), self.state)
+
+    def test_encode_and_decode(self):
+        changes = network.delta(self.base, self.state)
+        data = network.encode(7, 5, 1, [(3, 100), (0, 50)], *changes)
+        self.assertEqual(
+            network.decode(data), (7, 5, 1, [(3, 100), (0, 50)], *changes)
+        )
+
+
+class Sprite:
+    pass
+
+
+class NetIdsTest(unittest.TestCase):
+    def test_freed_ids_wait_for_the_history(self):
+        test = network.NetIds(history=3)
+        first, second = Sprite(), Sprite()
+        self.assertEqual(test.acquire(first), 1)
+        self.assertEqual(test.acquire(first), 1)
+        test.release({})
+        self.assertFalse(hasattr(first, "net_id"))
+        live = set()
+        for _ in range(3):
+            live.add(test.acquire(Sprite()))
+            test.release(live)
+        # Freed three ticks ago.
+        self.assertEqual(live, {2, 3, 1})
+        self.assertEqual(test.acquire(second), 4)
+
+    def test_ids_fit_in_16_bits(self):
+        test = network.NetIds(history=0)
+        for _ in range(0x20000):
+            sprite = Sprite()
+            self.assertLessEqual(test.acquire(sprite), 0xFFFF)
+            test.release({})
+        self.assertEqual(len(test), 0)
+
+
+class LoopbackTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))
+        self.server = network.Server(("127.0.0.1", 0), seed=1)
+        self.clients = [network.Client(self.server.address) for _ in range(2)]
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        self.server.close()
+
+    def run_ticks(self, ticks, buttons=0):
+        for _ in range(ticks):
+            for client in self.clients:
+                client.poll()
+                client.send_input(buttons)
+            self.server.step()
+        for client in self.clients:
+            client.poll()
+
+    def test_clients_get_the_servers_state(self):
+        self.run_ticks(20, network.DOWN)
+        state = self.server.game.state()
+        for slot, client in enumerate(self.clients):
+            self.assertEqual(client.slot, slot)
+            self.assertEqual(client.state, state)
+            self.assertEqual(client.players, self.server.game.scores())
+
+    def test_deltas_are_smaller_than_full_snapshots(self):
+        self.run_ticks(30)
+        for client in self.server.clients.values():
+            self.assertLess(client.bytes_sent, client.full_bytes)
+        self.assertEqual(sum(client.dropped for client in self.clients), 0)
+
+    def test_players_fire_their_own_lasers(self):
+        self.run_ticks(1)
+        self.run_ticks(1, network.FIRE)
+        owners = [laser.owner for laser in self.server.game.laser_group]
+        self.assertEqual(owners, self.server.game.players)
+
+    def test_interpolated_positions(self):
+        self.run_ticks(10)
+        client = self.clients[0]
+        entities = client.interpolated()
+        self.assertEqual(len(entities), len(client.state))
+
+    def test_interpolates_between_snapshots(self):
+        client = self.clients[0]
+        client.snapshots[1] = (0.0, {1: (network.ASTEROID, 100, 50, 0, 0)})
+        client.snapshots[2] = (0.1, {1: (network.ASTEROID, 90, 60, 0, 1)})
+        client.latest = 2
+        # Half a tick after the oldest snapshot.
+        now = 0.1 + (settings.NET_INTERP_TICKS - 0.5) * client.interval
+        kind, x, y, _, _ = client.interpolated(now)[0]
+        self.assertAlmostEqual(x, 95)
+        self.assertAlmostEqual(y, 55)
+
+    def test_asteroids_are_sent_where_they_are_hit(self):
+        self.run_ticks(3)
+        state = self.clients[0].state
+        for asteroid in self.server.game.asteroid_group:
+            _, x, y, size, turn = state[asteroid.net_id]
+            self.assertEqual((x, y), asteroid.hitbox.center)
+            self.assertEqual(settings.ASTEROID_SCALES[size], asteroid.scale)
+            self.assertAlmostEqual(
+                turn * settings.ROTATION_STEP % 360,
+                asteroid.angle,
+                delta=settings.ROTATION_STEP,
+            )
+
+    def test_stats(self):
+        self.run_ticks(5)
+        stats = self.server.stats()
+        self.assertEqual(stats["ticks"], 5)
+        self.assertEqual(len(stats["clients"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from killerasteroids import pacing
+
+
+class JitterHistogramTest(unittest.TestCase):
+    def setUp(self):
+        self.test = pacing.JitterHistogram()
+
+    def test_buckets(self):
+        for interval in (10.1, 9.6, 13, 40):
+            self.test.add(interval, 10)
+        # 0.1, 0.4, 3 and 30 ms off.
+        self.assertEqual(self.test.counts, [1, 1, 0, 0, 1, 0, 0, 1])
+        self.assertAlmostEqual(self.test.worst, 30)
+
+    def test_mean_and_stdev(self):
+        for interval in (8, 10, 12):
+            self.test.add(interval, 10)
+        self.assertAlmostEqual(self.test.mean, 10)
+        self.assertAlmostEqual(self.test.stdev, 2)
+
+    def test_as_dict(self):
+        self.test.add(10, 10)
+        stats = self.test.as_dict()
+        self.assertEqual(stats["frames"], 1)
+        self.assertEqual(stats["stdev_ms"], 0)
+        self.assertEqual(stats["jitter_ms"]["<0.25"], 1)
+        self.assertEqual(sum(stats["jitter_ms"].values()), 1)
+
+
+class FramePacerTest(unittest.TestCase):
+    def tick(self, test, frames, **kwargs):
+        start = time.perf_counter()
+        for _ in range(frames + 1):
+            test.tick(**kwargs)
+        return time.perf_counter() - start
+
+    def test_precise_frame_rate(self):
+        test = pacing.FramePacer(spin=2, align=False)
+        self.tick(test, 20, fps=100, label="game")
+        histogram = test.histograms["game"]
+        self.assertEqual(histogram.frames, 20)
+        self.assertAlmostEqual(histogram.mean, 10, delta=1)
+        self.assertAlmostEqual(test.get_fps(), 100, delta=10)
+
+    def test_fps_follows_the_last_frames(self):
+        test = pacing.FramePacer(spin=2, align=False)
+        self.tick(test, 20, fps=50)
+        self.tick(test, pacing.FPS_FRAMES, fps=200)
+        self.assertAlmostEqual(test.get_fps(), 200, delta=30)
+
+    def test_sleep_frame_rate(self):
+        test = pacing.FramePacer(spin=2, align=False)
+        self.tick(test, 10, fps=100, precise=False)
+        self.assertAlmostEqual(test.histograms[None].mean, 10, delta=3)
+
+    def test_uncapped(self):
+        test = pacing.FramePacer(align=False)
+        elapsed = self.tick(test, 100)
+        self.assertLess(elapsed, 0.1)
+        self.assertEqual(test.interval(0), 0)
+
+    def test_align_to_refresh(self):
+        test = pacing.FramePacer(align=True)
+        with patch.object(test, "refresh_rate", return_value=60):
+            # Two refreshes for every frame.
+            self.assertAlmostEqual(test.interval(30), 2 / 60)
+            self.assertAlmostEqual(test.interval(25), 2 / 60)
+            self.assertAlmostEqual(test.interval(100), 1 / 60)
+        with patch.object(test, "refresh_rate", return_value=0):
+            self.assertAlmostEqual(test.interval(25), 1 / 25)
+
+    def test_slow_frame_does_not_burst(self):
+        test = pacing.FramePacer(spin=1, align=False)
+        test.tick(fps=100)
+        time.sleep(0.05)
+        test.tick(fps=100)
+        start = time.perf_counter()
+        test.tick(fps=100)
+        # A whole frame, not the frames that were missed.
+        self.assertGreater(time.perf_counter() - start, 0.008)
+
+    def test_rawtime_is_the_frame_before_the_wait(self):
+        test = pacing.FramePacer(align=False)
+        test.tick(fps=20)
+        time.sleep(0.01)
+        test.tick(fps=20)
+        self.assertAlmostEqual(test.get_rawtime(), 10, delta=5)
+
+    def test_stats_per_label(self):
+        test = pacing.FramePacer(align=False)
+        test.tick(label="menu")
+        test.tick(label="menu")
+        test.tick(label="game")
+        self.assertEqual(set(test.stats()), {"menu", "game"})
+
+
+if __name__ == "__main__":
+    unittest.main()
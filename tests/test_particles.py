@@ -0,0 +1,47 @@
+import unittest
+
+import pygame
+
+from killerasteroids import particles
+
+
+@unittest.skipIf(particles.numpy is None, "needs NumPy")
+class ParticleSystemTest(unittest.TestCase):
+    def setUp(self):
+        self.test = particles.ParticleSystem(capacity=100, seed=1)
+
+    def test_emit(self):
+        self.test.emit((10, 10), 30, 5, 10, particles.FIRE)
+        self.assertEqual(self.test.count, 30)
+
+    def test_emit_is_limited_by_capacity(self):
+        self.test.emit((10, 10), 80, 5, 10, particles.FIRE)
+        self.test.emit((10, 10), 80, 5, 10, particles.FIRE)
+        self.assertEqual(self.test.count, 100)
+
+    def test_density(self):
+        self.test.density = 0.5
+        self.test.emit((10, 10), 30, 5, 10, particles.FIRE)
+        self.assertEqual(self.test.count, 15)
+
+    def test_dead_particles_are_removed(self):
+        self.test.emit((10, 10), 30, 5, 10, particles.FIRE)
+        for _ in range(10):
+            self.test.update()
+        self.assertEqual(self.test.count, 0)
+
+    def test_particles_move(self):
+        self.test.emit((10, 10), 1, 5, 10, particles.FIRE)
+        self.test.update()
+        self.assertNotEqual(tuple(self.test.position[0]), (10, 10))
+
+    def test_draw(self):
+        surface = pygame.Surface((20, 20), 0, 32)
+        self.test.emit((10, 10), 30, 0, 10, [(255, 0, 0)])
+        self.test.draw(surface)
+        self.assertEqual(surface.get_at((10, 10)), (255, 0, 0, 255))
+
+    def test_reset(self):
+        self.test.emit((10, 10), 30, 5, 10, particles.FIRE)
+        self.test.reset(1)
+        self.assertEqual(self.test.count, 0)
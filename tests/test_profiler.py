@@ -0,0 +1,113 @@
+import glob
+import os
+import pstats
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import pygame
+from pygame import locals
+
+from killerasteroids import profiler, settings
+from killerasteroids.scene import Scene, SceneManager
+
+
+class SlowScene(Scene):
+    def update(self):
+        end = time.perf_counter() + 0.002
+        while time.perf_counter() < end:
+            pass
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.multiple(
+            settings,
+            TELEMETRY=False,
+            THREADED_SIMULATION=False,
+            DATABASE=os.path.join(self.directory.name, "highscore.db"),
+            PROFILER_DIR=self.directory.name,
+            PROFILER_FIRST_GAME=False,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = SceneManager()
+
+    def tearDown(self):
+        self.manager.quit()
+        self.directory.cleanup()
+
+    def files(self, pattern="*"):
+        return sorted(glob.glob(os.path.join(self.directory.name, pattern)))
+
+    def test_collapse(self):
+        a = ("a.py", 1, "a")
+        b = ("b.py", 2, "b")
+        stats = {
+            a: (1, 1, 1.0, 4.0, {}),
+            b: (2, 2, 3.0, 3.0, {a: (2, 2, 3.0, 3.0)}),
+        }
+        stacks = profiler.collapse(stats)
+        self.assertEqual(
+            stacks, {"a (a.py:1)": 1.0, "a (a.py:1);b (b.py:2)": 3.0}
+        )
+
+    def test_profile_frames_of_a_game(self):
+        from killerasteroids.display import GameLoop
+
+        self.manager.push(GameLoop(seed=42))
+        with patch("builtins.print"):
+            self.manager.toggle_profiling(5)
+            for _ in range(6):
+                self.manager.frame([])
+        self.assertIsNone(self.manager.profiler)
+        folded, stats_file = self.files("seed42-level1-*")
+        stats = pstats.Stats(stats_file)
+        functions = [name for _, _, name in stats.stats]
+        self.assertIn("step", functions)
+        with open(folded) as fh:
+            stack, microseconds = fh.readline().rsplit(" ", 1)
+        self.assertTrue(stack.startswith("frame (scene.py:"))
+        self.assertGreater(int(microseconds), 0)
+
+    def test_sampling(self):
+        self.manager.push(SlowScene())
+        with patch.object(settings, "PROFILER", "sample"):
+            with patch("builtins.print"):
+                self.manager.toggle_profiling(50)
+                self.assertIsInstance(
+                    self.manager.profiler, profiler.SamplingProfiler
+                )
+                for _ in range(50):
+                    self.manager.frame([])
+        folded, stats_file = self.files("slowscene-*")
+        stats = pstats.Stats(stats_file)
+        self.assertIn("update", [name for _, _, name in stats.stats])
+        with open(folded) as fh:
+            self.assertIn("<MainThread>;", fh.read())
+
+    def test_hotkey_starts_and_stops(self):
+        self.manager.push(Scene())
+        key = pygame.event.Event(locals.KEYDOWN, key=locals.K_F11)
+        self.manager.frame([key])
+        self.assertIsNotNone(self.manager.profiler)
+        with patch("builtins.print"):
+            self.manager.frame([key])
+        self.assertIsNone(self.manager.profiler)
+        self.assertEqual(len(self.files("scene-*")), 2)
+
+    def test_first_game(self):
+        from killerasteroids.display import GameLoop
+
+        settings.PROFILER_FIRST_GAME = True
+        self.manager.push(GameLoop(seed=3))
+        self.assertIsNotNone(self.manager.profiler)
+        self.assertFalse(settings.PROFILER_FIRST_GAME)
+        with patch("builtins.print"):
+            self.manager.toggle_profiling()
+
+
+if __name__ == "__main__":
+    unittest.main()
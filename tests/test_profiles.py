@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from killerasteroids import profiles, settings
+
+
+class LoadProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, "profile.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, config):
+        with open(self.file, "w") as fh:
+            json.dump(config, fh)
+
+    def test_default_profile(self):
+        name, values = profiles.load_profile(file=self.file)
+        self.assertEqual(name, settings.PROFILE)
+        self.assertEqual(values, profiles.PROFILES[settings.PROFILE])
+
+    def test_file_chooses_and_changes_profile(self):
+        self.write({"profile": "low", "FPS": 25, "MIXER": [22050, -16, 2, 64]})
+        name, values = profiles.load_profile(file=self.file)
+        self.assertEqual(name, "low")
+        self.assertEqual(values["FPS"], 25)
+        self.assertEqual(values["MIXER"], (22050, -16, 2, 64))
+        self.assertTrue(values["DIRTY_RECTS"])
+
+    def test_name_is_used_before_the_file(self):
+        self.write({"profile": "low"})
+        name, values = profiles.load_profile("benchmark", self.file)
+        self.assertEqual(name, "benchmark")
+        self.assertEqual(values["FPS"], 0)
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            profiles.load_profile("ultra", self.file)
+
+    def test_broken_file_is_ignored(self):
+        with open(self.file, "w") as fh:
+            fh.write("{")
+        name, _ = profiles.load_profile(file=self.file)
+        self.assertEqual(name, settings.PROFILE)
+
+    def test_only_profile_settings_are_changed(self):
+        self.write({"WIDTH": 10})
+        _, values = profiles.load_profile(file=self.file)
+        self.assertNotIn("WIDTH", values)
+
+    def test_apply_profile(self):
+        with patch.object(settings, "FPS", 30):
+            profiles.apply_profile({"FPS": 0})
+            self.assertEqual(settings.FPS, 0)
+
+
+class RenderScaleTest(unittest.TestCase):
+    @patch.object(settings, "VSYNC", False)
+    @patch.object(settings, "RENDER_SCALE", 2)
+    def test_screen_is_scaled_to_the_window(self):
+        from killerasteroids.scene import SceneManager
+
+        manager = SceneManager()
+        self.assertEqual(manager.window.get_size(), (1280, 800))
+        self.assertEqual(manager.screen.get_size(), (640, 400))
+        manager.screen.fill((255, 0, 0))
+        manager.present()
+        self.assertEqual(manager.window.get_at((1279, 799))[:3], (255, 0, 0))
+        # Back to the normal window for the other tests.
+        pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+
+    @patch.object(settings, "VSYNC", True)
+    @patch.object(settings, "RENDER_SCALE", 2)
+    def test_vsync_window_is_scaled(self):
+        from killerasteroids.scene import SceneManager
+
+        with patch("builtins.print"):
+            manager = SceneManager()
+        self.assertEqual(manager.window.get_size(), (1280, 800))
+        self.assertEqual(manager.screen.get_size(), (640, 400))
+        pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+
+
+@patch.object(settings, "DIRTY_RECTS", True)
+@patch.object(settings, "TELEMETRY", False)
+class DirtyRectsTest(unittest.TestCase):
+    def test_same_as_a_full_redraw(self):
+        from killerasteroids.display import GameLoop
+
+        screen = pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+        game = GameLoop(seed=3)
+        game.draw(screen)
+        for _ in range(20):
+            game.animate_groups()
+            game.update_groups()
+            game.particles.explosion((300, 200))
+            changed = game.draw(screen)
+        self.assertTrue(changed)
+        full = pygame.Surface(screen.get_size()).convert()
+        game.dirty = None
+        self.assertIsNone(game.draw(full))
+        self.assertEqual(
+            pygame.image.tostring(screen, "RGB"),
+            pygame.image.tostring(full, "RGB"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
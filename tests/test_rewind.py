@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+
+from killerasteroids import controls, rewind, settings
+from tests import GameTestCase
+
+
+def state(game):
+    """Everything the rewind buffer should bring back."""
+    player = game.player_sprite
+    entities = sorted(
+        (name, sprite.rect.center, getattr(sprite, "angle", 0))
+        for name in rewind.GROUPS.values()
+        for sprite in getattr(game, name).sprites()
+    )
+    return (
+        player.rect.topleft,
+        player.life.life,
+        player.score.score,
+        game.level.current_level,
+        entities,
+    )
+
+
+class RewindBufferTest(GameTestCase):
+    seed = 7
+
+    def setUp(self):
+        super().setUp()
+        self.game.rewind = rewind.RewindBuffer(size=50, keyframe=8)
+        self.game.controls.held = controls.DOWN
+
+    def play(self, ticks):
+        for tick in range(ticks):
+            if tick % 5 == 0:
+                self.game.fire()
+            self.game.step()
+
+    def test_rewind_restores_the_state(self):
+        self.play(10)
+        before = state(self.game)
+        self.play(7)
+        self.assertNotEqual(state(self.game), before)
+        self.assertTrue(self.game.rewind.rewind(self.game, 7))
+        self.assertEqual(state(self.game), before)
+
+    def test_replay_after_rewind_is_the_same(self):
+        self.play(12)
+        self.play(20)
+        after = state(self.game)
+        self.game.rewind.rewind(self.game, 20)
+        self.play(20)
+        self.assertEqual(state(self.game), after)
+
+    def test_ring_keeps_the_latest_ticks(self):
+        self.play(80)
+        self.assertEqual(len(self.game.rewind), 50)
+        self.assertTrue(self.game.rewind.rewind(self.game, 100))
+        self.assertEqual(len(self.game.rewind), 1)
+        self.assertFalse(self.game.rewind.rewind(self.game))
+
+    def test_frames_between_keyframes_are_deltas(self):
+        self.play(3)
+        frames = [f for f in self.game.rewind._frames if f is not None]
+        self.assertIsNone(frames[0].moved)
+        self.assertIs(frames[1].key, frames[0])
+        self.assertLess(frames[1].moved.itemsize, rewind.ENTITY.itemsize)
+        # The random number generator's state is shared, not copied.
+        self.assertIs(frames[1].rng, frames[0].rng)
+
+    def test_held_key_rewinds_the_game(self):
+        self.play(10)
+        before = state(self.game)
+        self.play(2)
+        self.game.controls.held = controls.REWIND
+        with patch.object(settings, "REWIND_SPEED", 2):
+            self.game.step()
+        self.assertEqual(state(self.game), before)
+
+    def test_no_rewind(self):
+        with patch.object(settings, "REWIND", False):
+            test = rewind.create_rewind()
+        test.capture(self.game)
+        self.assertFalse(test.rewind(self.game))
+        self.assertEqual(len(test), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import pygame
+
+from killerasteroids import rules, settings
+from killerasteroids.level import LevelDesign
+from killerasteroids.object import Asteroid, Laser, Player, PowerUp
+
+
+class RulesTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+        self.ship = Player(settings.PLAYER_SPRITE)
+        self.ship.rect.center = (100, 200)
+        self.asteroids = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+
+    def asteroid(self, center):
+        asteroid = Asteroid(settings.ASTEROID_SPRITE, [0, 0], [4, 0])
+        asteroid.rect.center = center
+        self.asteroids.add(asteroid)
+        return asteroid
+
+    def test_shoot_asteroids(self):
+        hit = self.asteroid((300, 200))
+        missed = self.asteroid((300, 50))
+        lasers = pygame.sprite.Group(Laser(settings.LASER_SPRITE, (300, 200)))
+        self.assertEqual(
+            list(rules.shoot_asteroids(lasers, self.asteroids).values()),
+            [[hit]],
+        )
+        self.assertEqual(self.asteroids.sprites(), [missed])
+        self.assertFalse(lasers)
+
+    def test_damage(self):
+        self.assertFalse(rules.damage(self.ship, self.asteroids))
+        self.asteroid(self.ship.rect.center)
+        self.assertTrue(rules.damage(self.ship, self.asteroids))
+        self.assertEqual(self.ship.lives_left(), 2)
+        self.assertFalse(self.asteroids)
+
+    def test_power_up(self):
+        self.powerups.add(
+            PowerUp(settings.POWER_UP_SPRITE, self.ship.rect.center)
+        )
+        self.assertTrue(rules.power_up(self.ship, self.powerups))
+        self.assertEqual(self.ship.lives_left(), 4)
+
+    def test_next_level(self):
+        level = LevelDesign()
+        self.asteroid((300, 200))
+        self.assertIsNone(
+            rules.next_level([self.ship], level, self.asteroids, self.powerups)
+        )
+        self.asteroids.empty()
+        enemies, _ = rules.next_level(
+            [self.ship], level, self.asteroids, self.powerups
+        )
+        self.assertEqual(level.current_level, 2)
+        self.assertEqual(self.asteroids.sprites(), enemies)
+
+    def test_clean(self):
+        lasers = pygame.sprite.Group(
+            Laser(settings.LASER_SPRITE, (settings.WIDTH + 50, 200))
+        )
+        self.powerups.add(PowerUp(settings.POWER_UP_SPRITE, [-50, 100]))
+        rules.clean(lasers, self.powerups)
+        self.assertFalse(lasers)
+        self.assertFalse(self.powerups)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import random
+import struct
+import time
+import unittest
+from unittest.mock import patch
+
+import pygame
+from pygame import locals
+
+from killerasteroids import controls, savegame, settings
+from killerasteroids.level import LevelDesign
+from tests.test_rewind import state
+from tests import GameTestCase
+
+
+class SaveGameTest(GameTestCase):
+    seed = 11
+
+    def setUp(self):
+        super().setUp()
+        self.game.controls.held = controls.UP
+        for tick in range(40):
+            if tick % 6 == 0:
+                self.game.fire()
+            self.game.step()
+
+    def test_load_restores_the_game(self):
+        before = state(self.game)
+        start = time.perf_counter()
+        savegame.save(self.game)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        saved = savegame.load()
+        self.assertEqual(saved.seed, 11)
+
+        game = self.GameLoop(saved=saved)
+        self.assertEqual(state(game), before)
+
+    def test_loaded_game_plays_on_the_same(self):
+        savegame.save(self.game)
+        for _ in range(30):
+            self.game.step()
+        after = state(self.game)
+
+        self.game.load(savegame.load())
+        for _ in range(30):
+            self.game.step()
+        self.assertEqual(state(self.game), after)
+
+    def test_load_does_not_generate_a_level(self):
+        savegame.save(self.game)
+        saved = savegame.load()
+        with patch.object(
+            LevelDesign, "generate_level", side_effect=AssertionError
+        ):
+            self.GameLoop(saved=saved)
+            self.game.load(saved)
+
+    def test_random_state(self):
+        random.gauss(0, 1)
+        data = savegame.dumps(self.game)
+        self.assertEqual(savegame.loads(data).rng, random.getstate())
+
+    def test_compact(self):
+        data = savegame.dumps(self.game)
+        entities = len(list(savegame.get_entities(self.game)))
+        self.assertEqual(
+            len(data),
+            savegame.HEADER.size
+            + entities * savegame.ENTITY.size
+            + savegame.RANDOM.size,
+        )
+
+    def test_bad_files(self):
+        data = savegame.dumps(self.game)
+        with self.assertRaises(ValueError):
+            savegame.loads(b"nope")
+        with self.assertRaises(ValueError):
+            savegame.loads(data[:-1])
+        newer = data[:4] + struct.pack("<H", 99) + data[6:]
+        with self.assertRaises(ValueError):
+            savegame.loads(newer)
+        self.assertIsNone(savegame.load())
+
+    def test_save_and_quit_from_the_pause_menu(self):
+        self.game.pause()
+        for k in (locals.K_DOWN, locals.K_RETURN):
+            self.manager.frame([pygame.event.Event(locals.KEYDOWN, key=k)])
+        self.assertTrue(savegame.has_save())
+        self.assertIsNone(self.manager.top)
+
+    def test_the_game_goes_on_when_it_cannot_be_saved(self):
+        blocker = os.path.join(self.directory.name, "blocker")
+        open(blocker, "w").close()
+        with patch.object(
+            settings, "SAVE_FILE", os.path.join(blocker, "game.sav")
+        ):
+            self.assertFalse(savegame.save(self.game))
+            self.game.pause()
+            for k in (locals.K_DOWN, locals.K_RETURN):
+                self.manager.frame([pygame.event.Event(locals.KEYDOWN, key=k)])
+            self.assertIs(self.manager.top, self.game)
+
+    def test_menu_offers_continue_only_while_there_is_a_save(self):
+        from killerasteroids.menu import MenuScreen
+
+        def options(menu):
+            return [option.text for option in menu.option.all]
+
+        menu = MenuScreen()
+        self.assertNotIn("CONTINUE", options(menu))
+        savegame.save(self.game)
+        menu.resume(None)
+        self.assertEqual(options(menu)[0], "CONTINUE")
+        savegame.remove()
+        menu.resume(None)
+        self.assertNotIn("CONTINUE", options(menu))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from killerasteroids import scene
+
+
+class RecordingScene(scene.Scene):
+    def __init__(self, log, name):
+        super().__init__()
+        self.log = log
+        self.name = name
+
+    def enter(self):
+        self.log.append(("enter", self.name))
+
+    def leave(self):
+        self.log.append(("leave", self.name))
+
+    def resume(self, result):
+        self.log.append(("resume", self.name, result))
+
+
+class SceneManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+        self.test = scene.SceneManager()
+        self.menu = RecordingScene(self.log, "menu")
+        self.test.push(self.menu)
+
+    def test_push_sets_manager(self):
+        self.assertIs(self.menu.manager, self.test)
+        self.assertIs(self.test.top, self.menu)
+
+    def test_pop_resumes_scene_below(self):
+        self.test.push(RecordingScene(self.log, "game"))
+        self.test.pop("done")
+        self.assertEqual(
+            self.log[-2:], [("leave", "game"), ("resume", "menu", "done")]
+        )
+        self.assertIs(self.test.top, self.menu)
+
+    def test_replace(self):
+        self.test.push(RecordingScene(self.log, "game"))
+        self.test.replace(RecordingScene(self.log, "gameover"))
+        self.assertEqual(len(self.test.stack), 2)
+        self.assertEqual(
+            self.log[-2:], [("leave", "game"), ("enter", "gameover")]
+        )
+
+    def test_quit_empties_stack(self):
+        self.test.push(RecordingScene(self.log, "game"))
+        self.test.quit()
+        self.assertIsNone(self.test.top)
+        self.assertEqual(self.log[-2:], [("leave", "game"), ("leave", "menu")])
@@ -0,0 +1,79 @@
+import threading
+import unittest
+
+from killerasteroids import simulation
+
+
+class FakeGame:
+    def __init__(self, steps=None):
+        self.playing = True
+        self.steps = 0
+        self.inputs = []
+        # Game over after this many steps.
+        self.last_step = steps
+        self.stepped = threading.Event()
+
+    def handle_input(self, event):
+        self.inputs.append(event)
+
+    def step(self):
+        self.steps += 1
+        if self.steps == self.last_step:
+            self.playing = False
+        self.stepped.set()
+
+    def snapshot(self, tick):
+        return simulation.Snapshot(tick, [("sprite", (tick, 0))], None, [])
+
+
+class SimulationTest(unittest.TestCase):
+    def setUp(self):
+        self.game = FakeGame()
+        self.test = simulation.Simulation(self.game, fps=1000)
+
+    def tearDown(self):
+        self.test.stop()
+
+    def test_step_handles_queued_input(self):
+        self.test.send("fire")
+        self.test.send("up")
+        self.test.step()
+        self.assertEqual(self.game.inputs, ["fire", "up"])
+        self.test.step()
+        self.assertEqual(len(self.game.inputs), 2)
+
+    def test_step_calls_queued_functions(self):
+        self.test.send(lambda: self.game.inputs.append("called"))
+        self.test.send("fire")
+        self.test.step()
+        self.assertEqual(self.game.inputs, ["called", "fire"])
+
+    def test_step_publishes_snapshot(self):
+        self.test.step()
+        old = self.test.latest
+        self.test.step()
+        self.assertEqual(self.test.latest.tick, 2)
+        # The previous snapshot isn't changed by the next step.
+        self.assertEqual(old.tick, 1)
+        self.assertEqual(old.sprites, [("sprite", (1, 0))])
+
+    def test_start_and_stop(self):
+        self.test.start()
+        self.assertTrue(self.test.running)
+        self.assertTrue(self.game.stepped.wait(1))
+        self.test.stop()
+        self.assertFalse(self.test.running)
+        steps = self.game.steps
+        self.assertGreater(steps, 0)
+        self.assertEqual(self.test.latest.tick, steps)
+
+    def test_worker_stops_when_game_is_over(self):
+        self.game.last_step = 3
+        self.test.start()
+        self.test._thread.join(1)
+        self.assertFalse(self.test.running)
+        self.assertEqual(self.game.steps, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
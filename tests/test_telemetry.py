@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from killerasteroids import telemetry
+
+
+class TelemetryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.directory.name, "log", "test.ndjson")
+        self.test = telemetry.Telemetry(self.file, batch_size=4)
+
+    def tearDown(self):
+        self.test.close()
+        self.directory.cleanup()
+
+    def test_records_are_buffered(self):
+        self.test.event("fire")
+        self.assertEqual(len(self.test._buffer), 2)
+
+    def test_full_buffer_is_flushed(self):
+        for _ in range(3):
+            self.test.event("fire")
+        self.assertEqual(self.test._buffer, [])
+
+    def test_close_writes_every_record(self):
+        self.test.event("kill")
+        self.test.tick(12, 3, 1, 0, 0)
+        self.test.close()
+        records = list(telemetry.read_logs([self.file]))
+        kinds = [record[0] for record in records]
+        self.assertEqual(kinds, ["start", "event", "tick", "end"])
+
+    def test_summarize(self):
+        self.test.event("kill")
+        self.test.event("kill")
+        self.test.tick(10, 3, 1, 0, 0)
+        self.test.tick(20, 2, 0, 1, 1)
+        self.test.close()
+        summary = telemetry.summarize(telemetry.read_logs([self.file]))
+        self.assertEqual(summary["sessions"], 1)
+        self.assertEqual(summary["events"], {"kill": 2})
+        self.assertEqual(summary["frame_time_max"], 20)
+        self.assertEqual(summary["max_entities"], 4)
+
+
+class LogWriterTest(unittest.TestCase):
+    def test_rotate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "test.ndjson")
+            writer = telemetry.LogWriter(file, max_bytes=10, backups=2)
+            writer.start()
+            for i in range(3):
+                writer.batches.put([("event", i, "kill")])
+            writer.batches.put(None)
+            writer.join()
+            self.assertTrue(os.path.exists(file + ".1"))
+            self.assertTrue(os.path.exists(file + ".2"))
+            self.assertFalse(os.path.exists(file + ".3"))
@@ -47,6 +47,30 @@ class TestBannerText(unittest.TestCase):
         self.assertEqual(self.test.rect[0], self.test.speed[0])
 
 
+class Assets:
+    progress = (1, 4)
+
+
+class TestLoadingText(unittest.TestCase):
+    def setUp(self):
+        self.assets = Assets()
+        self.group = pygame.sprite.Group()
+        self.test = text.LoadingText([0, 0], self.assets)
+        self.group.add(self.test)
+
+    def test_shows_the_progress(self):
+        self.assertEqual(self.test.text, "LOADING 25%")
+        self.assets.progress = (3, 4)
+        self.group.update()
+        self.assertEqual(self.test.text, "LOADING 75%")
+
+    def test_goes_away_when_loaded(self):
+        self.assets.progress = (4, 4)
+        self.group.update()
+        self.assertTrue(self.test.done)
+        self.assertFalse(self.group)
+
+
 class TestMenuOptionText(unittest.TestCase):
     def setUp(self):
         self.test = text.MenuOptionText(10, "Test", [1, 1], True)